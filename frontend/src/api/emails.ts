@@ -20,6 +20,7 @@ export interface Email {
   requires_human_review: boolean;
   created_at: string;
   updated_at: string;
+  version: number;
 }
 
 export interface CreateEmailPayload {
@@ -32,6 +33,8 @@ export interface UpdateEmailPayload {
   category?: EmailCategory;
   draft_reply?: string;
   requires_human_review?: boolean;
+  // Versão lida; a API responde 409 se outra pessoa salvou antes.
+  version?: number;
 }
 
 export async function classifyEmail(payload: CreateEmailPayload) {
@@ -44,7 +47,43 @@ export async function listEmails() {
   return data;
 }
 
+export interface EmailDraft {
+  id: number;
+  category: EmailCategory;
+  draft_reply: string;
+  version: number;
+}
+
+// Com DRAFT_MODE=lazy o rascunho é gerado na primeira consulta.
+export async function getEmailDraft(id: number) {
+  const { data } = await api.get<EmailDraft>(`/emails/${id}/draft`);
+  return data;
+}
+
 export async function updateEmail(id: number, payload: UpdateEmailPayload) {
   const { data } = await api.put<Email>(`/emails/${id}`, payload);
   return data;
+}
+
+export interface EmailFeedHandlers {
+  onEmail: (email: Email) => void;
+  // Eventos perdidos: recarregar a lista e assinar de novo.
+  onReset: () => void;
+}
+
+// Feed ao vivo (SSE) no lugar de refazer listEmails(). O EventSource
+// reconecta sozinho e retoma do último id recebido.
+export function subscribeToEmailFeed(afterId: number, handlers: EmailFeedHandlers) {
+  const source = new EventSource(
+    `${api.defaults.baseURL}/emails/feed?after_id=${afterId}`,
+  );
+  const onEmail = (event: MessageEvent<string>) =>
+    handlers.onEmail(JSON.parse(event.data) as Email);
+  source.addEventListener("created", onEmail);
+  source.addEventListener("updated", onEmail);
+  source.addEventListener("reset", () => {
+    source.close();
+    handlers.onReset();
+  });
+  return () => source.close();
 }
\ No newline at end of file
@@ -29,9 +29,15 @@ import {
   Snackbar,
   Alert,
 } from "@mui/material";
+import { isAxiosError } from "axios";
 import CloseIcon from "@mui/icons-material/Close";
 import type { Email, EmailCategory } from "../api/emails";
-import { listEmails, updateEmail } from "../api/emails";
+import {
+  getEmailDraft,
+  listEmails,
+  subscribeToEmailFeed,
+  updateEmail,
+} from "../api/emails";
 
 export function EmailListPage() {
   const [emails, setEmails] = useState<Email[]>([]);
@@ -58,13 +64,39 @@ export function EmailListPage() {
       setLoading(true);
       const data = await listEmails();
       setEmails(data);
+      return data;
     } finally {
       setLoading(false);
     }
   }
 
+  // Carrega a lista uma vez e segue o feed ao vivo a partir do maior id.
   useEffect(() => {
-    void fetchData();
+    let unsubscribe = () => {};
+    let cancelled = false;
+
+    async function loadAndSubscribe() {
+      unsubscribe();
+      const data = await fetchData();
+      if (cancelled) return;
+      const lastId = data.reduce((max, e) => Math.max(max, e.id), 0);
+      unsubscribe = subscribeToEmailFeed(lastId, {
+        onEmail: (email) =>
+          setEmails((prev) => {
+            const current = prev.find((e) => e.id === email.id);
+            if (!current) return [email, ...prev];
+            if (current.version > email.version) return prev;
+            return prev.map((e) => (e.id === email.id ? email : e));
+          }),
+        onReset: () => void loadAndSubscribe(),
+      });
+    }
+
+    void loadAndSubscribe();
+    return () => {
+      cancelled = true;
+      unsubscribe();
+    };
   }, []);
 
   const filtered = emails.filter((email) => {
@@ -114,6 +146,25 @@ export function EmailListPage() {
     setDetailDraft(email.draft_reply);
     setDetailCategory(email.category ?? "INCONCLUSIVO");
     setDetailRequiresReview(email.requires_human_review);
+    if (!email.draft_reply) {
+      void loadDraft(email.id);
+    }
+  }
+
+  async function loadDraft(id: number) {
+    try {
+      const { draft_reply } = await getEmailDraft(id);
+      setEmails((prev) =>
+        prev.map((e) => (e.id === id ? { ...e, draft_reply } : e)),
+      );
+      setSelectedEmail((current) =>
+        current?.id === id ? { ...current, draft_reply } : current,
+      );
+      // Não sobrescreve o que o revisor já começou a digitar.
+      setDetailDraft((current) => current || draft_reply);
+    } catch (error) {
+      console.error(error);
+    }
   }
 
   function closeDetails() {
@@ -128,6 +179,7 @@ export function EmailListPage() {
         draft_reply: detailDraft,
         category: detailCategory,
         requires_human_review: detailRequiresReview,
+        version: selectedEmail.version,
       });
 
       // Atualiza lista em memória
@@ -141,7 +193,11 @@ export function EmailListPage() {
       setSnackbarOpen(true);
     } catch (error) {
       console.error(error);
-      setSnackbarMessage("Erro ao salvar alterações. Tente novamente.");
+      setSnackbarMessage(
+        isAxiosError(error) && error.response?.status === 409
+          ? "Este e-mail foi alterado por outra pessoa. Recarregue a lista antes de salvar."
+          : "Erro ao salvar alterações. Tente novamente.",
+      );
       setSnackbarSeverity("error");
       setSnackbarOpen(true);
     } finally {
@@ -1,18 +1,73 @@
-from typing import List
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Literal, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
+from system.app.core.config import settings
+from system.app.core.container import AppContainer
 from system.app.schemas.email_schemas import (
+    EmailAsyncClassifyRequest,
+    EmailBatchClassifyResponse,
+    EmailBatchItemResult,
+    EmailBulkUpdateRequest,
+    EmailBulkUpdateResponse,
+    EmailCategoryStatsResponse,
     EmailCreateRequest,
+    EmailDraftResponse,
+    EmailJobAcceptedResponse,
     EmailResponse,
+    EmailReviewClaimResponse,
+    EmailReviewCompleteRequest,
+    EmailSearchHitResponse,
+    EmailStatsBucketResponse,
+    EmailStatsResponse,
+    EmailSummaryResponse,
     EmailUpdateRequest,
 )
+from system.app.core.metrics import EMAIL_FEED_EVENTS
+from system.app.services.email_feed import EmailFeedEventKind
 from system.app.services.email_service import EmailClassificationService
 from system.app.core.dependencies import (
+    get_container,
     get_email_classification_service,
     get_email_repository,
+    get_email_stats_repository,
+)
+from system.app.domain.entities.classification import EmailCategory
+from system.app.domain.entities.email_entity import Email, EmailStatus
+from system.app.domain.entities.email_stats import (
+    EmailCategoryStats,
+    StatsGranularity,
+    summarize_by_category,
+)
+from system.app.repositories.email_repository import (
+    DEFAULT_PAGE_SIZE,
+    EmailListFilters,
+    EmailNotFoundError,
+    EmailRepository,
+    EmailVersionConflictError,
+    InvalidCursorError,
+    ReviewClaimError,
+)
+from system.app.repositories.email_stats_repository import (
+    EmailStatsFilters,
+    EmailStatsRepository,
 )
-from system.app.repositories.email_repository import EmailRepository
 
 router = APIRouter(prefix="/emails", tags=["emails"])
 
@@ -29,6 +84,45 @@ def _to_response(email) -> EmailResponse:
         requires_human_review=email.requires_human_review,
         created_at=email.created_at,
         updated_at=email.updated_at,
+        status=email.status,
+        last_error=email.last_error,
+        version=email.version,
+        review_claimed_by=email.review_claimed_by,
+        review_lease_expires_at=email.review_lease_expires_at,
+        reviewed_by=email.reviewed_by,
+        matched_email_id=email.matched_email_id,
+    )
+
+
+def _to_summary_response(email) -> EmailSummaryResponse:
+    return EmailSummaryResponse(
+        id=email.id,
+        from_email=email.from_email,
+        subject=email.subject,
+        category=email.category,
+        confidence=email.confidence,
+        requires_human_review=email.requires_human_review,
+        created_at=email.created_at,
+        updated_at=email.updated_at,
+        status=email.status,
+    )
+
+
+def email_list_filters(
+    category: Optional[EmailCategory] = None,
+    requires_human_review: Optional[bool] = None,
+    from_email: Optional[str] = None,
+    created_from: Optional[datetime] = Query(None, description="Início (inclusivo)"),
+    created_to: Optional[datetime] = Query(None, description="Fim (exclusivo)"),
+    email_status: Optional[EmailStatus] = Query(None, alias="status"),
+) -> EmailListFilters:
+    return EmailListFilters(
+        category=category,
+        requires_human_review=requires_human_review,
+        from_email=from_email,
+        created_from=created_from,
+        created_to=created_to,
+        status=email_status,
     )
 
 
@@ -41,20 +135,520 @@ async def classify_email(
     return _to_response(email)
 
 
-@router.get("/", response_model=List[EmailResponse])
-def list_emails(
+def _sse(event: str, data: str, event_id: Optional[int] = None) -> str:
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {data}\n\n"
+
+
+@router.post("/classify/stream")
+async def classify_email_stream(
+    payload: EmailCreateRequest,
+    container: AppContainer = Depends(get_container),
+):
+    """
+    Server-Sent Events com a classificação em andamento:
+
+    - `classification`: categoria e confiança, assim que aparecem;
+    - `draft`: pedaços do rascunho de resposta (`{"delta": "..."}`);
+    - `done`: o e-mail salvo, no mesmo formato de POST /emails/classify;
+    - `error`: falha no meio do stream (`{"detail": "..."}`).
+    """
+
+    # Como no export, a sessão é aberta dentro do corpo da resposta.
+    async def _events():
+        async with container.repository_scope() as repo:
+            service = container.classification_service(repo)
+            try:
+                async for item in service.stream_from_request(payload):
+                    if isinstance(item, Email):
+                        yield _sse("done", _to_response(item).model_dump_json())
+                        continue
+                    if item.category is not None:
+                        yield _sse(
+                            "classification",
+                            json.dumps(
+                                {
+                                    "category": item.category.value,
+                                    "confidence": item.confidence,
+                                }
+                            ),
+                        )
+                    if item.draft_delta:
+                        yield _sse(
+                            "draft",
+                            json.dumps({"delta": item.draft_delta}, ensure_ascii=False),
+                        )
+            except Exception as exc:
+                yield _sse(
+                    "error",
+                    json.dumps({"detail": str(exc) or exc.__class__.__name__}),
+                )
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Evita que proxies (nginx) segurem os eventos em buffer.
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.post(
+    "/classify/async",
+    response_model=EmailJobAcceptedResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def classify_email_async(
+    payload: EmailAsyncClassifyRequest,
+    request: Request,
+    response: Response,
+    service: EmailClassificationService = Depends(get_email_classification_service),
+    container: AppContainer = Depends(get_container),
+):
+    """
+    Persiste o e-mail como PENDING e responde na hora; o resultado sai via
+    polling em GET /emails/{id} ou pelo webhook em `callback_url`.
+    """
+    email = await service.enqueue_from_request(
+        payload,
+        callback_url=str(payload.callback_url) if payload.callback_url else None,
+    )
+    workers = container.classification_workers
+    if workers is not None:
+        workers.notify()
+    response.headers["Location"] = str(request.url_for("get_email", email_id=email.id))
+    return EmailJobAcceptedResponse(id=email.id, status=email.status)
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'item'}: {err['msg']}"
+        for err in exc.errors()
+    )
+
+
+@router.post("/classify/batch", response_model=EmailBatchClassifyResponse)
+async def classify_email_batch(
+    payload: List[Dict[str, Any]] = Body(
+        ...,
+        description="Lista de e-mails no formato de EmailCreateRequest",
+    ),
+    service: EmailClassificationService = Depends(get_email_classification_service),
+):
+    if len(payload) > settings.CLASSIFY_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Lote excede o limite de {settings.CLASSIFY_BATCH_MAX_SIZE} e-mails",
+        )
+
+    # Valida item a item para que um e-mail inválido não derrube o lote inteiro.
+    results: List[EmailBatchItemResult] = []
+    valid: List[EmailCreateRequest] = []
+    valid_indexes: List[int] = []
+    for index, raw in enumerate(payload):
+        try:
+            valid.append(EmailCreateRequest.model_validate(raw))
+            valid_indexes.append(index)
+        except ValidationError as exc:
+            results.append(
+                EmailBatchItemResult(index=index, error=_format_validation_error(exc))
+            )
+
+    outcomes = await service.classify_batch(valid)
+    for index, outcome in zip(valid_indexes, outcomes):
+        if isinstance(outcome, Exception):
+            results.append(
+                EmailBatchItemResult(
+                    index=index,
+                    error=str(outcome) or outcome.__class__.__name__,
+                )
+            )
+        else:
+            results.append(
+                EmailBatchItemResult(index=index, email=_to_response(outcome))
+            )
+
+    results.sort(key=lambda r: r.index)
+    failed = sum(1 for r in results if r.error is not None)
+    return EmailBatchClassifyResponse(
+        total=len(results),
+        succeeded=len(results) - failed,
+        failed=failed,
+        results=results,
+    )
+
+
+@router.get(
+    "/",
+    response_model=Union[List[EmailResponse], List[EmailSummaryResponse]],
+)
+async def list_emails(
+    response: Response,
+    filters: EmailListFilters = Depends(email_list_filters),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor da página anterior"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
+    view: Literal["full", "summary"] = Query(
+        "full", description="summary omite body e draft_reply"
+    ),
+    repo: EmailRepository = Depends(get_email_repository),
+):
+    try:
+        if view == "summary":
+            page = await repo.list_summaries(filters, limit=limit, cursor=cursor)
+            items = [_to_summary_response(e) for e in page.items]
+        else:
+            page = await repo.list(filters, limit=limit, cursor=cursor)
+            items = [_to_response(e) for e in page.items]
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    # O corpo continua sendo uma lista; a próxima página vai no header.
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return items
+
+
+@router.get("/stats", response_model=EmailStatsResponse)
+async def email_stats(
+    granularity: StatsGranularity = Query(StatsGranularity.DAY),
+    category: Optional[EmailCategory] = None,
+    requires_human_review: Optional[bool] = None,
+    created_from: Optional[datetime] = Query(None, description="Início (inclusivo, precisão de hora)"),
+    created_to: Optional[datetime] = Query(None, description="Fim (exclusivo)"),
+    repo: EmailStatsRepository = Depends(get_email_stats_repository),
+):
+    """
+    Contagens, taxa de revisão humana e confiança média dos e-mails
+    classificados, por período (UTC), categoria e flag de revisão.
+    """
+    buckets = await repo.aggregate(
+        granularity,
+        EmailStatsFilters(
+            category=category,
+            requires_human_review=requires_human_review,
+            created_from=created_from,
+            created_to=created_to,
+        ),
+    )
+
+    by_category = summarize_by_category(buckets)
+    overall = EmailCategoryStats(
+        count=sum(c.count for c in by_category),
+        review_count=sum(c.review_count for c in by_category),
+        confidence_sum=sum(c.confidence_sum for c in by_category),
+    )
+    return EmailStatsResponse(
+        granularity=granularity,
+        total=overall.count,
+        review_rate=overall.review_rate,
+        avg_confidence=overall.avg_confidence,
+        by_category=[
+            EmailCategoryStatsResponse(
+                category=c.category,
+                count=c.count,
+                review_count=c.review_count,
+                review_rate=c.review_rate,
+                avg_confidence=c.avg_confidence,
+            )
+            for c in by_category
+        ],
+        buckets=[
+            EmailStatsBucketResponse(
+                bucket=b.bucket,
+                category=b.category,
+                requires_human_review=b.requires_human_review,
+                count=b.count,
+                avg_confidence=b.avg_confidence,
+            )
+            for b in buckets
+        ],
+    )
+
+
+@router.get("/search", response_model=List[EmailSearchHitResponse])
+async def search_emails(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200, description="Termos de busca"),
+    filters: EmailListFilters = Depends(email_list_filters),
+    cursor: Optional[str] = Query(None, description="Valor de X-Next-Cursor da página anterior"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=500),
     repo: EmailRepository = Depends(get_email_repository),
 ):
-    emails = repo.list()
-    return [_to_response(e) for e in emails]
+    """
+    Busca em assunto, corpo e rascunho, ordenada por relevância. Os termos
+    encontrados vêm marcados com <mark> em `highlight`.
+    """
+    try:
+        page = await repo.search(q, filters, limit=limit, cursor=cursor)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(exc),
+        )
+
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return [
+        EmailSearchHitResponse(
+            **_to_summary_response(hit.email).model_dump(),
+            rank=hit.rank,
+            highlight=hit.highlight,
+        )
+        for hit in page.items
+    ]
+
+
+_EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+@router.get("/export")
+async def export_emails(
+    filters: EmailListFilters = Depends(email_list_filters),
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    container: AppContainer = Depends(get_container),
+):
+    # A sessão precisa viver enquanto o corpo é transmitido, por isso não
+    # vem de Depends (que é finalizado antes do envio da resposta).
+    async def _rows():
+        async with container.repository_scope() as repo:
+            if format == "csv":
+                buffer = io.StringIO()
+                writer = csv.DictWriter(buffer, fieldnames=list(EmailResponse.model_fields))
+                writer.writeheader()
+                async for email in repo.stream(filters):
+                    writer.writerow(_to_response(email).model_dump(mode="json"))
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+                if buffer.tell():
+                    yield buffer.getvalue()
+            else:
+                async for email in repo.stream(filters):
+                    yield _to_response(email).model_dump_json() + "\n"
+
+    return StreamingResponse(
+        _rows(),
+        media_type=_EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="emails.{format}"',
+        },
+    )
+
+
+@router.get("/feed")
+async def email_feed(
+    category: Optional[EmailCategory] = None,
+    requires_human_review: Optional[bool] = None,
+    email_status: Optional[EmailStatus] = Query(None, alias="status"),
+    after_id: Optional[int] = Query(
+        None, ge=0, description="Maior id já visto; o header Last-Event-ID tem precedência"
+    ),
+    view: Literal["full", "summary"] = Query(
+        "full", description="summary omite body e draft_reply"
+    ),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    container: AppContainer = Depends(get_container),
+):
+    """
+    Server-Sent Events com os e-mails criados ou alterados, no lugar de
+    refazer GET /emails/ periodicamente:
+
+    - `created` / `updated`: o e-mail, no formato de GET /emails/ (`view`);
+    - `removed`: `{"id": ...}` de um e-mail alterado que saiu do filtro;
+    - `reset`: eventos foram perdidos; recarregue a lista e reconecte.
+
+    O `id` dos eventos é o maior id de e-mail já enviado. Com `after_id`, os
+    e-mails criados depois dele são reenviados antes dos eventos ao vivo;
+    alterações feitas enquanto o cliente estava fora não são. Ao reconectar,
+    o EventSource manda Last-Event-ID, que vale mais que o `after_id` da URL.
+    """
+    hub = container.email_feed
+    if hub is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Feed ao vivo desativado (EMAIL_FEED_BACKEND=none)",
+        )
+    if last_event_id:
+        try:
+            after_id = int(last_event_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Last-Event-ID inválido",
+            )
+    filters = EmailListFilters(
+        category=category,
+        requires_human_review=requires_human_review,
+        status=email_status,
+    )
+    serialize = _to_summary_response if view == "summary" else _to_response
+
+    async def _events():
+        # Assina antes de reenviar: o que mudar durante a releitura fica na fila.
+        with hub.subscribe(filters) as subscription:
+            cursor = after_id
+            if after_id is not None:
+                replayed = 0
+                async with container.repository_scope() as repo:
+                    while True:
+                        page = await repo.scan(cursor, 200, filters)
+                        if not page:
+                            break
+                        replayed += len(page)
+                        if replayed > settings.EMAIL_FEED_REPLAY_MAX:
+                            EMAIL_FEED_EVENTS.labels(kind="reset").inc()
+                            yield _sse("reset", "{}", cursor)
+                            return
+                        for email in page:
+                            cursor = email.id
+                            yield _sse("created", serialize(email).model_dump_json(), cursor)
+                        EMAIL_FEED_EVENTS.labels(kind="replayed").inc(len(page))
+
+            while True:
+                event = await subscription.next(settings.EMAIL_FEED_HEARTBEAT_SECONDS)
+                if event is None:
+                    yield ": ping\n\n"
+                    continue
+                kind = event.kind
+                if kind == EmailFeedEventKind.RESET:
+                    EMAIL_FEED_EVENTS.labels(kind=kind.value).inc()
+                    yield _sse(kind.value, "{}", cursor)
+                    return
+                email = event.email
+                if kind == EmailFeedEventKind.CREATED:
+                    if cursor is not None and email.id <= cursor:
+                        continue  # já foi no reenvio
+                    cursor = email.id
+                if kind == EmailFeedEventKind.REMOVED:
+                    data = json.dumps({"id": email.id})
+                else:
+                    data = serialize(email).model_dump_json()
+                EMAIL_FEED_EVENTS.labels(kind=kind.value).inc()
+                yield _sse(kind.value, data, cursor)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
+@router.patch("/bulk", response_model=EmailBulkUpdateResponse)
+async def bulk_update_emails(
+    payload: EmailBulkUpdateRequest,
+    repo: EmailRepository = Depends(get_email_repository),
+):
+    """
+    Aprova (`requires_human_review=false`) e/ou recategoriza vários e-mails
+    num único UPDATE. Cada e-mail alterado tem a versão incrementada.
+    """
+    if len(payload.ids) > settings.BULK_UPDATE_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Limite de {settings.BULK_UPDATE_MAX_SIZE} e-mails por operação",
+        )
+    changes = payload.model_dump(exclude_none=True, exclude={"ids"})
+    if not changes:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Informe ao menos um campo para alterar",
+        )
+
+    ids = list(dict.fromkeys(payload.ids))
+    updated = await repo.update_many(ids, changes)
+    updated_set = set(updated)
+    return EmailBulkUpdateResponse(
+        updated=len(updated),
+        ids=sorted(updated),
+        not_found=[i for i in ids if i not in updated_set],
+    )
+
+
+@router.post("/review/claim", response_model=EmailReviewClaimResponse)
+async def claim_reviews(
+    n: int = Query(10, ge=1, le=settings.REVIEW_CLAIM_MAX),
+    reviewer: str = Header(..., alias="X-Reviewer", min_length=1, max_length=255),
+    repo: EmailRepository = Depends(get_email_repository),
+):
+    """
+    Reserva até `n` e-mails pendentes de revisão para o revisor, em ordem
+    de prioridade. Revisores simultâneos nunca recebem o mesmo e-mail; a
+    reserva expira após REVIEW_LEASE_SECONDS e o e-mail volta à fila.
+    """
+    lease_expires_at = datetime.now(timezone.utc) + timedelta(
+        seconds=settings.REVIEW_LEASE_SECONDS
+    )
+    emails = await repo.claim_reviews(reviewer, n, settings.REVIEW_LEASE_SECONDS)
+    return EmailReviewClaimResponse(
+        reviewer=reviewer,
+        lease_expires_at=max(
+            (e.review_lease_expires_at for e in emails), default=lease_expires_at
+        ),
+        emails=[_to_response(e) for e in emails],
+    )
+
+
+async def _review_action(action, container: AppContainer | None = None) -> EmailResponse:
+    try:
+        email = await action
+    except EmailNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Email não encontrado",
+        )
+    except ReviewClaimError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        )
+    if container is not None and container.near_duplicates is not None:
+        # Revisado por humano: passa a servir de vizinho para quase duplicatas.
+        container.near_duplicates.observe(email)
+    return _to_response(email)
+
+
+@router.post("/review/{email_id}/release", response_model=EmailResponse)
+async def release_review(
+    email_id: int,
+    reviewer: str = Header(..., alias="X-Reviewer", min_length=1, max_length=255),
+    repo: EmailRepository = Depends(get_email_repository),
+):
+    """Devolve à fila um e-mail reservado pelo revisor."""
+    return await _review_action(repo.release_review(email_id, reviewer))
+
+
+@router.post("/review/{email_id}/complete", response_model=EmailResponse)
+async def complete_review(
+    email_id: int,
+    payload: Optional[EmailReviewCompleteRequest] = Body(None),
+    reviewer: str = Header(..., alias="X-Reviewer", min_length=1, max_length=255),
+    repo: EmailRepository = Depends(get_email_repository),
+    container: AppContainer = Depends(get_container),
+):
+    """Aplica as correções do revisor e retira o e-mail da fila de revisão."""
+    changes = payload.model_dump(exclude_none=True) if payload else {}
+    return await _review_action(
+        repo.complete_review(email_id, reviewer, changes), container
+    )
 
 
 @router.get("/{email_id}", response_model=EmailResponse)
-def get_email(
+async def get_email(
     email_id: int,
     repo: EmailRepository = Depends(get_email_repository),
 ):
-    email = repo.get(email_id)
+    email = await repo.get(email_id)
     if not email:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -63,27 +657,64 @@ def get_email(
     return _to_response(email)
 
 
-@router.put("/{email_id}", response_model=EmailResponse)
-def update_email(
+@router.get("/{email_id}/draft", response_model=EmailDraftResponse)
+async def get_email_draft(
     email_id: int,
-    payload: EmailUpdateRequest,
     repo: EmailRepository = Depends(get_email_repository),
+    container: AppContainer = Depends(get_container),
 ):
-    email = repo.get(email_id)
+    """
+    Rascunho de resposta do e-mail. Com DRAFT_MODE=lazy, é gerado na
+    primeira consulta e fica gravado para as seguintes.
+    """
+    email = await repo.get(email_id)
     if not email:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Email não encontrado",
         )
+    if email.status != EmailStatus.CLASSIFIED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Email ainda não classificado (status {email.status.value})",
+        )
+    if container.draft_generator is not None:
+        email = await container.draft_generator.ensure_draft(repo, email)
+    return EmailDraftResponse(
+        id=email.id,
+        category=email.category,
+        draft_reply=email.draft_reply,
+        version=email.version,
+    )
+
 
-    if payload.draft_reply is not None:
-        email.draft_reply = payload.draft_reply
-    if payload.category is not None:
-        email.category = payload.category
-    if payload.requires_human_review is not None:
-        email.requires_human_review = payload.requires_human_review
-    if payload.confidence is not None:
-        email.confidence = payload.confidence
-
-    email = repo.save(email)
-    return _to_response(email)
\ No newline at end of file
+@router.put("/{email_id}", response_model=EmailResponse)
+async def update_email(
+    email_id: int,
+    payload: EmailUpdateRequest,
+    repo: EmailRepository = Depends(get_email_repository),
+    container: AppContainer = Depends(get_container),
+):
+    changes = payload.model_dump(exclude_none=True, exclude={"version"})
+    try:
+        if not changes:
+            email = await repo.get(email_id)
+            if not email:
+                raise EmailNotFoundError(email_id)
+        else:
+            email = await repo.update_fields(
+                email_id, changes, expected_version=payload.version
+            )
+    except EmailNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Email não encontrado",
+        )
+    except EmailVersionConflictError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(exc),
+        )
+    if changes and container.near_duplicates is not None:
+        container.near_duplicates.observe(email)
+    return _to_response(email)
@@ -1,5 +1,8 @@
 # system/app/api/v1/routers/health_router.py
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from system.app.core.container import AppContainer
+from system.app.core.dependencies import get_container
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -7,4 +10,12 @@ router = APIRouter(prefix="/health", tags=["health"])
 @router.get("/ping")
 def ping():
     return {"ping": "pong",
-            "status": "ok"}
\ No newline at end of file
+            "status": "ok"}
+
+
+@router.get("/cache")
+def cache_stats(container: AppContainer = Depends(get_container)):
+    stats = container.cache_stats
+    if stats is None:
+        return {"enabled": False}
+    return {"enabled": True, **stats.as_dict()}
@@ -0,0 +1,485 @@
+# system/app/cli/backfill.py
+"""
+Classificação em massa fora da API: reclassificação da tabela `emails` ou importação de dumps.
+
+Uso:
+    # reclassifica o que já está no banco (ex.: depois de trocar prompt/modelo)
+    python -m system.app.cli.backfill db --category INCONCLUSIVO
+
+    # importa um dump histórico (JSONL ou mbox)
+    python -m system.app.cli.backfill file historico.jsonl
+    python -m system.app.cli.backfill file caixa.mbox --format mbox
+
+A entrada é lida em blocos de `--chunk-size`. A leitura e a limpeza do
+texto rodam num pool de processos (`--workers`), e as chamadas à LLM usam
+no máximo `--concurrency` em paralelo. Elas passam com prioridade
+BACKGROUND no rate limiter deste processo; a cota compartilhada com a API
+se ajusta pelos headers x-ratelimit-*.
+
+Cada bloco é gravado de uma vez:
+- no banco, com UPDATE em lote condicionado à versão lida (não atropela
+  edições feitas no meio do caminho);
+- da importação, com upsert por `external_id` (Message-ID ou `id` do
+  JSONL), então reimportar não duplica. Itens cuja classificação falhou
+  entram como PENDING e os workers da API tentam de novo.
+
+Depois de cada bloco, o progresso vai para `--checkpoint`; rodar o mesmo
+comando (mesmos filtros) de novo retoma de onde parou.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import mailbox
+import os
+import sys
+import time
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime
+from email import message_from_bytes, policy
+from email.utils import parseaddr
+from pathlib import Path
+
+from system.app.core.config import settings
+from system.app.core.container import AppContainer
+from system.app.domain.entities.classification import EmailCategory
+from system.app.domain.entities.email_entity import Email, EmailStatus
+from system.app.infrastructure.db.session import AsyncSessionLocal, engine
+from system.app.infrastructure.llm.preprocessing import EmailPreprocessor
+from system.app.infrastructure.llm.rate_limiter import LLMPriority, llm_priority
+from system.app.repositories.email_repository import EmailListFilters
+from system.app.services.email_service import EmailClassificationService
+
+logger = logging.getLogger(__name__)
+
+# Limite da coluna `emails.subject`/`external_id`.
+_MAX_SUBJECT = 255
+
+
+@dataclass
+class Checkpoint:
+    source: str
+    # Último id gravado (banco) ou registros já consumidos do arquivo.
+    position: int = 0
+    processed: int = 0
+    reused: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+    @classmethod
+    def load(cls, path: Path, source: str) -> "Checkpoint":
+        if not path.exists():
+            return cls(source=source)
+        data = json.loads(path.read_text())
+        if data.get("source") != source:
+            raise SystemExit(
+                f"Checkpoint {path} é de outra origem ({data.get('source')}); "
+                "use outro --checkpoint ou apague o arquivo."
+            )
+        return cls(**data)
+
+    def save(self, path: Path) -> None:
+        # Escrita atômica: um crash no meio não deixa checkpoint corrompido.
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(asdict(self)))
+        os.replace(tmp, path)
+
+
+# --- CPU: roda no pool de processos (funções de módulo, serializáveis) ---
+
+
+def _clean_bodies(bodies: list[str], max_tokens: int | None) -> list[str]:
+    if max_tokens is None:
+        return bodies
+    preprocessor = EmailPreprocessor(max_tokens=max_tokens)
+    return [preprocessor.process(body).text for body in bodies]
+
+
+def _parse_jsonl(lines: list[tuple[int, str]], source_name: str) -> list[dict]:
+    records = []
+    for number, line in lines:
+        if not line.strip():
+            # Conta na posição e em `skipped`, sem aviso.
+            records.append({"error": ""})
+            continue
+        try:
+            data = json.loads(line)
+            records.append(
+                {
+                    "from_email": str(data["from_email"]),
+                    "subject": str(data.get("subject") or "")[:_MAX_SUBJECT],
+                    "body": str(data.get("body") or ""),
+                    "external_id": str(
+                        data.get("external_id")
+                        or data.get("message_id")
+                        or data.get("id")
+                        or f"{source_name}:{number}"
+                    )[:_MAX_SUBJECT],
+                }
+            )
+        except (ValueError, KeyError, TypeError) as exc:
+            records.append({"error": f"linha {number}: {exc!r}"})
+    return records
+
+
+def _parse_mbox(messages: list[tuple[int, bytes]], source_name: str) -> list[dict]:
+    records = []
+    for number, raw in messages:
+        try:
+            message = message_from_bytes(raw, policy=policy.default)
+            part = message.get_body(preferencelist=("plain", "html"))
+            records.append(
+                {
+                    "from_email": parseaddr(str(message.get("From", "")))[1],
+                    "subject": str(message.get("Subject") or "")[:_MAX_SUBJECT],
+                    "body": part.get_content() if part is not None else "",
+                    "external_id": str(
+                        message.get("Message-ID") or f"{source_name}:{number}"
+                    ).strip()[:_MAX_SUBJECT],
+                }
+            )
+        except Exception as exc:
+            records.append({"error": f"mensagem {number}: {exc!r}"})
+    return records
+
+
+def _prepare(kind: str, raw: list, source_name: str, max_tokens: int | None) -> list[dict]:
+    """Parse + limpeza de um bloco; `cleaned` é o texto que vai para a LLM."""
+    if kind == "db":
+        return [{"cleaned": text} for text in _clean_bodies(raw, max_tokens)]
+    records = (_parse_jsonl if kind == "jsonl" else _parse_mbox)(raw, source_name)
+    valid = [r for r in records if "error" not in r]
+    for record, cleaned in zip(valid, _clean_bodies([r["body"] for r in valid], max_tokens)):
+        record["cleaned"] = cleaned
+    return records
+
+
+# --- Leitura em blocos ---
+
+
+def _file_chunks(path: Path, kind: str, skip: int, size: int) -> Iterator[list]:
+    if kind == "jsonl":
+        chunk: list = []
+        with path.open(encoding="utf-8") as handle:
+            for number, line in enumerate(handle, start=1):
+                if number <= skip:
+                    continue
+                # Linhas vazias também entram: a posição é o nº da linha.
+                chunk.append((number, line))
+                if len(chunk) >= size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+        return
+
+    box = mailbox.mbox(str(path), create=False)
+    keys = box.keys()[skip:]
+    for start in range(0, len(keys), size):
+        yield [
+            (skip + start + offset + 1, box.get_bytes(key))
+            for offset, key in enumerate(keys[start : start + size])
+        ]
+
+
+def _count_file(path: Path, kind: str) -> int:
+    if kind == "jsonl":
+        with path.open("rb") as handle:
+            return sum(1 for _ in handle)
+    return len(mailbox.mbox(str(path), create=False))
+
+
+async def _db_chunks(
+    container: AppContainer,
+    filters: EmailListFilters,
+    exclude_reviewed: bool,
+    after_id: int,
+    size: int,
+) -> AsyncIterator[list[Email]]:
+    while True:
+        async with container.repository_scope() as repo:
+            emails = await repo.scan(after_id, size, filters, exclude_reviewed)
+        if not emails:
+            return
+        yield emails
+        after_id = emails[-1].id
+
+
+# --- Relatório ---
+
+
+class Progress:
+    def __init__(self, total: int, checkpoint: Checkpoint):
+        self._total = total
+        self._checkpoint = checkpoint
+        self._start = time.monotonic()
+        self._done_at_start = checkpoint.processed + checkpoint.failed + checkpoint.skipped
+
+    @property
+    def done(self) -> int:
+        c = self._checkpoint
+        return c.processed + c.failed + c.skipped
+
+    def report(self, final: bool = False) -> None:
+        elapsed = time.monotonic() - self._start
+        rate = (self.done - self._done_at_start) / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self._total - self.done)
+        eta = f"{remaining / rate:,.0f}s" if rate > 0 and not final else "-"
+        percent = 100.0 * self.done / self._total if self._total else 100.0
+        c = self._checkpoint
+        print(
+            f"{'fim' if final else 'progresso'}: {self.done:,}/{self._total:,} "
+            f"({percent:.1f}%) | {rate:.1f} e-mails/s | ETA {eta} | "
+            f"ok {c.processed:,} (reuso {c.reused:,}) | falhas {c.failed:,} | "
+            f"ignorados {c.skipped:,} | {elapsed:,.0f}s",
+            flush=True,
+        )
+
+
+# --- Execução ---
+
+
+def _build_container(mode: str) -> AppContainer:
+    overrides = {
+        # O CLI não drena a fila nem agrupa inserts: grava em lote ele mesmo.
+        "CLASSIFICATION_WORKERS": 0,
+        "WRITE_BEHIND_ENABLED": False,
+        # A limpeza roda no pool de processos, não dentro do cliente.
+        "PREPROCESS_ENABLED": False,
+    }
+    if mode == "db":
+        # Reclassificar não pode copiar o resultado antigo do próprio e-mail.
+        overrides["NEAR_DUPLICATE_ENABLED"] = False
+    return AppContainer.build(
+        settings.model_copy(update=overrides), engine, AsyncSessionLocal
+    )
+
+
+async def _classify_chunk(
+    container: AppContainer,
+    emails: list[Email],
+    cleaned: list[str],
+    concurrency: int,
+) -> list[Email | Exception]:
+    # A LLM vê o texto limpo; o corpo original é o que fica gravado.
+    prepared = [replace(e, body=text) for e, text in zip(emails, cleaned)]
+    async with container.repository_scope() as repo:
+        service = EmailClassificationService(
+            llm_client=container.llm_client,
+            email_repository=repo,
+            near_duplicates=container.near_duplicates,
+        )
+        with llm_priority(LLMPriority.BACKGROUND):
+            results = await service.classify_emails(prepared, concurrency)
+    return [
+        replace(r, body=original.body) if isinstance(r, Email) else r
+        for original, r in zip(emails, results)
+    ]
+
+
+def _submit_prepare(pool: Executor | None, *args) -> asyncio.Future:
+    """`_prepare` no pool; com `--workers 0`, aqui mesmo, sem thread nenhuma."""
+    loop = asyncio.get_running_loop()
+    if pool is not None:
+        return loop.run_in_executor(pool, _prepare, *args)
+    future = loop.create_future()
+    future.set_result(_prepare(*args))
+    return future
+
+
+async def _run_db(args, container, checkpoint, pool, max_tokens) -> None:
+    filters = EmailListFilters(
+        category=EmailCategory(args.category) if args.category else None,
+        status=EmailStatus(args.status),
+        requires_human_review=True if args.only_review else None,
+        created_from=args.created_from,
+        created_to=args.created_to,
+    )
+    exclude_reviewed = not args.include_reviewed
+    async with container.repository_scope() as repo:
+        remaining = await repo.count(filters, exclude_reviewed, after_id=checkpoint.position)
+    done = checkpoint.processed + checkpoint.failed + checkpoint.skipped
+    progress = Progress(done + remaining, checkpoint)
+
+    async for emails in _db_chunks(container, filters, exclude_reviewed, checkpoint.position, args.chunk_size):
+        prepared = await _submit_prepare(
+            pool, "db", [e.body for e in emails], "", max_tokens
+        )
+        for email in emails:
+            email.matched_email_id = None
+        results = await _classify_chunk(
+            container, emails, [p["cleaned"] for p in prepared], args.concurrency
+        )
+        classified = [r for r in results if isinstance(r, Email)]
+        async with container.repository_scope() as repo:
+            updated = await repo.update_classifications(classified)
+        checkpoint.processed += updated
+        checkpoint.skipped += len(classified) - updated
+        checkpoint.failed += len(results) - len(classified)
+        for error in (r for r in results if isinstance(r, Exception)):
+            logger.warning("Falha ao reclassificar: %s", error)
+        checkpoint.position = emails[-1].id
+        checkpoint.save(args.checkpoint)
+        progress.report()
+    progress.report(final=True)
+
+
+async def _run_file(args, container, checkpoint, pool, max_tokens) -> None:
+    path: Path = args.path
+    kind = args.format or ("mbox" if path.suffix in (".mbox", ".mbx") else "jsonl")
+    progress = Progress(_count_file(path, kind), checkpoint)
+    chunks = _file_chunks(path, kind, checkpoint.position, args.chunk_size)
+
+    def _submit(raw):
+        return _submit_prepare(pool, kind, raw, path.name, max_tokens)
+
+    # Um bloco à frente: o pool prepara o próximo enquanto este classifica.
+    raw = next(chunks, None)
+    pending = _submit(raw) if raw is not None else None
+    while pending is not None:
+        records = await pending
+        position = raw[-1][0]
+        raw = next(chunks, None)
+        pending = _submit(raw) if raw is not None else None
+
+        valid = [r for r in records if "error" not in r and r["from_email"]]
+        for record in records:
+            if record.get("error"):
+                logger.warning("Registro ignorado: %s", record["error"])
+        checkpoint.skipped += len(records) - len(valid)
+
+        emails = [
+            Email(
+                id=None,
+                from_email=r["from_email"],
+                subject=r["subject"],
+                body=r["body"],
+                category=EmailCategory.INCONCLUSIVO,
+                confidence=0.0,
+                draft_reply="",
+                requires_human_review=True,
+                external_id=r["external_id"],
+            )
+            for r in valid
+        ]
+        results = await _classify_chunk(
+            container, emails, [r["cleaned"] for r in valid], args.concurrency
+        )
+        to_save: list[Email] = []
+        for email, result in zip(emails, results):
+            if isinstance(result, Exception):
+                # Não se perde: fica na fila dos workers da API.
+                email.status = EmailStatus.PENDING
+                email.last_error = str(result) or result.__class__.__name__
+                checkpoint.failed += 1
+            else:
+                checkpoint.processed += 1
+                checkpoint.reused += result.matched_email_id is not None
+                email = result
+            to_save.append(email)
+
+        async with container.repository_scope() as repo:
+            saved = await repo.upsert_many(to_save)
+        if container.near_duplicates is not None:
+            for email in saved:
+                container.near_duplicates.observe(email)
+        checkpoint.position = position
+        checkpoint.save(args.checkpoint)
+        progress.report()
+    progress.report(final=True)
+
+
+def _checkpoint_source(args) -> str:
+    if args.mode != "db":
+        return str(args.path.resolve())
+    # Os filtros fazem parte da origem: retomar com outro recorte pularia
+    # e-mails pelo `position` antigo (ou contaria progresso de outra seleção).
+    filters = {
+        "category": args.category,
+        "status": args.status,
+        "only_review": args.only_review,
+        "created_from": args.created_from.isoformat() if args.created_from else None,
+        "created_to": args.created_to.isoformat() if args.created_to else None,
+        "include_reviewed": args.include_reviewed,
+    }
+    return "db:" + json.dumps(filters, sort_keys=True)
+
+
+async def _run(args) -> None:
+    checkpoint = Checkpoint.load(args.checkpoint, _checkpoint_source(args))
+    if checkpoint.position:
+        print(f"Retomando do checkpoint {args.checkpoint} (posição {checkpoint.position})")
+    max_tokens = settings.PREPROCESS_MAX_TOKENS if settings.PREPROCESS_ENABLED else None
+
+    container = _build_container(args.mode)
+    await container.start()
+    pool: Executor | None = (
+        ProcessPoolExecutor(max_workers=args.workers) if args.workers > 0 else None
+    )
+    try:
+        if args.mode == "db":
+            await _run_db(args, container, checkpoint, pool, max_tokens)
+        else:
+            await _run_file(args, container, checkpoint, pool, max_tokens)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        await container.aclose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.CLASSIFY_BATCH_CONCURRENCY,
+        help="Chamadas simultâneas à LLM",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processos para parse/limpeza do texto (0 = no próprio processo)",
+    )
+    parser.add_argument("--checkpoint", type=Path, default=None)
+    modes = parser.add_subparsers(dest="mode", required=True)
+
+    db = modes.add_parser("db", help="Reclassifica e-mails da tabela emails")
+    db.add_argument("--category", choices=[c.value for c in EmailCategory])
+    db.add_argument(
+        "--status",
+        default=EmailStatus.CLASSIFIED.value,
+        choices=[EmailStatus.CLASSIFIED.value, EmailStatus.FAILED.value],
+    )
+    db.add_argument("--only-review", action="store_true", help="Só os pendentes de revisão")
+    db.add_argument("--created-from", type=datetime.fromisoformat)
+    db.add_argument("--created-to", type=datetime.fromisoformat)
+    db.add_argument(
+        "--include-reviewed",
+        action="store_true",
+        help="Reclassifica também e-mails já revisados por humano",
+    )
+
+    file = modes.add_parser("file", help="Importa e classifica um dump JSONL ou mbox")
+    file.add_argument("path", type=Path)
+    file.add_argument("--format", choices=["jsonl", "mbox"])
+
+    args = parser.parse_args()
+    if args.chunk_size < 1 or args.concurrency < 1:
+        parser.error("--chunk-size e --concurrency precisam ser positivos")
+    if args.checkpoint is None:
+        name = "db" if args.mode == "db" else args.path.name
+        args.checkpoint = Path(f"backfill-{name}.checkpoint.json")
+
+    try:
+        asyncio.run(_run(args))
+    except KeyboardInterrupt:
+        sys.exit(f"\nInterrompido; rode de novo para retomar de {args.checkpoint}")
+
+
+if __name__ == "__main__":
+    main()
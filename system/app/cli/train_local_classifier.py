@@ -0,0 +1,120 @@
+# system/app/cli/train_local_classifier.py
+"""
+Treina o modelo linear do classificador local a partir da tabela `emails`.
+
+Uso:
+    python -m system.app.cli.train_local_classifier --output local_model.json
+
+Só entram no treino e-mails que passaram por revisão humana: a categoria
+gravada por uma LLM (ou pelo próprio classificador local) não é rótulo
+confiável, e treinar com ela só reforçaria os erros do modelo. O mesmo
+conjunto mede a precisão das regras, usada quando não há pesos (`--rules-only`).
+
+Uma fração (`--holdout`) fica fora do treino e calibra a confiança do
+modelo (temperature scaling): é ela que o TieredLLMClient compara com
+LOCAL_CLASSIFIER_THRESHOLD para pular a LLM.
+
+Com PREPROCESS_ENABLED, o corpo passa pela mesma limpeza que o
+classificador local vê em produção (HTML, citações, assinatura, corte).
+"""
+import argparse
+import asyncio
+import random
+from dataclasses import replace
+
+from system.app.core.config import settings
+from system.app.domain.entities.email_entity import EmailStatus
+from system.app.infrastructure.llm.local_classifier import (
+    LinearModel,
+    expected_calibration_error,
+    extract_features,
+    fit_temperature,
+    measure_rule_precision,
+    train_linear_model,
+)
+from system.app.infrastructure.llm.preprocessing import EmailPreprocessor
+from system.app.infrastructure.db.session import AsyncSessionLocal, engine
+from system.app.repositories.email_repository import (
+    EmailListFilters,
+    SqlAlchemyEmailRepository,
+)
+
+
+async def _load_samples() -> list:
+    samples = []
+    preprocessor = (
+        EmailPreprocessor(max_tokens=settings.PREPROCESS_MAX_TOKENS)
+        if settings.PREPROCESS_ENABLED
+        else None
+    )
+    filters = EmailListFilters(
+        status=EmailStatus.CLASSIFIED,
+        requires_human_review=False,
+        reviewed=True,
+    )
+    # Só leitura: uma sessão basta, sem LLM, feed nem workers do container.
+    try:
+        async with AsyncSessionLocal() as session:
+            repo = SqlAlchemyEmailRepository(session)
+            async for email in repo.stream(filters):
+                if preprocessor is not None:
+                    email = replace(email, body=preprocessor.process(email.body).text)
+                samples.append((extract_features(email), email.category))
+    finally:
+        await engine.dispose()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", required=True, help="Arquivo JSON de saída")
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument(
+        "--rules-only",
+        action="store_true",
+        help="Só mede a precisão das regras, sem treinar pesos",
+    )
+    parser.add_argument(
+        "--holdout",
+        type=float,
+        default=0.2,
+        help="Fração separada do treino para calibrar a confiança",
+    )
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    samples = asyncio.run(_load_samples())
+    if not samples:
+        parser.exit(1, "Nenhum e-mail revisado para treino.\n")
+
+    if args.rules_only:
+        model = LinearModel(
+            categories=[],
+            bias={},
+            weights={},
+            rule_precision=measure_rule_precision(samples),
+        )
+    else:
+        random.Random(args.seed).shuffle(samples)
+        split = int(len(samples) * args.holdout)
+        holdout, train = samples[:split], samples[split:]
+        if not holdout or not train:
+            parser.exit(1, "Poucos e-mails revisados para separar treino e calibração.\n")
+        model = train_linear_model(train, epochs=args.epochs, seed=args.seed)
+        model.rule_precision = measure_rule_precision(samples)
+        before = expected_calibration_error(model, holdout)
+        model.temperature = fit_temperature(model, holdout)
+        after = expected_calibration_error(model, holdout)
+        print(
+            f"Calibração em {len(holdout)} e-mails: temperatura {model.temperature}, "
+            f"ECE {before:.3f} -> {after:.3f}"
+        )
+    model.dump(args.output)
+    print(
+        f"{len(samples)} e-mails usados; {len(model.weights)} features e "
+        f"{len(model.rule_precision)} precisões de regra salvas em {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,10 @@ class Settings(BaseSettings):
     ENV: str = Field(default="local")
     APP_NAME: str = Field(default="Email Classification API")
     APP_VERSION: str = Field(default="1.0.0")
+    WARMUP_ON_STARTUP: bool = Field(
+        default=True,
+        description="Abre conexão com o banco e a OpenAI antes de aceitar tráfego",
+    )
 
     DATABASE_URL: str = Field(
         default="sqlite+aiosqlite:///./emails.db",
@@ -16,6 +20,235 @@ class Settings(BaseSettings):
 
     OPENAI_API_KEY: str | None = None
     OPENAI_MODEL: str = Field(default="gpt-4o-mini")
+    OPENAI_BASE_URL: str | None = Field(
+        default=None,
+        description="Endpoint compatível com a OpenAI (ex.: mock local de benchmark)",
+    )
+
+    OPENAI_TIMEOUT_SECONDS: float = Field(
+        default=30.0,
+        description="Timeout total de cada requisição à OpenAI",
+    )
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = Field(default=5.0)
+    OPENAI_MAX_CONNECTIONS: int = Field(
+        default=100,
+        description="Tamanho máximo do pool HTTP compartilhado com a OpenAI",
+    )
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20)
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = Field(default=30.0)
+    OPENAI_MAX_RETRIES: int = Field(
+        default=3,
+        description="Novas tentativas em 429/5xx/timeout (0 desativa)",
+    )
+    OPENAI_RETRY_BASE_DELAY_SECONDS: float = Field(default=0.5)
+    OPENAI_RETRY_MAX_DELAY_SECONDS: float = Field(default=20.0)
+
+    CLASSIFICATION_CACHE_BACKEND: str = Field(
+        default="memory",
+        description="Cache de classificações: none | memory | database",
+    )
+    CLASSIFICATION_CACHE_MAX_ENTRIES: int = Field(default=10_000)
+    CLASSIFICATION_CACHE_TTL_SECONDS: int = Field(default=24 * 60 * 60)
+
+    LOCAL_CLASSIFIER_ENABLED: bool = Field(
+        default=False,
+        description="Classificador local antes da LLM (regras + modelo linear)",
+    )
+    LOCAL_CLASSIFIER_THRESHOLD: float = Field(
+        default=0.85,
+        description="Confiança mínima para não escalar o e-mail para a LLM",
+    )
+    LOCAL_CLASSIFIER_MODEL_PATH: str | None = Field(
+        default=None,
+        description="JSON gerado por system.app.cli.train_local_classifier",
+    )
+
+    CLASSIFICATION_WORKERS: int = Field(
+        default=4,
+        description="Workers da fila assíncrona de classificação (0 desativa)",
+    )
+    CLASSIFICATION_JOB_POLL_INTERVAL_SECONDS: float = Field(default=1.0)
+    CLASSIFICATION_JOB_MAX_ATTEMPTS: int = Field(default=3)
+    CLASSIFICATION_JOB_RETRY_BACKOFF_SECONDS: float = Field(
+        default=30.0,
+        description="Espera antes da 2ª tentativa de um job; dobra a cada falha",
+    )
+    CLASSIFICATION_JOB_LEASE_SECONDS: int = Field(
+        default=300,
+        description="Após esse tempo um job PROCESSING é considerado abandonado",
+    )
+    WEBHOOK_TIMEOUT_SECONDS: float = Field(default=5.0)
+
+    CLASSIFY_BATCH_CONCURRENCY: int = Field(
+        default=8,
+        description="Máximo de chamadas simultâneas à LLM por lote",
+    )
+    CLASSIFY_BATCH_MAX_SIZE: int = Field(
+        default=1000,
+        description="Quantidade máxima de e-mails aceita por lote",
+    )
+    PREPROCESS_ENABLED: bool = Field(
+        default=True,
+        description="Remove citações, assinaturas e HTML do corpo antes da classificação",
+    )
+    PREPROCESS_MAX_TOKENS: int = Field(
+        default=1500,
+        description="Orçamento de tokens (estimados) do corpo enviado ao modelo",
+    )
+    LLM_RATE_LIMIT_ENABLED: bool = Field(
+        default=True,
+        description="Fila de prioridade com token bucket na frente das chamadas à OpenAI",
+    )
+    LLM_RATE_LIMIT_RPM: float = Field(
+        default=500,
+        description="Requisições por minuto iniciais; os headers x-ratelimit-* ajustam depois",
+    )
+    LLM_RATE_LIMIT_TPM: float = Field(
+        default=200_000,
+        description="Tokens por minuto iniciais; os headers x-ratelimit-* ajustam depois",
+    )
+    LLM_RATE_LIMIT_DEFAULT_COMPLETION_TOKENS: int = Field(
+        default=400,
+        description="Tokens de resposta estimados quando a chamada não define max_tokens",
+    )
+    LLM_QUEUE_MAX_WAIT_SECONDS: float = Field(
+        default=10.0,
+        description="Espera máxima por cota das chamadas interativas",
+    )
+    LLM_QUEUE_MAX_WAIT_BATCH_SECONDS: float = Field(
+        default=120.0,
+        description="Espera máxima por cota de lotes e jobs assíncronos",
+    )
+    LLM_QUEUE_MAX_WAIT_BACKGROUND_SECONDS: float = Field(
+        default=600.0,
+        description="Espera máxima por cota de rascunhos em segundo plano e backfill",
+    )
+    LLM_ROUTES: str = Field(
+        default="",
+        description=(
+            "Rotas de LLM em ordem de preferência, separadas por vírgula: "
+            "'modelo' ou 'modelo@base_url'. Vazio usa só OPENAI_MODEL"
+        ),
+    )
+    LLM_HEDGE_ENABLED: bool = Field(
+        default=True,
+        description="Dispara uma segunda cópia da chamada quando ela passa do percentil de latência",
+    )
+    LLM_HEDGE_PERCENTILE: float = Field(
+        default=95.0,
+        description="Percentil da latência recente da rota a partir do qual a cópia sai",
+    )
+    LLM_HEDGE_MIN_SAMPLES: int = Field(
+        default=20,
+        description="Latências observadas na rota antes de começar a fazer hedge",
+    )
+    LLM_HEDGE_MIN_DELAY_SECONDS: float = Field(
+        default=0.5,
+        description="Espera mínima antes da cópia, mesmo com percentil menor",
+    )
+    LLM_BREAKER_WINDOW: int = Field(
+        default=20,
+        description="Chamadas recentes consideradas pelo circuit breaker de cada rota",
+    )
+    LLM_BREAKER_MIN_CALLS: int = Field(default=5)
+    LLM_BREAKER_ERROR_RATE: float = Field(
+        default=0.5,
+        description="Taxa de erro na janela que abre o circuito da rota",
+    )
+    LLM_BREAKER_COOLDOWN_SECONDS: float = Field(
+        default=30.0,
+        description="Tempo com o circuito aberto antes da chamada de teste",
+    )
+    LLM_DUMMY_FALLBACK: bool = Field(
+        default=True,
+        description="Sem rota disponível, classifica com o DummyLLMClient e manda para revisão",
+    )
+    NEAR_DUPLICATE_ENABLED: bool = Field(
+        default=False,
+        description="Reaproveita a classificação de e-mails quase idênticos já confiáveis, sem LLM",
+    )
+    NEAR_DUPLICATE_THRESHOLD: float = Field(
+        default=0.8,
+        description="Similaridade (Jaccard estimado) mínima para reaproveitar",
+    )
+    NEAR_DUPLICATE_MIN_CONFIDENCE: float = Field(
+        default=0.9,
+        description="Confiança mínima de um vizinho não revisado para emprestar o resultado",
+    )
+    NEAR_DUPLICATE_MAX_ENTRIES: int = Field(
+        default=50_000,
+        description="E-mails no índice em memória (~2 KB cada); os mais antigos saem primeiro",
+    )
+    WRITE_BEHIND_ENABLED: bool = Field(
+        default=False,
+        description="Agrupa inserts de e-mails novos de requisições simultâneas num único INSERT",
+    )
+    WRITE_BEHIND_MAX_BATCH: int = Field(
+        default=100,
+        description="Máximo de e-mails por INSERT do writer write-behind",
+    )
+    WRITE_BEHIND_MAX_DELAY_MS: float = Field(
+        default=5.0,
+        description="Tempo máximo que um e-mail espera o lote encher antes do INSERT",
+    )
+    DRAFT_MODE: str = Field(
+        default="inline",
+        description=(
+            "inline: a classificação já traz o rascunho; lazy: classifica numa "
+            "chamada curta e gera o rascunho depois (GET /emails/{id}/draft)"
+        ),
+    )
+    CLASSIFY_MAX_TOKENS: int = Field(
+        default=60,
+        description="Limite de tokens de saída da classificação no modo lazy",
+    )
+    DRAFT_MAX_TOKENS: int = Field(
+        default=400,
+        description="Limite de tokens de saída da geração de rascunho",
+    )
+    DRAFT_BACKGROUND_MIN_CONFIDENCE: float = Field(
+        default=0.9,
+        description="No modo lazy, gera em segundo plano o rascunho dos e-mails com confiança a partir deste valor",
+    )
+    DRAFT_WORKERS: int = Field(
+        default=2,
+        description="Tarefas que geram rascunhos em segundo plano (0 desativa)",
+    )
+    REVIEW_LEASE_SECONDS: int = Field(
+        default=900,
+        description="Tempo que um revisor mantém os e-mails reservados",
+    )
+    REVIEW_CLAIM_MAX: int = Field(
+        default=50,
+        description="Máximo de e-mails por POST /emails/review/claim",
+    )
+    BULK_UPDATE_MAX_SIZE: int = Field(
+        default=1000,
+        description="Quantidade máxima de e-mails por PATCH /emails/bulk",
+    )
+    LLM_PACK_SIZE: int = Field(
+        default=10,
+        description="E-mails empacotados por chamada à LLM nos lotes (1 desativa)",
+    )
+    EMAIL_FEED_BACKEND: str = Field(
+        default="memory",
+        description=(
+            "Feed ao vivo (GET /emails/feed): none | memory (um processo) | "
+            "postgres (LISTEN/NOTIFY, para várias réplicas ou workers)"
+        ),
+    )
+    EMAIL_FEED_MAX_PENDING: int = Field(
+        default=1000,
+        description="Eventos acumulados por cliente lento antes de desconectá-lo com reset",
+    )
+    EMAIL_FEED_REPLAY_MAX: int = Field(
+        default=1000,
+        description="E-mails reenviados ao retomar de um id; acima disso o cliente recebe reset",
+    )
+    EMAIL_FEED_HEARTBEAT_SECONDS: float = Field(
+        default=15.0,
+        description="Intervalo dos pings que mantêm a conexão do feed aberta em proxies",
+    )
 
     class Config:
         # Load the .env colocated with the app package regardless of cwd.
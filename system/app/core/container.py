@@ -0,0 +1,369 @@
+# system/app/core/container.py
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from system.app.core.config import Settings
+from system.app.infrastructure.llm.classification_cache import (
+    CacheStats,
+    CachedLLMClient,
+    ClassificationCache,
+    InMemoryClassificationCache,
+    SqlClassificationCache,
+    TieredClassificationCache,
+)
+from system.app.infrastructure.llm.llm_client import PROMPT_VERSION
+from system.app.infrastructure.llm.near_duplicate import NearDuplicateIndex
+from system.app.infrastructure.llm.openai_client import DummyLLMClient
+from system.app.repositories.email_repository import (
+    EmailChangePublisher,
+    EmailRepository,
+    SqlAlchemyEmailRepository,
+)
+from system.app.services.classification_worker import ClassificationWorkerPool
+from system.app.services.draft_generator import DraftGenerator
+from system.app.services.email_service import EmailClassificationService
+from system.app.services.email_feed import EmailFeedHub
+from system.app.services.write_behind import WriteBehindEmailWriter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AppContainer:
+    """
+    Objetos de vida longa do processo, montados uma vez no lifespan do
+    FastAPI e fechados no shutdown: engine do banco, clientes HTTP da OpenAI,
+    pilha de clientes de LLM, workers da fila, gerador de rascunhos e o
+    hub do feed ao vivo.
+    """
+
+    settings: Settings
+    engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    llm_client: object
+    cached_llm_client: CachedLLMClient | None = None
+    openai_clients: list = field(default_factory=list)
+    classification_workers: ClassificationWorkerPool | None = None
+    draft_generator: DraftGenerator | None = None
+    email_writer: WriteBehindEmailWriter | None = None
+    near_duplicates: NearDuplicateIndex | None = None
+    email_feed: EmailFeedHub | None = None
+    # Quem o repositório avisa a cada commit que altera e-mails.
+    email_changes: EmailChangePublisher | None = None
+    background: list = field(default_factory=list)
+
+    @classmethod
+    def build(
+        cls,
+        settings: Settings,
+        engine: AsyncEngine,
+        session_factory: async_sessionmaker[AsyncSession],
+    ) -> "AppContainer":
+        draft_mode = settings.DRAFT_MODE.lower()
+        if draft_mode not in ("inline", "lazy"):
+            raise ValueError(f"DRAFT_MODE inválido: {settings.DRAFT_MODE}")
+        lazy_drafts = draft_mode == "lazy"
+        # Resultados sem rascunho não podem se misturar no cache com os completos.
+        prompt_version = f"{PROMPT_VERSION}-classify" if lazy_drafts else PROMPT_VERSION
+
+        openai_clients: list = []
+        if settings.OPENAI_API_KEY:
+            llm_client, model, openai_clients = _build_routed_client(
+                settings, lazy_drafts
+            )
+        else:
+            llm_client, model = DummyLLMClient(lazy_drafts=lazy_drafts), "dummy"
+        # Fase 2 fala direto com o modelo: rascunhos não passam pelo cache.
+        draft_client = llm_client
+
+        cached_client = None
+        cache = _build_classification_cache(
+            settings, session_factory, model, prompt_version
+        )
+        if cache is not None:
+            llm_client = cached_client = CachedLLMClient(
+                llm_client,
+                cache,
+                model=model,
+                prompt_version=prompt_version,
+            )
+
+        # O estágio local fica na frente de tudo: custa microssegundos.
+        if settings.LOCAL_CLASSIFIER_ENABLED:
+            from system.app.infrastructure.llm.local_classifier import (
+                LinearModel,
+                LocalClassifier,
+                TieredLLMClient,
+            )
+
+            linear_model = (
+                LinearModel.load(settings.LOCAL_CLASSIFIER_MODEL_PATH)
+                if settings.LOCAL_CLASSIFIER_MODEL_PATH
+                else None
+            )
+            llm_client = TieredLLMClient(
+                LocalClassifier(linear_model),
+                llm_client,
+                threshold=settings.LOCAL_CLASSIFIER_THRESHOLD,
+            )
+
+        # Por fora de tudo: cache e classificador local também enxergam o
+        # texto limpo, e e-mails que só diferem no histórico citado
+        # compartilham a mesma entrada no cache.
+        if settings.PREPROCESS_ENABLED:
+            from system.app.infrastructure.llm.preprocessing import (
+                EmailPreprocessor,
+                PreprocessingLLMClient,
+            )
+
+            preprocessor = EmailPreprocessor(max_tokens=settings.PREPROCESS_MAX_TOKENS)
+            llm_client = PreprocessingLLMClient(llm_client, preprocessor)
+            draft_client = PreprocessingLLMClient(draft_client, preprocessor)
+
+        container = cls(
+            settings=settings,
+            engine=engine,
+            session_factory=session_factory,
+            llm_client=llm_client,
+            cached_llm_client=cached_client,
+            openai_clients=openai_clients,
+        )
+
+        _build_email_feed(container)
+
+        if settings.WRITE_BEHIND_ENABLED:
+            container.email_writer = WriteBehindEmailWriter(
+                container.repository_scope,
+                max_batch=settings.WRITE_BEHIND_MAX_BATCH,
+                max_delay_ms=settings.WRITE_BEHIND_MAX_DELAY_MS,
+            )
+            container.background.append(container.email_writer)
+
+        if settings.NEAR_DUPLICATE_ENABLED:
+            container.near_duplicates = NearDuplicateIndex(
+                container.repository_scope,
+                threshold=settings.NEAR_DUPLICATE_THRESHOLD,
+                min_confidence=settings.NEAR_DUPLICATE_MIN_CONFIDENCE,
+                max_entries=settings.NEAR_DUPLICATE_MAX_ENTRIES,
+            )
+            container.background.append(container.near_duplicates)
+
+        if lazy_drafts:
+            container.draft_generator = DraftGenerator(
+                draft_client,
+                repository_scope=container.repository_scope,
+                workers=settings.DRAFT_WORKERS,
+                background_min_confidence=settings.DRAFT_BACKGROUND_MIN_CONFIDENCE,
+            )
+            container.background.append(container.draft_generator)
+
+        if settings.CLASSIFICATION_WORKERS > 0:
+            container.classification_workers = ClassificationWorkerPool(
+                repository_scope=container.repository_scope,
+                llm_client_factory=lambda: container.llm_client,
+                workers=settings.CLASSIFICATION_WORKERS,
+                poll_interval=settings.CLASSIFICATION_JOB_POLL_INTERVAL_SECONDS,
+                max_attempts=settings.CLASSIFICATION_JOB_MAX_ATTEMPTS,
+                retry_backoff=settings.CLASSIFICATION_JOB_RETRY_BACKOFF_SECONDS,
+                lease_seconds=settings.CLASSIFICATION_JOB_LEASE_SECONDS,
+                webhook_timeout=settings.WEBHOOK_TIMEOUT_SECONDS,
+                draft_generator=container.draft_generator,
+                near_duplicates=container.near_duplicates,
+            )
+            container.background.append(container.classification_workers)
+
+        return container
+
+    @asynccontextmanager
+    async def repository_scope(self) -> AsyncIterator[EmailRepository]:
+        """Repositório com sessão própria, fora do ciclo da requisição."""
+        async with self.session_factory() as session:
+            yield SqlAlchemyEmailRepository(session, self.email_changes)
+
+    def classification_service(
+        self, repository: EmailRepository
+    ) -> EmailClassificationService:
+        """
+        Serviço de classificação com tudo o que o container montou. Único
+        ponto de construção para os endpoints, que não podem divergir na
+        fiação (rascunho lazy, write-behind, quase duplicatas).
+        """
+        # O serviço é só um invólucro leve; o cliente de LLM é do container.
+        return EmailClassificationService(
+            llm_client=self.llm_client,
+            email_repository=repository,
+            draft_generator=self.draft_generator,
+            email_writer=self.email_writer,
+            near_duplicates=self.near_duplicates,
+        )
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        return self.cached_llm_client.stats if self.cached_llm_client else None
+
+    async def start(self) -> None:
+        for component in self.background:
+            await component.start()
+
+    async def warmup(self) -> None:
+        """
+        Abre a primeira conexão do pool do banco e faz o handshake TLS com a
+        OpenAI antes da primeira requisição real. Falhas só geram log.
+        """
+        try:
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        except Exception as exc:
+            logger.warning("Warmup do banco falhou: %s", exc)
+
+        for openai_client in self.openai_clients:
+            try:
+                await openai_client.with_options(timeout=5.0).models.list()
+            except Exception as exc:
+                logger.warning("Warmup da OpenAI (%s) falhou: %s", openai_client.base_url, exc)
+
+    async def aclose(self) -> None:
+        for component in reversed(self.background):
+            await component.stop()
+        for openai_client in self.openai_clients:
+            await openai_client.close()
+        await self.engine.dispose()
+
+
+def _build_routed_client(settings: Settings, lazy_drafts: bool):
+    """
+    Um `LLMClient` por rota de LLM_ROUTES, atrás do `RoutedLLMClient`.
+    Rotas no mesmo endpoint compartilham o AsyncOpenAI (e o pool de
+    conexões); cada uma tem seu rate limiter, porque a cota é por modelo.
+    Devolve o cliente, o modelo primário (chave do cache) e os AsyncOpenAI.
+    """
+    # Import tardio: openai/httpx só carregam quando há chave.
+    from system.app.infrastructure.llm.llm_client import LLMClient
+    from system.app.infrastructure.llm.openai_transport import (
+        build_async_openai_client,
+    )
+    from system.app.infrastructure.llm.routing import (
+        CircuitBreaker,
+        LLMRoute,
+        RoutedLLMClient,
+        parse_llm_routes,
+    )
+
+    specs = parse_llm_routes(settings.LLM_ROUTES, settings.OPENAI_MODEL)
+    clients: dict[str | None, object] = {}
+    routes = []
+    for spec in specs:
+        if spec.base_url not in clients:
+            clients[spec.base_url] = build_async_openai_client(spec.base_url)
+        routes.append(
+            LLMRoute(
+                name=spec.name,
+                client=LLMClient(
+                    clients[spec.base_url],
+                    lazy_drafts=lazy_drafts,
+                    rate_limiter=_build_rate_limiter(settings),
+                    model=spec.model,
+                ),
+                breaker=CircuitBreaker(
+                    window=settings.LLM_BREAKER_WINDOW,
+                    min_calls=settings.LLM_BREAKER_MIN_CALLS,
+                    error_rate=settings.LLM_BREAKER_ERROR_RATE,
+                    cooldown=settings.LLM_BREAKER_COOLDOWN_SECONDS,
+                ),
+            )
+        )
+
+    llm_client = RoutedLLMClient(
+        routes,
+        last_resort=(
+            DummyLLMClient(lazy_drafts=lazy_drafts) if settings.LLM_DUMMY_FALLBACK else None
+        ),
+        hedge_percentile=(
+            settings.LLM_HEDGE_PERCENTILE if settings.LLM_HEDGE_ENABLED else None
+        ),
+        hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+        hedge_min_delay=settings.LLM_HEDGE_MIN_DELAY_SECONDS,
+    )
+    return llm_client, specs[0].model, list(clients.values())
+
+
+def _build_email_feed(container: AppContainer) -> None:
+    settings = container.settings
+    backend = settings.EMAIL_FEED_BACKEND.lower()
+    if backend == "none":
+        return
+    if backend not in ("memory", "postgres"):
+        raise ValueError(f"EMAIL_FEED_BACKEND inválido: {backend}")
+
+    container.email_feed = EmailFeedHub(
+        container.repository_scope,
+        max_pending=settings.EMAIL_FEED_MAX_PENDING,
+    )
+    container.background.append(container.email_feed)
+    if backend == "memory":
+        # Um processo só: o repositório avisa o hub direto, depois do commit.
+        container.email_changes = container.email_feed
+        return
+
+    if container.engine.dialect.name != "postgresql":
+        raise ValueError("EMAIL_FEED_BACKEND=postgres exige DATABASE_URL do Postgres")
+    from system.app.infrastructure.db.email_notify import (
+        PostgresEmailChangeListener,
+        PostgresEmailNotifier,
+    )
+
+    container.email_changes = PostgresEmailNotifier()
+    container.background.append(
+        PostgresEmailChangeListener(container.engine, container.email_feed)
+    )
+
+
+def _build_rate_limiter(settings: Settings):
+    if not settings.LLM_RATE_LIMIT_ENABLED:
+        return None
+    from system.app.infrastructure.llm.rate_limiter import (
+        AdaptiveRateLimiter,
+        LLMPriority,
+    )
+
+    return AdaptiveRateLimiter(
+        requests_per_minute=settings.LLM_RATE_LIMIT_RPM,
+        tokens_per_minute=settings.LLM_RATE_LIMIT_TPM,
+        max_wait={
+            LLMPriority.INTERACTIVE: settings.LLM_QUEUE_MAX_WAIT_SECONDS,
+            LLMPriority.BATCH: settings.LLM_QUEUE_MAX_WAIT_BATCH_SECONDS,
+            LLMPriority.BACKGROUND: settings.LLM_QUEUE_MAX_WAIT_BACKGROUND_SECONDS,
+        },
+    )
+
+
+def _build_classification_cache(
+    settings: Settings,
+    session_factory: async_sessionmaker[AsyncSession],
+    model: str,
+    prompt_version: str,
+) -> ClassificationCache | None:
+    backend = settings.CLASSIFICATION_CACHE_BACKEND.lower()
+    if backend == "none":
+        return None
+
+    local = InMemoryClassificationCache(
+        max_entries=settings.CLASSIFICATION_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.CLASSIFICATION_CACHE_TTL_SECONDS,
+    )
+    if backend == "memory":
+        return local
+    if backend == "database":
+        shared = SqlClassificationCache(
+            session_factory,
+            ttl_seconds=settings.CLASSIFICATION_CACHE_TTL_SECONDS,
+            model=model,
+            prompt_version=prompt_version,
+        )
+        return TieredClassificationCache(local, shared)
+    raise ValueError(f"CLASSIFICATION_CACHE_BACKEND inválido: {backend}")
@@ -1,26 +1,46 @@
-from fastapi import Depends
-from sqlalchemy.orm import Session
+from collections.abc import AsyncIterator
 
-from system.app.infrastructure.db.session import get_db
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from system.app.core.container import AppContainer
 from system.app.repositories.email_repository import (
     SqlAlchemyEmailRepository,
     EmailRepository,
 )
+from system.app.repositories.email_stats_repository import (
+    EmailStatsRepository,
+    SqlAlchemyEmailStatsRepository,
+)
 from system.app.services.email_service import EmailClassificationService
-from system.app.core.config import settings
-from system.app.infrastructure.llm.llm_client import LLMClient
-from system.app.infrastructure.llm.openai_client import DummyLLMClient
 
 
-def get_email_repository(db: Session = Depends(get_db)) -> EmailRepository:
-    return SqlAlchemyEmailRepository(db)
+def get_container(request: Request) -> AppContainer:
+    return request.app.state.container
+
+
+async def get_db(
+    container: AppContainer = Depends(get_container),
+) -> AsyncIterator[AsyncSession]:
+    async with container.session_factory() as db:
+        yield db
+
+
+async def get_email_repository(
+    db: AsyncSession = Depends(get_db),
+    container: AppContainer = Depends(get_container),
+) -> EmailRepository:
+    return SqlAlchemyEmailRepository(db, container.email_changes)
+
+
+async def get_email_stats_repository(
+    db: AsyncSession = Depends(get_db),
+) -> EmailStatsRepository:
+    return SqlAlchemyEmailStatsRepository(db)
 
 
-def get_email_classification_service(
+async def get_email_classification_service(
     repo: EmailRepository = Depends(get_email_repository),
+    container: AppContainer = Depends(get_container),
 ) -> EmailClassificationService:
-    llm_client = LLMClient() if settings.OPENAI_API_KEY else DummyLLMClient()
-    return EmailClassificationService(
-        llm_client=llm_client,
-        email_repository=repo,
-    )
+    return container.classification_service(repo)
@@ -0,0 +1,161 @@
+# system/app/core/metrics.py
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram
+
+# Buckets pensados para latências de HTTP/LLM (ms até dezenas de segundos).
+_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0,
+)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latência das requisições HTTP por rota",
+    ["method", "route", "status"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+STAGE_LATENCY = Histogram(
+    "email_stage_duration_seconds",
+    "Latência por etapa do pipeline (llm_call, json_parse, db_commit, ...)",
+    ["stage"],
+    buckets=_LATENCY_BUCKETS,
+)
+
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens consumidos na LLM, segundo completion.usage",
+    ["model", "kind"],
+)
+
+LLM_TOKENS_PER_CALL = Histogram(
+    "llm_tokens_per_call",
+    "Tokens de prompt e de completion por chamada à LLM (planejamento de cota)",
+    ["model", "kind"],
+    buckets=(50, 100, 250, 500, 750, 1000, 1500, 2000, 3000, 4000, 6000, 8000, 16000),
+)
+
+CLASSIFICATION_CACHE_REQUESTS = Counter(
+    "classification_cache_requests_total",
+    "Consultas ao cache de classificação (hit, miss, coalesced = agrupada)",
+    ["outcome"],
+)
+
+LLM_FALLBACKS = Counter(
+    "llm_fallbacks_total",
+    "Caminhos de fallback na interpretação da resposta da LLM",
+    ["reason"],
+)
+
+CLASSIFICATIONS = Counter(
+    "email_classifications_total",
+    "E-mails classificados por categoria",
+    ["category"],
+)
+
+LOCAL_CLASSIFIER_DECISIONS = Counter(
+    "local_classifier_decisions_total",
+    "E-mails resolvidos pelo classificador local ou escalados para a LLM",
+    ["outcome"],
+)
+
+PREPROCESS_TOKENS_SAVED = Histogram(
+    "email_preprocess_tokens_saved",
+    "Tokens estimados removidos do corpo de cada e-mail antes da LLM",
+    buckets=(0, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+
+WRITE_BEHIND_BATCH_SIZE = Histogram(
+    "email_write_behind_batch_size",
+    "E-mails gravados por INSERT do writer write-behind",
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+
+LLM_QUEUE_DEPTH = Gauge(
+    "llm_queue_depth",
+    "Chamadas à LLM esperando cota no rate limiter",
+    ["priority"],
+)
+
+LLM_QUEUE_WAIT = Histogram(
+    "llm_queue_wait_seconds",
+    "Tempo de espera por cota antes de chamar a LLM",
+    ["priority"],
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+
+LLM_QUEUE_TIMEOUTS = Counter(
+    "llm_queue_timeouts_total",
+    "Chamadas à LLM abandonadas por exceder a espera máxima na fila",
+    ["priority"],
+)
+
+
+LLM_ROUTE_LATENCY = Histogram(
+    "llm_route_latency_seconds",
+    "Latência das chamadas bem-sucedidas por rota de LLM",
+    ["route"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+
+LLM_HEDGES = Counter(
+    "llm_hedges_total",
+    "Cópias de hedge disparadas (fired) e que responderam primeiro (won)",
+    ["route", "outcome"],
+)
+
+LLM_ROUTE_FAILOVERS = Counter(
+    "llm_route_failovers_total",
+    "Chamadas que falharam numa rota e seguiram para a próxima",
+    ["route"],
+)
+
+LLM_BREAKER_OPEN = Gauge(
+    "llm_breaker_open",
+    "1 enquanto o circuit breaker da rota está aberto",
+    ["route"],
+)
+
+NEAR_DUPLICATE_LOOKUPS = Counter(
+    "near_duplicate_lookups_total",
+    "Consultas ao índice de quase duplicatas (hit, miss, skipped = texto curto)",
+    ["outcome"],
+)
+
+NEAR_DUPLICATE_INDEX_SIZE = Gauge(
+    "near_duplicate_index_size",
+    "E-mails no índice local de quase duplicatas",
+)
+
+EMAIL_FEED_SUBSCRIBERS = Gauge(
+    "email_feed_subscribers",
+    "Clientes conectados ao feed ao vivo (GET /emails/feed)",
+)
+
+EMAIL_FEED_EVENTS = Counter(
+    "email_feed_events_total",
+    "Eventos entregues aos clientes do feed ao vivo, por tipo",
+    ["kind"],
+)
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+def record_token_usage(model: str, usage) -> None:
+    if usage is None:
+        return
+    for kind, tokens in (
+        ("prompt", usage.prompt_tokens or 0),
+        ("completion", usage.completion_tokens or 0),
+    ):
+        LLM_TOKENS.labels(model=model, kind=kind).inc(tokens)
+        LLM_TOKENS_PER_CALL.labels(model=model, kind=kind).observe(tokens)
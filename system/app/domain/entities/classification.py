@@ -16,4 +16,7 @@ class ClassificationResult:
     category: EmailCategory
     confidence: float
     draft_reply: str
-    requires_human_review: bool
\ No newline at end of file
+    requires_human_review: bool
+    # Respondido por uma rota de failover ou pelo último recurso, não pelo
+    # modelo primário: vale para este e-mail, mas não entra no cache.
+    from_fallback: bool = False
\ No newline at end of file
@@ -1,9 +1,18 @@
 from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
 from typing import Optional
 
 from system.app.domain.entities.classification import EmailCategory
 
 
+class EmailStatus(str, Enum):
+    PENDING = "PENDING"
+    PROCESSING = "PROCESSING"
+    CLASSIFIED = "CLASSIFIED"
+    FAILED = "FAILED"
+
+
 @dataclass
 class Email:
     id: Optional[int]
@@ -15,4 +24,38 @@ class Email:
     draft_reply: str
     requires_human_review: bool
     created_at: Optional[str] = None
-    updated_at: Optional[str] = None
\ No newline at end of file
+    updated_at: Optional[str] = None
+    status: EmailStatus = EmailStatus.CLASSIFIED
+    attempts: int = 0
+    last_error: Optional[str] = None
+    callback_url: Optional[str] = None
+    version: int = 1
+    review_claimed_by: Optional[str] = None
+    review_lease_expires_at: Optional[datetime] = None
+    reviewed_by: Optional[str] = None
+    matched_email_id: Optional[int] = None
+    external_id: Optional[str] = None
+
+
+@dataclass
+class EmailSummary:
+    """Projeção leve de `Email`, sem corpo e sem rascunho."""
+
+    id: int
+    from_email: str
+    subject: str
+    category: EmailCategory
+    confidence: float
+    requires_human_review: bool
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    status: EmailStatus = EmailStatus.CLASSIFIED
+
+
+@dataclass
+class EmailSearchHit:
+    """Resultado da busca textual: resumo do e-mail, relevância e trecho."""
+
+    email: EmailSummary
+    rank: float
+    highlight: str
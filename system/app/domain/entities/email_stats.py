@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from system.app.domain.entities.classification import EmailCategory
+
+
+class StatsGranularity(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+
+
+@dataclass
+class EmailStatsBucket:
+    """Agregado de e-mails classificados num período (UTC)."""
+
+    bucket: datetime
+    category: EmailCategory
+    requires_human_review: bool
+    count: int
+    confidence_sum: float
+
+    @property
+    def avg_confidence(self) -> float:
+        return self.confidence_sum / self.count if self.count else 0.0
+
+
+@dataclass
+class EmailCategoryStats:
+    """Totais de uma categoria (ou de todas, com `category=None`)."""
+
+    category: Optional[EmailCategory] = None
+    count: int = 0
+    review_count: int = 0
+    confidence_sum: float = 0.0
+
+    @property
+    def review_rate(self) -> float:
+        return self.review_count / self.count if self.count else 0.0
+
+    @property
+    def avg_confidence(self) -> float:
+        return self.confidence_sum / self.count if self.count else 0.0
+
+
+def summarize_by_category(buckets: list[EmailStatsBucket]) -> list[EmailCategoryStats]:
+    totals: dict[EmailCategory, EmailCategoryStats] = {}
+    for bucket in buckets:
+        stats = totals.setdefault(bucket.category, EmailCategoryStats(bucket.category))
+        stats.count += bucket.count
+        stats.confidence_sum += bucket.confidence_sum
+        if bucket.requires_human_review:
+            stats.review_count += bucket.count
+    return list(totals.values())
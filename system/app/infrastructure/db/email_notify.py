@@ -0,0 +1,109 @@
+# system/app/infrastructure/db/email_notify.py
+"""
+Mudanças em `emails` entre processos via LISTEN/NOTIFY do Postgres.
+
+O repositório chama `pg_notify` dentro da própria transação: a notificação
+só sai no commit (rollback não avisa ninguém) e chega a todas as réplicas
+e workers, inclusive para escritas de outros processos (ex.: o CLI de
+backfill). Cada processo mantém uma conexão em LISTEN que repassa os ids
+para o `EmailFeedHub` local.
+"""
+import asyncio
+import json
+import logging
+from collections.abc import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from system.app.repositories.email_repository import EmailChanges
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "email_changes"
+# O payload do NOTIFY é limitado a 8000 bytes: ids em pedaços.
+_IDS_PER_NOTIFY = 500
+
+
+def encode_changes(changes: EmailChanges) -> Iterator[str]:
+    for kind, ids in (("c", changes.created), ("u", changes.updated)):
+        for start in range(0, len(ids), _IDS_PER_NOTIFY):
+            yield json.dumps({kind: ids[start : start + _IDS_PER_NOTIFY]}, separators=(",", ":"))
+
+
+def decode_changes(payload: str) -> EmailChanges:
+    data = json.loads(payload)
+    return EmailChanges(created=data.get("c", []), updated=data.get("u", []))
+
+
+class PostgresEmailNotifier:
+    """`EmailChangePublisher` do modo postgres: NOTIFY dentro da transação."""
+
+    def __init__(self, channel: str = CHANNEL):
+        self._channel = channel
+
+    async def before_commit(self, session: AsyncSession, changes: EmailChanges) -> None:
+        for payload in encode_changes(changes):
+            await session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": self._channel, "payload": payload},
+            )
+
+    def after_commit(self, changes: EmailChanges) -> None:
+        pass
+
+
+class PostgresEmailChangeListener:
+    """
+    Conexão dedicada em LISTEN que alimenta o hub local. Se a conexão cai,
+    as notificações do intervalo se perdem: o hub manda reset aos clientes,
+    que recarregam e retomam do último id.
+    """
+
+    def __init__(self, engine: AsyncEngine, hub, channel: str = CHANNEL, retry_seconds: float = 2.0):
+        self._engine = engine
+        self._hub = hub
+        self._channel = channel
+        self._retry_seconds = retry_seconds
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="email-change-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self._hub.publish(decode_changes(payload))
+        except ValueError:
+            logger.warning("Notificação inválida em %s: %r", channel, payload)
+
+    async def _run(self) -> None:
+        connected_before = False
+        while True:
+            try:
+                async with self._engine.connect() as conn:
+                    raw = await conn.get_raw_connection()
+                    driver = raw.driver_connection  # asyncpg.Connection
+                    lost = asyncio.Event()
+                    driver.add_termination_listener(lambda _: lost.set())
+                    await driver.add_listener(self._channel, self._on_notify)
+                    if connected_before:
+                        self._hub.reset()
+                    connected_before = True
+                    try:
+                        await lost.wait()
+                    finally:
+                        if not driver.is_closed():
+                            await driver.remove_listener(self._channel, self._on_notify)
+                    # Conexão morta não volta para o pool.
+                    await conn.invalidate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("LISTEN %s falhou: %s", self._channel, exc)
+            await asyncio.sleep(self._retry_seconds)
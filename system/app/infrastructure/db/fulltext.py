@@ -0,0 +1,67 @@
+# system/app/infrastructure/db/fulltext.py
+"""
+Índice de busca textual sobre assunto, corpo e rascunho dos e-mails.
+
+- Postgres: coluna `search_vector` (tsvector gerado, dicionário português)
+  com índice GIN. Por ser coluna gerada, qualquer INSERT/UPDATE a mantém.
+- SQLite: tabela FTS5 `emails_fts` com conteúdo externo em `emails`,
+  sincronizada por triggers.
+
+A migração cria o mesmo esquema; estes DDLs servem ao `create_all`.
+"""
+from sqlalchemy import DDL, Table, event
+
+POSTGRES_DDL = (
+    """
+    ALTER TABLE emails ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('portuguese', coalesce(subject, '')), 'A')
+        || setweight(to_tsvector('portuguese', coalesce(body, '')), 'B')
+        || setweight(to_tsvector('portuguese', coalesce(draft_reply, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX ix_emails_search_vector ON emails USING GIN (search_vector)",
+)
+
+SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE emails_fts USING fts5(
+        subject, body, draft_reply,
+        content='emails', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER emails_fts_ai AFTER INSERT ON emails BEGIN
+        INSERT INTO emails_fts(rowid, subject, body, draft_reply)
+        VALUES (new.id, new.subject, new.body, new.draft_reply);
+    END
+    """,
+    """
+    CREATE TRIGGER emails_fts_ad AFTER DELETE ON emails BEGIN
+        INSERT INTO emails_fts(emails_fts, rowid, subject, body, draft_reply)
+        VALUES ('delete', old.id, old.subject, old.body, old.draft_reply);
+    END
+    """,
+    # Só reindexa quando o texto muda (status/lease da fila não contam).
+    """
+    CREATE TRIGGER emails_fts_au AFTER UPDATE OF subject, body, draft_reply ON emails BEGIN
+        INSERT INTO emails_fts(emails_fts, rowid, subject, body, draft_reply)
+        VALUES ('delete', old.id, old.subject, old.body, old.draft_reply);
+        INSERT INTO emails_fts(rowid, subject, body, draft_reply)
+        VALUES (new.id, new.subject, new.body, new.draft_reply);
+    END
+    """,
+)
+
+
+def register_fulltext_ddl(table: Table) -> None:
+    for statement in POSTGRES_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+    for statement in SQLITE_DDL:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        table,
+        "before_drop",
+        DDL("DROP TABLE IF EXISTS emails_fts").execute_if(dialect="sqlite"),
+    )
@@ -0,0 +1,31 @@
+from sqlalchemy import (
+    Column,
+    String,
+    Boolean,
+    Float,
+    Text,
+    DateTime,
+)
+from sqlalchemy.sql import func
+
+from system.app.infrastructure.db.base import Base
+
+
+class ClassificationCacheModel(Base):
+    __tablename__ = "classification_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    prompt_version = Column(String(50), nullable=False)
+
+    category = Column(String(50), nullable=False)
+    confidence = Column(Float, nullable=False)
+    draft_reply = Column(Text, nullable=False)
+    requires_human_review = Column(Boolean, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,19 +1,49 @@
 from sqlalchemy import (
     Column,
+    ForeignKey,
     Integer,
     String,
     Boolean,
     Float,
     Text,
     DateTime,
+    Index,
+    text,
 )
 from sqlalchemy.sql import func
 
 from system.app.infrastructure.db.base import Base
+from system.app.infrastructure.db.fulltext import register_fulltext_ddl
 
 
 class EmailModel(Base):
     __tablename__ = "emails"
+    __table_args__ = (
+        # Índices da paginação keyset em (created_at, id), com e sem filtros.
+        Index("ix_emails_created_at_id", "created_at", "id"),
+        Index("ix_emails_category_created_at_id", "category", "created_at", "id"),
+        Index(
+            "ix_emails_review_created_at_id",
+            "requires_human_review",
+            "created_at",
+            "id",
+        ),
+        Index("ix_emails_from_email_created_at_id", "from_email", "created_at", "id"),
+        # Fila de classificação assíncrona drenada por status, em ordem de id.
+        Index("ix_emails_status_id", "status", "id"),
+        # Fila de revisão humana: índice parcial só com o backlog pendente.
+        Index(
+            "ix_emails_review_queue",
+            "category",
+            "confidence",
+            "created_at",
+            "id",
+            postgresql_where=text("requires_human_review AND status = 'CLASSIFIED'"),
+            sqlite_where=text("requires_human_review AND status = 'CLASSIFIED'"),
+        ),
+        # Alvo do ON CONFLICT das importações do backfill.
+        Index("uq_emails_external_id", "external_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     from_email = Column(String(255), nullable=False, index=True)
@@ -25,6 +55,41 @@ class EmailModel(Base):
     draft_reply = Column(Text, nullable=False)
     requires_human_review = Column(Boolean, nullable=False, default=True)
 
+    # Estado da fila de classificação assíncrona (modo 202 + polling/webhook).
+    status = Column(
+        String(20),
+        nullable=False,
+        default="CLASSIFIED",
+        server_default="CLASSIFIED",
+    )
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
+    callback_url = Column(String(2048), nullable=True)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+    # Retentativa com backoff: o job PENDING só volta a ser reservado depois disso.
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Lease da fila de revisão humana (POST /emails/review/claim).
+    review_claimed_by = Column(String(255), nullable=True)
+    review_lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    # Quem concluiu a revisão; vazio em e-mails que nunca passaram por ela.
+    reviewed_by = Column(String(255), nullable=True)
+
+    # E-mail quase idêntico cuja classificação foi reaproveitada (sem LLM).
+    matched_email_id = Column(
+        Integer,
+        ForeignKey("emails.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+
+    # Identificador na origem (Message-ID de mbox, id de JSONL) dos e-mails
+    # importados pelo backfill: reexecutar a importação atualiza, não duplica.
+    external_id = Column(String(255), nullable=True)
+
+    # Concorrência otimista: incrementada a cada alteração de conteúdo.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -35,4 +100,8 @@ class EmailModel(Base):
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
-    )
\ No newline at end of file
+    )
+
+
+# A coluna/tabela de busca textual fica fora do ORM (depende do dialeto).
+register_fulltext_ddl(EmailModel.__table__)
@@ -0,0 +1,30 @@
+from sqlalchemy import (
+    Column,
+    String,
+    Boolean,
+    Float,
+    Integer,
+    DateTime,
+)
+
+from system.app.infrastructure.db.base import Base
+from system.app.infrastructure.db.rollups import register_rollup_ddl
+
+
+class EmailStatsHourlyModel(Base):
+    """
+    Agregados por hora (UTC), categoria e flag de revisão dos e-mails
+    CLASSIFIED. Mantida por triggers em `emails`, nunca pela aplicação.
+    """
+
+    __tablename__ = "email_stats_hourly"
+
+    bucket = Column(DateTime(timezone=False), primary_key=True)
+    category = Column(String(50), primary_key=True)
+    requires_human_review = Column(Boolean, primary_key=True)
+
+    email_count = Column(Integer, nullable=False, default=0)
+    confidence_sum = Column(Float, nullable=False, default=0.0)
+
+
+register_rollup_ddl(EmailStatsHourlyModel.__table__)
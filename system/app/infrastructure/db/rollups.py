@@ -0,0 +1,118 @@
+# system/app/infrastructure/db/rollups.py
+"""
+Triggers que mantêm `email_stats_hourly` a cada INSERT/UPDATE/DELETE em
+`emails`, para que GET /emails/stats não dependa do tamanho da tabela.
+Só entram e-mails com status CLASSIFIED.
+
+- Postgres: triggers por statement com tabelas de transição; um insert em
+  lote de N e-mails vira um único upsert agregado.
+- SQLite: triggers por linha com upsert.
+
+A migração cria o mesmo esquema; estes DDLs servem ao `create_all`.
+"""
+from sqlalchemy import DDL, Table, event
+
+
+def _pg_delta(rows: str, sign: str) -> str:
+    return f"""
+            SELECT date_trunc('hour', created_at AT TIME ZONE 'UTC') AS bucket,
+                   category, requires_human_review,
+                   {sign}1 AS n, {sign}confidence AS c
+            FROM {rows} WHERE status = 'CLASSIFIED'"""
+
+
+def _pg_function(name: str, *deltas: str) -> str:
+    # Uma função por evento: cada uma só enxerga as tabelas de transição
+    # que o seu trigger declara.
+    return f"""
+    CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO email_stats_hourly
+            (bucket, category, requires_human_review, email_count, confidence_sum)
+        SELECT bucket, category, requires_human_review, sum(n), sum(c)
+        FROM ({" UNION ALL ".join(deltas)}
+        ) AS delta
+        GROUP BY bucket, category, requires_human_review
+        HAVING sum(n) <> 0 OR sum(c) <> 0
+        -- Ordem fixa das chaves evita deadlock entre statements concorrentes.
+        ORDER BY bucket, category, requires_human_review
+        ON CONFLICT (bucket, category, requires_human_review) DO UPDATE SET
+            email_count = email_stats_hourly.email_count + EXCLUDED.email_count,
+            confidence_sum = email_stats_hourly.confidence_sum + EXCLUDED.confidence_sum;
+        RETURN NULL;
+    END
+    $$
+    """
+
+
+POSTGRES_DDL = (
+    _pg_function("emails_stats_on_insert", _pg_delta("new_rows", "")),
+    _pg_function(
+        "emails_stats_on_update",
+        _pg_delta("new_rows", ""),
+        _pg_delta("old_rows", "-"),
+    ),
+    _pg_function("emails_stats_on_delete", _pg_delta("old_rows", "-")),
+    """
+    CREATE TRIGGER emails_stats_insert AFTER INSERT ON emails
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION emails_stats_on_insert()
+    """,
+    """
+    CREATE TRIGGER emails_stats_update AFTER UPDATE ON emails
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION emails_stats_on_update()
+    """,
+    """
+    CREATE TRIGGER emails_stats_delete AFTER DELETE ON emails
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION emails_stats_on_delete()
+    """,
+)
+
+
+def _sqlite_upsert(row: str, sign: str) -> str:
+    return f"""
+        INSERT INTO email_stats_hourly
+            (bucket, category, requires_human_review, email_count, confidence_sum)
+        SELECT strftime('%Y-%m-%d %H:00:00', {row}.created_at), {row}.category,
+               {row}.requires_human_review, {sign}1, {sign}{row}.confidence
+        WHERE {row}.status = 'CLASSIFIED'
+        ON CONFLICT (bucket, category, requires_human_review) DO UPDATE SET
+            email_count = email_count + excluded.email_count,
+            confidence_sum = confidence_sum + excluded.confidence_sum;"""
+
+
+SQLITE_DDL = (
+    f"""
+    CREATE TRIGGER emails_stats_ai AFTER INSERT ON emails BEGIN
+        {_sqlite_upsert("new", "")}
+    END
+    """,
+    # Só dispara quando muda algo que entra nos agregados.
+    f"""
+    CREATE TRIGGER emails_stats_au
+    AFTER UPDATE OF category, confidence, requires_human_review, status ON emails BEGIN
+        {_sqlite_upsert("old", "-")}
+        {_sqlite_upsert("new", "")}
+    END
+    """,
+    f"""
+    CREATE TRIGGER emails_stats_ad AFTER DELETE ON emails BEGIN
+        {_sqlite_upsert("old", "-")}
+    END
+    """,
+)
+
+
+def register_rollup_ddl(table: Table) -> None:
+    # Os triggers ficam em `emails`: criados depois de todas as tabelas.
+    # DDL() interpreta "%" como formatação, daí o escape do strftime.
+    for dialect, statements in (("postgresql", POSTGRES_DDL), ("sqlite", SQLITE_DDL)):
+        for statement in statements:
+            event.listen(
+                table.metadata,
+                "after_create",
+                DDL(statement.replace("%", "%%")).execute_if(dialect=dialect),
+            )
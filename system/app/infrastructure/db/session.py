@@ -1,26 +1,50 @@
-from collections.abc import Generator
-
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from system.app.core.config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    future=True,
+# Drivers assíncronos/síncronos equivalentes para cada backend suportado.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+_SYNC_DRIVERS = {
+    "sqlite": "sqlite",
+    "postgresql": "postgresql+psycopg2",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Troca o driver da URL pelo equivalente assíncrono (aiosqlite/asyncpg)."""
+    parsed = make_url(url)
+    driver = _ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def to_sync_url(url: str) -> str:
+    """Troca o driver da URL pelo equivalente síncrono (usado pelo Alembic)."""
+    parsed = make_url(url)
+    driver = _SYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        return url
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+engine: AsyncEngine = create_async_engine(
+    to_async_url(settings.DATABASE_URL),
     echo=False,  # se quiser ver SQL no log, troca pra True
+    pool_pre_ping=True,
 )
 
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
+# expire_on_commit=False evita lazy-load implícito (IO síncrono) após o commit.
+AsyncSessionLocal = async_sessionmaker(
     bind=engine,
+    autoflush=False,
+    expire_on_commit=False,
 )
-
-
-def get_db() -> Generator[Session, None, None]:
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
@@ -0,0 +1,300 @@
+# system/app/infrastructure/llm/classification_cache.py
+import asyncio
+import hashlib
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Protocol
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from system.app.core.metrics import CLASSIFICATION_CACHE_REQUESTS
+from system.app.domain.entities.email_entity import Email
+from system.app.domain.entities.classification import (
+    ClassificationResult,
+    EmailCategory,
+)
+from system.app.infrastructure.db.models.classification_cache_model import (
+    ClassificationCacheModel,
+)
+from system.app.infrastructure.llm.streaming import (
+    ClassificationDelta,
+    delta_from_result,
+    stream_classification,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+# "Re:", "RES:", "Fwd:", "ENC:" repetidos no começo do assunto.
+_REPLY_PREFIX = re.compile(r"^\s*((re|res|fw|fwd|enc)\s*:\s*)+", re.IGNORECASE)
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def classification_cache_key(email: Email, model: str, prompt_version: str) -> str:
+    """Hash do conteúdo normalizado + modelo + versão do prompt."""
+    subject = normalize_text(_REPLY_PREFIX.sub("", email.subject))
+    body = normalize_text(email.body)
+    raw = "\x1f".join((model, prompt_version, subject, body))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ClassificationCache(Protocol):
+    async def get(self, key: str) -> ClassificationResult | None: ...
+    async def set(self, key: str, result: ClassificationResult) -> None: ...
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "hit_ratio": round(self.hit_ratio, 4)}
+
+    def record(self, outcome: str, count: int = 1) -> None:
+        """Conta em /health/cache e em classification_cache_requests_total."""
+        if count <= 0:
+            return
+        setattr(self, outcome, getattr(self, outcome) + count)
+        CLASSIFICATION_CACHE_REQUESTS.labels(outcome=outcome).inc(count)
+
+
+class InMemoryClassificationCache:
+    """LRU com TTL, local ao processo."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, ClassificationResult]] = OrderedDict()
+
+    async def get(self, key: str) -> ClassificationResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    async def set(self, key: str, result: ClassificationResult) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SqlClassificationCache:
+    """Cache compartilhado entre processos na tabela `classification_cache`."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        ttl_seconds: float,
+        model: str,
+        prompt_version: str,
+    ):
+        self._session_factory = session_factory
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._model = model
+        self._prompt_version = prompt_version
+
+    async def get(self, key: str) -> ClassificationResult | None:
+        async with self._session_factory() as session:
+            row = await session.get(ClassificationCacheModel, key)
+        if row is None or _as_utc(row.expires_at) < datetime.now(timezone.utc):
+            return None
+        return ClassificationResult(
+            category=EmailCategory(row.category),
+            confidence=row.confidence,
+            draft_reply=row.draft_reply,
+            requires_human_review=row.requires_human_review,
+        )
+
+    async def set(self, key: str, result: ClassificationResult) -> None:
+        async with self._session_factory() as session:
+            await session.merge(
+                ClassificationCacheModel(
+                    cache_key=key,
+                    model=self._model,
+                    prompt_version=self._prompt_version,
+                    category=result.category.value,
+                    confidence=result.confidence,
+                    draft_reply=result.draft_reply,
+                    requires_human_review=result.requires_human_review,
+                    expires_at=datetime.now(timezone.utc) + self._ttl,
+                )
+            )
+            await session.commit()
+
+
+class TieredClassificationCache:
+    """LRU local na frente de um cache compartilhado (ex.: banco)."""
+
+    def __init__(self, local: ClassificationCache, shared: ClassificationCache):
+        self._local = local
+        self._shared = shared
+
+    async def get(self, key: str) -> ClassificationResult | None:
+        result = await self._local.get(key)
+        if result is None:
+            result = await self._shared.get(key)
+            if result is not None:
+                await self._local.set(key, result)
+        return result
+
+    async def set(self, key: str, result: ClassificationResult) -> None:
+        await self._local.set(key, result)
+        await self._shared.set(key, result)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite devolve datetimes sem timezone.
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _cacheable(result: ClassificationResult) -> bool:
+    # Confiança zero é o fallback de resposta malformada; `from_fallback`
+    # veio de outro modelo (a chave é do primário) ou do último recurso.
+    return result.confidence > 0 and not result.from_fallback
+
+
+class CachedLLMClient:
+    """
+    Decorator para qualquer cliente com `classify_email`: consulta o cache
+    antes de chamar o modelo e agrupa chamadas idênticas simultâneas.
+    """
+
+    def __init__(
+        self,
+        inner,
+        cache: ClassificationCache,
+        model: str,
+        prompt_version: str,
+    ):
+        self._inner = inner
+        self._cache = cache
+        self._model = model
+        self._prompt_version = prompt_version
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.stats = CacheStats()
+
+    async def classify_email(self, email: Email) -> ClassificationResult:
+        key = classification_cache_key(email, self._model, self._prompt_version)
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.stats.record("coalesced")
+            return replace(await asyncio.shield(pending))
+
+        # Registra o "em andamento" antes de qualquer await para que cópias
+        # simultâneas (ex.: num lote) esperem esta chamada.
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._cache.get(key)
+            if result is not None:
+                self.stats.record("hits")
+            else:
+                self.stats.record("misses")
+                result = await self._inner.classify_email(email)
+                if _cacheable(result):
+                    await self._cache.set(key, result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Evita "Future exception was never retrieved" sem concorrentes.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._inflight.pop(key, None)
+
+        return replace(result)
+
+    async def stream_classify_email(
+        self, email: Email
+    ) -> AsyncIterator[ClassificationDelta]:
+        """
+        Acerto no cache vira um único evento; na falta, repassa o stream do
+        cliente interno e grava o resultado final. Streams não são agrupados
+        (cada agente precisa dos próprios pedaços).
+        """
+        key = classification_cache_key(email, self._model, self._prompt_version)
+        cached = await self._cache.get(key)
+        if cached is not None:
+            self.stats.record("hits")
+            yield delta_from_result(replace(cached))
+            return
+
+        self.stats.record("misses")
+        async for delta in stream_classification(self._inner, email):
+            if delta.result is not None and _cacheable(delta.result):
+                await self._cache.set(key, delta.result)
+                delta.result = replace(delta.result)
+            yield delta
+
+    async def classify_many(
+        self, emails: list[Email]
+    ) -> list[ClassificationResult | Exception]:
+        """Responde do cache o que existir e empacota só os e-mails restantes."""
+        keys = [
+            classification_cache_key(e, self._model, self._prompt_version)
+            for e in emails
+        ]
+        results: list[ClassificationResult | Exception | None] = []
+        for key in keys:
+            cached = await self._cache.get(key)
+            results.append(replace(cached) if cached is not None else None)
+        self.stats.record("hits", sum(1 for r in results if r is not None))
+
+        # Cópias do mesmo conteúdo dentro do lote viram uma única chamada.
+        pending: dict[str, list[int]] = {}
+        for index, (key, result) in enumerate(zip(keys, results)):
+            if result is None:
+                pending.setdefault(key, []).append(index)
+        if not pending:
+            return results
+
+        self.stats.record("misses", len(pending))
+        self.stats.record("coalesced", sum(len(v) - 1 for v in pending.values()))
+        unique = [emails[indexes[0]] for indexes in pending.values()]
+        inner_many = getattr(self._inner, "classify_many", None)
+        if inner_many is not None:
+            fresh = await inner_many(unique)
+        else:
+            fresh = await asyncio.gather(
+                *(self._inner.classify_email(e) for e in unique),
+                return_exceptions=True,
+            )
+
+        for (key, indexes), result in zip(pending.items(), fresh):
+            if isinstance(result, ClassificationResult) and _cacheable(result):
+                await self._cache.set(key, result)
+            for index in indexes:
+                results[index] = (
+                    replace(result)
+                    if isinstance(result, ClassificationResult)
+                    else result
+                )
+        return results
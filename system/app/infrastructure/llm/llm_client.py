@@ -1,25 +1,32 @@
 import asyncio
 import json
-
-from openai import OpenAI
+import time
+from collections.abc import AsyncIterator
 
 from system.app.core.config import settings
+from system.app.core.metrics import (
+    LLM_FALLBACKS,
+    STAGE_LATENCY,
+    record_token_usage,
+    time_stage,
+)
 from system.app.domain.entities.email_entity import Email
 from system.app.domain.entities.classification import (
     ClassificationResult,
     EmailCategory,
 )
+from system.app.infrastructure.llm.openai_transport import create_chat_completion
+from system.app.infrastructure.llm.rate_limiter import AdaptiveRateLimiter
+from system.app.infrastructure.llm.streaming import (
+    ClassificationDelta,
+    ClassificationStreamParser,
+    delta_from_result,
+)
 
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
-
-
-class LLMClient:
-    """
-    Cliente de LLM usando OpenAI para classificar e gerar rascunho.
-    """
+# Incrementar sempre que o prompt mudar: invalida o cache de classificações.
+PROMPT_VERSION = "v1"
 
-    async def classify_email(self, email: Email) -> ClassificationResult:
-        system_prompt = """
+SYSTEM_PROMPT = """
 Você é um assistente especializado em atendimento ao cliente de e-commerce.
 
 Sua tarefa é:
@@ -50,66 +57,318 @@ Responda SEMPRE em JSON puro, no formato:
 }
 """
 
-        user_content = f"""
-E-mail do cliente:
+# Instruções extras do modo em lote: o preâmbulo acima é enviado uma única vez.
+PACKED_PROMPT_SUFFIX = """
+MODO LOTE: você receberá VÁRIOS e-mails, cada um marcado com [EMAIL <indice>].
+Trate cada e-mail de forma independente e responda com UM objeto JSON no formato:
+
+{
+  "results": [
+    {"index": 0, "classification": "...", "confidence": 0.0, "draft_reply": "...", "requires_human_review": true}
+  ]
+}
+
+Inclua exatamente um item por e-mail recebido, usando o mesmo índice.
+"""
+
+# Modo em duas fases: a primeira chamada só classifica (saída de poucas
+# dezenas de tokens); o rascunho é gerado depois, sob demanda.
+CLASSIFY_ONLY_PROMPT = """
+Você é um assistente especializado em atendimento ao cliente de e-commerce.
+
+Classifique o e-mail do cliente em UMA das seguintes categorias EXATAS:
+- FEEDBACK_NEGATIVO: reclamações, insatisfação, problemas com produtos ou atendimento.
+- FEEDBACK_POSITIVO: elogios, satisfação, comentários positivos.
+- GARANTIA: produto defeituoso, quebrado, parou de funcionar, solicitação de garantia.
+- ARREPENDIMENTO_REEMBOLSO: cliente se arrependeu da compra, quer devolver ou reembolso.
+- DUVIDAS_GERAIS: perguntas sobre uso do produto, entrega, prazo, processo de compra, etc.
+- INCONCLUSIVO: não é possível determinar claramente.
 
+Informe a confiança (0 a 1) e se é necessária revisão humana (true quando o
+e-mail for sensível, agressivo, confuso ou a confiança for menor que 0.7).
+
+NÃO escreva resposta ao cliente. Responda SOMENTE com JSON puro, no formato:
+
+{"classification": "...", "confidence": 0.0, "requires_human_review": true}
+"""
+
+DRAFT_PROMPT = """
+Você é um atendente de e-commerce. Escreva um rascunho de resposta educado e
+profissional, em português, para o e-mail do cliente abaixo, levando em conta
+a categoria já atribuída. Responda apenas com o texto do rascunho, sem JSON.
+"""
+
+# Itens do lote sem esses campos são tratados como malformados.
+_PACKED_REQUIRED_KEYS = {"classification", "confidence"}
+
+FALLBACK_DRAFT_REPLY = (
+    "Olá,\n\n"
+    "Obrigado pelo seu contato. Recebemos sua mensagem e ela será analisada "
+    "por nossa equipe de suporte em breve.\n\n"
+    "Atenciosamente,\nEquipe de Suporte"
+)
+
+
+def _format_email(email: Email) -> str:
+    return f"""
 Remetente: {email.from_email}
 Assunto: {email.subject}
 Corpo:
 {email.body}
 """
 
-        # A biblioteca da OpenAI é síncrona; usamos to_thread pra não travar o event loop.
-        completion = await asyncio.to_thread(
-            client.chat.completions.create,
-            model=settings.OPENAI_MODEL,
+
+def _fallback_result(with_draft: bool = True) -> ClassificationResult:
+    # fallback defensivo caso o modelo quebre o formato
+    return ClassificationResult(
+        category=EmailCategory.INCONCLUSIVO,
+        confidence=0.0,
+        draft_reply=FALLBACK_DRAFT_REPLY if with_draft else "",
+        requires_human_review=True,
+    )
+
+
+def _packed_suffix(with_draft: bool) -> str:
+    if with_draft:
+        return PACKED_PROMPT_SUFFIX
+    return PACKED_PROMPT_SUFFIX.replace(', "draft_reply": "..."', "")
+
+
+def _parse_result(data: dict, with_draft: bool = True) -> ClassificationResult:
+    raw_class = data.get("classification", "INCONCLUSIVO")
+
+    try:
+        category = EmailCategory(raw_class)
+    except ValueError:
+        LLM_FALLBACKS.labels(reason="unknown_category").inc()
+        category = EmailCategory.INCONCLUSIVO
+
+    confidence = float(data.get("confidence", 0.0))
+    draft_reply = (data.get("draft_reply") or "").strip()
+    requires_human_review = bool(data.get("requires_human_review", True))
+
+    # Regra de negócio extra: abaixo do limiar, força revisão humana
+    if confidence < 0.7:
+        requires_human_review = True
+
+    if not with_draft:
+        # Rascunho vazio = ainda não gerado (ver GET /emails/{id}/draft).
+        draft_reply = ""
+    elif not draft_reply:
+        draft_reply = "Olá,\n\nObrigado pelo seu contato. Nossa equipe irá analisar seu caso.\n\nAtenciosamente,\nEquipe de Suporte"
+
+    return ClassificationResult(
+        category=category,
+        confidence=confidence,
+        draft_reply=draft_reply,
+        requires_human_review=requires_human_review,
+    )
+
+
+class LLMClient:
+    """
+    Cliente de LLM usando OpenAI para classificar e gerar rascunho.
+    """
+
+    def __init__(
+        self,
+        openai_client=None,
+        lazy_drafts: bool = False,
+        rate_limiter: AdaptiveRateLimiter | None = None,
+        model: str | None = None,
+    ):
+        # Sem cliente injetado, usa o AsyncOpenAI compartilhado do processo.
+        self._openai_client = openai_client
+        self._model = model or settings.OPENAI_MODEL
+        # Compartilhado por todas as chamadas do processo (ver rate_limiter.py).
+        self._rate_limiter = rate_limiter
+        # Com `lazy_drafts`, classify_email só classifica e devolve
+        # `draft_reply` vazio; o rascunho sai de `generate_draft`.
+        self._lazy_drafts = lazy_drafts
+
+    async def classify_email(self, email: Email) -> ClassificationResult:
+        user_content = "\nE-mail do cliente:\n" + _format_email(email)
+        with_draft = not self._lazy_drafts
+        system_prompt = SYSTEM_PROMPT if with_draft else CLASSIFY_ONLY_PROMPT
+        extra = {}
+        if not with_draft:
+            # Fase 1 do modo em duas fases: saída curta e limitada.
+            extra = {
+                "max_tokens": settings.CLASSIFY_MAX_TOKENS,
+                "response_format": {"type": "json_object"},
+            }
+
+        # Cliente assíncrono nativo, com pool HTTP compartilhado e retentativas.
+        with time_stage("llm_call"):
+            completion = await create_chat_completion(
+                self._openai_client,
+                self._rate_limiter,
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_content},
+                ],
+                temperature=0.2,
+                **extra,
+            )
+        record_token_usage(self._model, completion.usage)
+
+        content = completion.choices[0].message.content
+
+        # Tenta parsear o JSON retornado
+        with time_stage("json_parse"):
+            try:
+                data = json.loads(content)
+            except json.JSONDecodeError:
+                LLM_FALLBACKS.labels(reason="json_decode").inc()
+                return _fallback_result(with_draft)
+
+            return _parse_result(data, with_draft)
+
+    async def generate_draft(self, email: Email, category: EmailCategory) -> str:
+        """Fase 2: gera só o rascunho de resposta, já sabendo a categoria."""
+        user_content = (
+            f"\nCategoria: {category.value}\nE-mail do cliente:\n" + _format_email(email)
+        )
+        with time_stage("llm_call_draft"):
+            completion = await create_chat_completion(
+                self._openai_client,
+                self._rate_limiter,
+                model=self._model,
+                messages=[
+                    {"role": "system", "content": DRAFT_PROMPT},
+                    {"role": "user", "content": user_content},
+                ],
+                temperature=0.4,
+                max_tokens=settings.DRAFT_MAX_TOKENS,
+            )
+        record_token_usage(self._model, completion.usage)
+        draft = (completion.choices[0].message.content or "").strip()
+        return draft or FALLBACK_DRAFT_REPLY
+
+    async def stream_classify_email(
+        self, email: Email
+    ) -> AsyncIterator[ClassificationDelta]:
+        """
+        Mesma classificação de `classify_email`, mas com a completion em
+        streaming: categoria/confiança saem assim que aparecem no JSON parcial
+        e o `draft_reply` sai em pedaços. O último evento traz `result`.
+        """
+        if self._lazy_drafts:
+            # Sem rascunho, a resposta é curta demais para valer o streaming.
+            yield delta_from_result(await self.classify_email(email))
+            return
+
+        user_content = "\nE-mail do cliente:\n" + _format_email(email)
+
+        start = time.perf_counter()
+        first_event = True
+        parser = ClassificationStreamParser()
+        usage = None
+        stream = await create_chat_completion(
+            self._openai_client,
+            self._rate_limiter,
+            model=self._model,
             messages=[
-                {"role": "system", "content": system_prompt},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": user_content},
             ],
             temperature=0.2,
+            stream=True,
+            stream_options={"include_usage": True},
         )
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            for delta in parser.feed(chunk.choices[0].delta.content or ""):
+                if first_event:
+                    first_event = False
+                    STAGE_LATENCY.labels(stage="llm_stream_first_event").observe(
+                        time.perf_counter() - start
+                    )
+                yield delta
+        STAGE_LATENCY.labels(stage="llm_call_stream").observe(time.perf_counter() - start)
+        record_token_usage(self._model, usage)
 
-        content = completion.choices[0].message.content
+        with time_stage("json_parse"):
+            try:
+                result = _parse_result(json.loads(parser.buffer))
+            except json.JSONDecodeError:
+                LLM_FALLBACKS.labels(reason="json_decode").inc()
+                result = _fallback_result()
+        yield ClassificationDelta(result=result)
 
-        # Tenta parsear o JSON retornado
-        try:
-            data = json.loads(content)
-        except json.JSONDecodeError:
-            # fallback defensivo caso o modelo quebre o formato
-            return ClassificationResult(
-                category=EmailCategory.INCONCLUSIVO,
-                confidence=0.0,
-                draft_reply=(
-                    "Olá,\n\n"
-                    "Obrigado pelo seu contato. Recebemos sua mensagem e ela será analisada "
-                    "por nossa equipe de suporte em breve.\n\n"
-                    "Atenciosamente,\nEquipe de Suporte"
-                ),
-                requires_human_review=True,
+    async def classify_many(
+        self, emails: list[Email]
+    ) -> list[ClassificationResult | Exception]:
+        """
+        Classifica vários e-mails numa única chamada, enviando o prompt de
+        sistema uma vez só. Itens ausentes ou malformados na resposta caem
+        para `classify_email` individualmente.
+
+        Retorna uma lista alinhada com `emails`; falhas do fallback aparecem
+        como a exceção correspondente.
+        """
+        with_draft = not self._lazy_drafts
+        if len(emails) <= 1:
+            return await asyncio.gather(
+                *(self.classify_email(e) for e in emails),
+                return_exceptions=True,
+            )
+
+        extra = {}
+        if not with_draft:
+            extra["max_tokens"] = settings.CLASSIFY_MAX_TOKENS * len(emails)
+        user_content = "\n".join(
+            f"[EMAIL {index}]{_format_email(email)}"
+            for index, email in enumerate(emails)
+        )
+        with time_stage("llm_call_packed"):
+            completion = await create_chat_completion(
+                self._openai_client,
+                self._rate_limiter,
+                model=self._model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": (SYSTEM_PROMPT if with_draft else CLASSIFY_ONLY_PROMPT)
+                        + _packed_suffix(with_draft),
+                    },
+                    {"role": "user", "content": user_content},
+                ],
+                temperature=0.2,
+                response_format={"type": "json_object"},
+                **extra,
             )
+        record_token_usage(self._model, completion.usage)
+
+        parsed: dict[int, ClassificationResult] = {}
+        with time_stage("json_parse"):
+            try:
+                items = json.loads(completion.choices[0].message.content)["results"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                LLM_FALLBACKS.labels(reason="json_decode").inc()
+                items = []
 
-        raw_class = data.get("classification", "INCONCLUSIVO")
-
-        try:
-            category = EmailCategory(raw_class)
-        except ValueError:
-            category = EmailCategory.INCONCLUSIVO
-
-        confidence = float(data.get("confidence", 0.0))
-        draft_reply = (data.get("draft_reply") or "").strip()
-        requires_human_review = bool(data.get("requires_human_review", True))
-
-        # Regra de negócio extra: abaixo do limiar, força revisão humana
-        if confidence < 0.7:
-            requires_human_review = True
-
-        return ClassificationResult(
-            category=category,
-            confidence=confidence,
-            draft_reply=(
-                draft_reply
-                or "Olá,\n\nObrigado pelo seu contato. Nossa equipe irá analisar seu caso.\n\nAtenciosamente,\nEquipe de Suporte"
-            ),
-            requires_human_review=requires_human_review,
-        )
\ No newline at end of file
+            for item in items if isinstance(items, list) else []:
+                try:
+                    index = int(item["index"])
+                    if 0 <= index < len(emails) and _PACKED_REQUIRED_KEYS <= item.keys():
+                        parsed[index] = _parse_result(item, with_draft)
+                except (AttributeError, KeyError, TypeError, ValueError):
+                    continue
+
+        missing = [i for i in range(len(emails)) if i not in parsed]
+        LLM_FALLBACKS.labels(reason="packed_item").inc(len(missing))
+        retried = await asyncio.gather(
+            *(self.classify_email(emails[i]) for i in missing),
+            return_exceptions=True,
+        )
+        results: list[ClassificationResult | Exception] = [
+            parsed.get(i) for i in range(len(emails))
+        ]
+        for i, result in zip(missing, retried):
+            results[i] = result
+        return results
@@ -0,0 +1,411 @@
+# system/app/infrastructure/llm/local_classifier.py
+import asyncio
+import json
+import math
+import random
+import re
+import unicodedata
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from system.app.core.metrics import LOCAL_CLASSIFIER_DECISIONS
+from system.app.domain.entities.email_entity import Email
+from system.app.domain.entities.classification import (
+    ClassificationResult,
+    EmailCategory,
+)
+from system.app.infrastructure.llm.streaming import (
+    ClassificationDelta,
+    delta_from_result,
+    stream_classification,
+)
+
+# Radicais sem acento: o texto é normalizado antes do casamento.
+KEYWORD_RULES: dict[EmailCategory, tuple[str, ...]] = {
+    EmailCategory.FEEDBACK_NEGATIVO: (
+        r"reclama\w*", r"problema\w*", r"insatisfeit\w*", r"pessim\w*",
+        r"horrivel", r"decepcion\w*", r"descaso", r"absurdo",
+    ),
+    EmailCategory.FEEDBACK_POSITIVO: (
+        r"elogi\w*", r"gostei", r"adorei", r"parabens", r"excelente",
+        r"otim[oa]", r"satisfeit\w*", r"recomendo",
+    ),
+    EmailCategory.GARANTIA: (
+        r"garantia", r"defeit\w*", r"quebrad[oa]s?", r"parou de funcionar",
+        r"nao liga", r"estragou", r"assistencia tecnica",
+    ),
+    EmailCategory.ARREPENDIMENTO_REEMBOLSO: (
+        r"arrependi\w*", r"reembols\w*", r"devolu\w*", r"devolver",
+        r"estorno", r"dinheiro de volta", r"cancelar a compra",
+    ),
+    EmailCategory.DUVIDAS_GERAIS: (
+        r"duvida\w*", r"pergunta\w*", r"como faco", r"como funciona",
+        r"prazo", r"rastreio", r"rastreamento",
+    ),
+}
+
+_TOKEN = re.compile(r"[a-z0-9]{3,}")
+
+DRAFT_TEMPLATES: dict[EmailCategory, str] = {
+    EmailCategory.FEEDBACK_NEGATIVO: (
+        "Olá,\n\nLamentamos muito pela experiência que você teve. Sua reclamação "
+        "foi registrada e nossa equipe vai analisar o caso e retornar em breve."
+    ),
+    EmailCategory.FEEDBACK_POSITIVO: (
+        "Olá,\n\nMuito obrigado pelo seu feedback! Ficamos felizes em saber que "
+        "você teve uma boa experiência com a nossa loja."
+    ),
+    EmailCategory.GARANTIA: (
+        "Olá,\n\nSentimos pelo problema com o seu produto. Para seguir com a "
+        "garantia, por favor nos envie o número do pedido e fotos ou um vídeo "
+        "mostrando o defeito."
+    ),
+    EmailCategory.ARREPENDIMENTO_REEMBOLSO: (
+        "Olá,\n\nRecebemos sua solicitação de devolução/reembolso. Por favor, "
+        "informe o número do pedido para darmos andamento ao processo."
+    ),
+    EmailCategory.DUVIDAS_GERAIS: (
+        "Olá,\n\nObrigado pela sua mensagem. Nossa equipe vai verificar a sua "
+        "dúvida e responder com as informações em breve."
+    ),
+}
+_DRAFT_SIGNATURE = "\n\nAtenciosamente,\nEquipe de Suporte"
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sem acentos e com espaços colapsados."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.split())
+
+
+def _compile_rules() -> re.Pattern:
+    # Um grupo nomeado por categoria: uma única varredura conta todas.
+    groups = [
+        f"(?P<{category.value}>{'|'.join(patterns)})"
+        for category, patterns in KEYWORD_RULES.items()
+    ]
+    return re.compile(r"\b(?:" + "|".join(groups) + r")\b")
+
+
+_RULES = _compile_rules()
+
+
+def rule_hits(text: str) -> Counter:
+    return Counter(m.lastgroup for m in _RULES.finditer(text))
+
+
+def extract_features(email: Email) -> Counter:
+    """Tokens do assunto+corpo normalizados mais um indicador por regra."""
+    text = normalize(f"{email.subject} {email.body}")
+    features = Counter(_TOKEN.findall(text))
+    for category, hits in rule_hits(text).items():
+        features[f"rule:{category}"] += hits
+    return features
+
+
+def rule_vote(features: Counter) -> tuple[EmailCategory, str] | None:
+    """
+    Categoria com mais evidências pelas regras e a chave da sua precisão
+    medida: a mesma categoria é mais confiável quando é a única que aparece.
+    """
+    hits = {
+        EmailCategory(f.split(":", 1)[1]): n
+        for f, n in features.items()
+        if f.startswith("rule:")
+    }
+    if not hits:
+        return None
+    category, _ = max(hits.items(), key=lambda item: item[1])
+    kind = "unica" if len(hits) == 1 else "disputada"
+    return category, f"{category.value}:{kind}"
+
+
+def _wilson_lower_bound(correct: int, total: int, z: float = 1.96) -> float:
+    # Limite inferior do intervalo de Wilson (95%): poucas amostras não
+    # viram confiança alta só porque acertaram todas.
+    if total == 0:
+        return 0.0
+    p = correct / total
+    denominator = 1 + z * z / total
+    centre = p + z * z / (2 * total)
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total))
+    return max(0.0, (centre - margin) / denominator)
+
+
+def measure_rule_precision(
+    samples: Iterable[tuple[Counter, EmailCategory]],
+) -> dict[str, float]:
+    """Precisão das regras contra rótulos confiáveis, por chave de `rule_vote`."""
+    correct: Counter = Counter()
+    total: Counter = Counter()
+    for features, target in samples:
+        vote = rule_vote(features)
+        if vote is None:
+            continue
+        category, key = vote
+        total[key] += 1
+        correct[key] += category == target
+    return {key: round(_wilson_lower_bound(correct[key], n), 4) for key, n in total.items()}
+
+
+@dataclass
+class LocalPrediction:
+    category: EmailCategory
+    confidence: float
+
+
+@dataclass
+class LinearModel:
+    """
+    Regressão logística multinomial sobre bag-of-words, treinada offline,
+    mais a precisão das regras medida no mesmo conjunto rotulado.
+
+    `temperature` calibra a confiança (temperature scaling): ajustada num
+    conjunto separado do treino para que 0.9 acerte ~90% das vezes, já que
+    é ela que decide se a LLM é pulada.
+    """
+
+    categories: list[EmailCategory]
+    bias: dict[str, float]
+    weights: dict[str, dict[str, float]]
+    rule_precision: dict[str, float] = field(default_factory=dict)
+    temperature: float = 1.0
+
+    def scores(self, features: Counter) -> dict[str, float]:
+        scores = {c.value: self.bias.get(c.value, 0.0) for c in self.categories}
+        for feature, count in features.items():
+            for category, weight in self.weights.get(feature, {}).items():
+                scores[category] += weight * count
+        return scores
+
+    def predict(self, features: Counter) -> LocalPrediction:
+        probabilities = _softmax(self.scores(features), self.temperature)
+        best = max(probabilities, key=probabilities.get)
+        return LocalPrediction(EmailCategory(best), probabilities[best])
+
+    @classmethod
+    def load(cls, path: str | Path) -> "LinearModel":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls(
+            categories=[EmailCategory(c) for c in data["categories"]],
+            bias=data["bias"],
+            weights=data["weights"],
+            rule_precision=data.get("rule_precision", {}),
+            temperature=data.get("temperature", 1.0),
+        )
+
+    def dump(self, path: str | Path) -> None:
+        payload = {
+            "version": 1,
+            "categories": [c.value for c in self.categories],
+            "bias": self.bias,
+            "weights": self.weights,
+            "rule_precision": self.rule_precision,
+            "temperature": self.temperature,
+        }
+        Path(path).write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+
+def _softmax(scores: dict[str, float], temperature: float = 1.0) -> dict[str, float]:
+    top = max(scores.values())
+    exps = {k: math.exp((v - top) / temperature) for k, v in scores.items()}
+    total = sum(exps.values())
+    return {k: v / total for k, v in exps.items()}
+
+
+def _log_loss(
+    scored: list[tuple[dict[str, float], str]], temperature: float
+) -> float:
+    loss = 0.0
+    for scores, target in scored:
+        probability = _softmax(scores, temperature).get(target, 0.0)
+        loss -= math.log(max(probability, 1e-12))
+    return loss / len(scored)
+
+
+def fit_temperature(
+    model: LinearModel,
+    samples: Iterable[tuple[Counter, EmailCategory]],
+    low: float = 0.05,
+    high: float = 20.0,
+    iterations: int = 60,
+) -> float:
+    """
+    Temperatura que minimiza a log-loss em `samples`, que não podem ter
+    entrado no treino. Busca por seção áurea em log(T): a log-loss é
+    unimodal na temperatura.
+    """
+    scored = [(model.scores(features), target.value) for features, target in samples]
+    if not scored:
+        return 1.0
+    ratio = (math.sqrt(5) - 1) / 2
+    a, b = math.log(low), math.log(high)
+    for _ in range(iterations):
+        c = b - ratio * (b - a)
+        d = a + ratio * (b - a)
+        if _log_loss(scored, math.exp(c)) <= _log_loss(scored, math.exp(d)):
+            b = d
+        else:
+            a = c
+    return round(math.exp((a + b) / 2), 4)
+
+
+def expected_calibration_error(
+    model: LinearModel,
+    samples: Iterable[tuple[Counter, EmailCategory]],
+    bins: int = 10,
+) -> float:
+    """Diferença média entre confiança e acerto, por faixa de confiança."""
+    buckets: list[list[tuple[float, bool]]] = [[] for _ in range(bins)]
+    for features, target in samples:
+        prediction = model.predict(features)
+        index = min(bins - 1, int(prediction.confidence * bins))
+        buckets[index].append((prediction.confidence, prediction.category == target))
+    total = sum(len(bucket) for bucket in buckets)
+    if total == 0:
+        return 0.0
+    return sum(
+        abs(sum(c for c, _ in bucket) - sum(ok for _, ok in bucket)) / total
+        for bucket in buckets
+        if bucket
+    )
+
+
+def train_linear_model(
+    samples: Iterable[tuple[Counter, EmailCategory]],
+    epochs: int = 10,
+    learning_rate: float = 0.1,
+    l2: float = 1e-4,
+    min_weight: float = 1e-3,
+    seed: int = 13,
+) -> LinearModel:
+    """SGD simples em Python puro; o volume de treino cabe em memória."""
+    data = list(samples)
+    categories = list(EmailCategory)
+    labels = [c.value for c in categories]
+    bias = {c: 0.0 for c in labels}
+    weights: dict[str, dict[str, float]] = {}
+    rng = random.Random(seed)
+
+    for _ in range(epochs):
+        rng.shuffle(data)
+        for features, target in data:
+            scores = {c: bias[c] for c in labels}
+            for feature, count in features.items():
+                for c, w in weights.get(feature, {}).items():
+                    scores[c] += w * count
+            probabilities = _softmax(scores)
+            for c in labels:
+                gradient = probabilities[c] - (1.0 if c == target.value else 0.0)
+                bias[c] -= learning_rate * gradient
+                for feature, count in features.items():
+                    row = weights.setdefault(feature, {})
+                    w = row.get(c, 0.0)
+                    row[c] = w - learning_rate * (gradient * count + l2 * w)
+
+    pruned = {
+        feature: {c: round(w, 5) for c, w in row.items() if abs(w) >= min_weight}
+        for feature, row in weights.items()
+    }
+    return LinearModel(
+        categories=categories,
+        bias={c: round(b, 5) for c, b in bias.items()},
+        weights={f: row for f, row in pruned.items() if row},
+        rule_precision=measure_rule_precision(data),
+    )
+
+
+class LocalClassifier:
+    """
+    Estágio local e barato: regras compiladas numa única regex e, se houver,
+    um modelo linear treinado a partir da tabela `emails`.
+
+    Sem pesos treinados, a confiança de uma regra é a precisão medida dela
+    no arquivo do modelo; sem medição, é zero e o e-mail sempre escala.
+    """
+
+    def __init__(self, model: LinearModel | None = None):
+        self._model = model
+
+    def predict(self, email: Email) -> LocalPrediction:
+        features = extract_features(email)
+        if self._model is not None and self._model.weights:
+            return self._model.predict(features)
+
+        vote = rule_vote(features)
+        if vote is None:
+            return LocalPrediction(EmailCategory.INCONCLUSIVO, 0.0)
+        category, key = vote
+        precision = self._model.rule_precision if self._model is not None else {}
+        return LocalPrediction(category, precision.get(key, 0.0))
+
+
+class TieredLLMClient:
+    """
+    Classificador em camadas: resolve localmente o que tem confiança acima
+    de `threshold` e só escala o restante para o cliente remoto (LLM).
+    """
+
+    def __init__(self, local: LocalClassifier, remote, threshold: float):
+        self._local = local
+        self._remote = remote
+        self._threshold = threshold
+
+    def _try_local(self, email: Email) -> ClassificationResult | None:
+        prediction = self._local.predict(email)
+        if (
+            prediction.category == EmailCategory.INCONCLUSIVO
+            or prediction.confidence < self._threshold
+        ):
+            LOCAL_CLASSIFIER_DECISIONS.labels(outcome="escalated").inc()
+            return None
+        LOCAL_CLASSIFIER_DECISIONS.labels(outcome="local").inc()
+        return ClassificationResult(
+            category=prediction.category,
+            confidence=prediction.confidence,
+            draft_reply=DRAFT_TEMPLATES[prediction.category] + _DRAFT_SIGNATURE,
+            # Mesma regra de negócio do LLMClient para o limiar de revisão.
+            requires_human_review=prediction.confidence < 0.7,
+        )
+
+    async def classify_email(self, email: Email) -> ClassificationResult:
+        result = self._try_local(email)
+        if result is not None:
+            return result
+        return await self._remote.classify_email(email)
+
+    async def stream_classify_email(
+        self, email: Email
+    ) -> AsyncIterator[ClassificationDelta]:
+        result = self._try_local(email)
+        if result is not None:
+            yield delta_from_result(result)
+            return
+        async for delta in stream_classification(self._remote, email):
+            yield delta
+
+    async def classify_many(
+        self, emails: list[Email]
+    ) -> list[ClassificationResult | Exception]:
+        results: list[ClassificationResult | Exception | None] = [
+            self._try_local(e) for e in emails
+        ]
+        escalated = [i for i, r in enumerate(results) if r is None]
+        if not escalated:
+            return results
+
+        pending = [emails[i] for i in escalated]
+        remote_many = getattr(self._remote, "classify_many", None)
+        if remote_many is not None:
+            remote_results = await remote_many(pending)
+        else:
+            remote_results = await asyncio.gather(
+                *(self._remote.classify_email(e) for e in pending),
+                return_exceptions=True,
+            )
+        for i, result in zip(escalated, remote_results):
+            results[i] = result
+        return results
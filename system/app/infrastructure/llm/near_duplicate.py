@@ -0,0 +1,247 @@
+# system/app/infrastructure/llm/near_duplicate.py
+"""
+Índice local de e-mails quase idênticos (MinHash + LSH).
+
+O cache de classificação só acerta textos idênticos. Cadeias de resposta,
+a mesma reclamação com outra saudação e mensagens de template de
+marketplace diferem em poucas palavras: aqui cada e-mail vira uma
+assinatura MinHash dos 3-gramas de palavras do assunto + corpo
+normalizados, e as bandas da assinatura (LSH) acham candidatos sem
+comparar com todos. A similaridade estimada (Jaccard) decide o reuso.
+
+Só entram no índice e-mails confiáveis: classificados, fora da fila de
+revisão e revisados por humano ou com confiança alta. O índice é memória
+do processo: reconstruído do banco no startup e atualizado a cada
+gravação feita por esta réplica.
+"""
+import asyncio
+import logging
+import re
+from array import array
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+
+from system.app.core.metrics import NEAR_DUPLICATE_INDEX_SIZE, NEAR_DUPLICATE_LOOKUPS
+from system.app.domain.entities.email_entity import Email, EmailStatus
+from system.app.infrastructure.llm.classification_cache import _REPLY_PREFIX
+from system.app.infrastructure.llm.local_classifier import normalize
+from system.app.infrastructure.llm.preprocessing import (
+    strip_html,
+    strip_quoted_history,
+    strip_signature,
+)
+from system.app.repositories.email_repository import EmailListFilters, EmailRepository
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"\w+")
+_DIGITS = re.compile(r"\d+")
+# Saudações no começo ("Bom dia, Olá João,"): texto já sem acentos.
+_GREETING = re.compile(
+    r"^(\s*(ola|oi|bom dia|boa tarde|boa noite|prezad[oa]s?|car[oa]s?|hello|hi|dear)"
+    r"(\s+\w+){0,3}\s*[,!.:])+"
+)
+_BIN_BITS = 6
+_MASK64 = (1 << 64) - 1
+
+NUM_PERM = 1 << _BIN_BITS
+# LSH usa as 32 primeiras posições (8 bandas x 4): Jaccard 0.8 vira
+# candidato com ~98% de chance; a similaridade usa as 64.
+BANDS = 8
+ROWS_PER_BAND = 4
+SHINGLE_SIZE = 3
+# Textos curtos demais ficam de fora: "não quero cancelar" e "quero
+# cancelar" diferem em uma palavra. Para eles já existe o cache exato.
+MIN_WORDS = 8
+
+
+def _words(text: str) -> list[str]:
+    text = _GREETING.sub("", normalize(text))
+    # Números de pedido/protocolo não mudam o assunto da mensagem.
+    return _WORD.findall(_DIGITS.sub("0", text))
+
+
+def _grams(words: list[str]) -> set[str]:
+    if len(words) < SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {
+        " ".join(words[i : i + SHINGLE_SIZE])
+        for i in range(len(words) - SHINGLE_SIZE + 1)
+    }
+
+
+def shingles(email: Email) -> set[str]:
+    """3-gramas de palavras do assunto e do corpo; vazio se curto demais."""
+    subject = _words(_REPLY_PREFIX.sub("", email.subject))
+    body = _words(strip_signature(strip_quoted_history(strip_html(email.body))))
+    if len(body) < MIN_WORDS:
+        return set()
+    # Assunto e corpo separados: 3-gramas que atravessam os dois mudariam
+    # só porque a saudação mudou.
+    return {f"s:{gram}" for gram in _grams(subject)} | _grams(body)
+
+
+@dataclass
+class NearDuplicateMatch:
+    email_id: int
+    similarity: float
+
+
+class NearDuplicateIndex:
+    def __init__(
+        self,
+        repository_scope: Callable[[], AbstractAsyncContextManager[EmailRepository]],
+        threshold: float,
+        min_confidence: float,
+        max_entries: int,
+    ):
+        self._repository_scope = repository_scope
+        self._threshold = threshold
+        self._min_confidence = min_confidence
+        self._max_entries = max_entries
+        # Ordem de inserção: o mais antigo sai primeiro quando lota.
+        self._signatures: OrderedDict[int, array] = OrderedDict()
+        self._buckets: defaultdict[int, list[int]] = defaultdict(list)
+        self._rebuild_task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    async def start(self) -> None:
+        # Em segundo plano: até terminar, o índice só acerta menos.
+        self._rebuild_task = asyncio.create_task(self.rebuild(), name="near-duplicate-rebuild")
+
+    async def stop(self) -> None:
+        if self._rebuild_task is not None:
+            self._rebuild_task.cancel()
+            await asyncio.gather(self._rebuild_task, return_exceptions=True)
+            self._rebuild_task = None
+
+    async def rebuild(self) -> None:
+        """Recarrega do banco os `max_entries` e-mails reutilizáveis mais recentes."""
+        self._signatures.clear()
+        self._buckets.clear()
+        filters = EmailListFilters(status=EmailStatus.CLASSIFIED, requires_human_review=False)
+        try:
+            async with self._repository_scope() as repo:
+                scanned = 0
+                async for email in repo.stream(filters):
+                    if len(self) >= self._max_entries:
+                        break
+                    # Quem já entrou por `observe` durante a carga fica como está.
+                    if (
+                        email.id not in self._signatures
+                        and self.is_reusable(email)
+                        and self._add(email)
+                    ):
+                        # Vem do mais novo para o mais velho: vai para o
+                        # começo da fila de descarte.
+                        self._signatures.move_to_end(email.id, last=False)
+                    scanned += 1
+                    if scanned % 500 == 0:
+                        # Assinaturas custam CPU: cede o loop às requisições.
+                        await asyncio.sleep(0)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Falha ao reconstruir o índice de quase duplicatas")
+        NEAR_DUPLICATE_INDEX_SIZE.set(len(self))
+        logger.info("Índice de quase duplicatas: %d e-mails", len(self))
+
+    def is_reusable(self, email: Email) -> bool:
+        """O e-mail pode emprestar categoria e rascunho a outros?"""
+        return (
+            email.id is not None
+            and email.status == EmailStatus.CLASSIFIED
+            and not email.requires_human_review
+            # Cópias não entram: o vizinho certo é o original.
+            and email.matched_email_id is None
+            and (email.reviewed_by is not None or email.confidence >= self._min_confidence)
+        )
+
+    def observe(self, email: Email) -> None:
+        """Atualiza o índice depois de gravar: entra, sai ou é substituído."""
+        if email.id is None:
+            return
+        if not (self.is_reusable(email) and self._add(email)):
+            self.discard(email.id)
+        NEAR_DUPLICATE_INDEX_SIZE.set(len(self))
+
+    def discard(self, email_id: int) -> None:
+        signature = self._signatures.pop(email_id, None)
+        if signature is None:
+            return
+        for key in self._band_keys(signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.remove(email_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def lookup(self, email: Email) -> NearDuplicateMatch | None:
+        """Vizinho mais parecido acima do limiar, se houver."""
+        signature = self._signature(email)
+        if signature is None:
+            NEAR_DUPLICATE_LOOKUPS.labels(outcome="skipped").inc()
+            return None
+
+        best: NearDuplicateMatch | None = None
+        candidates = {
+            candidate
+            for key in self._band_keys(signature)
+            for candidate in self._buckets.get(key, ())
+        }
+        for candidate in candidates:
+            other = self._signatures[candidate]
+            similarity = sum(a == b for a, b in zip(signature, other)) / NUM_PERM
+            if similarity >= self._threshold and (best is None or similarity > best.similarity):
+                best = NearDuplicateMatch(candidate, similarity)
+        NEAR_DUPLICATE_LOOKUPS.labels(outcome="hit" if best else "miss").inc()
+        return best
+
+    def _add(self, email: Email) -> bool:
+        signature = self._signature(email)
+        if signature is None:
+            return False
+        self.discard(email.id)
+        self._signatures[email.id] = signature
+        for key in self._band_keys(signature):
+            self._buckets[key].append(email.id)
+        while len(self._signatures) > self._max_entries:
+            self.discard(next(iter(self._signatures)))
+        return True
+
+    def _signature(self, email: Email) -> array | None:
+        """
+        MinHash de uma permutação só: cada 3-grama é hasheado uma vez e cai
+        num dos 64 compartimentos, que guardam o menor valor. Custa
+        O(3-gramas) em vez de O(3-gramas x 64). Compartimentos vazios copiam
+        o próximo cheio (densificação por rotação). `hash()` muda entre
+        processos, mas o índice também: é reconstruído a cada startup.
+        """
+        grams = shingles(email)
+        if not grams:
+            return None
+        bins = [_MASK64] * NUM_PERM
+        for gram in grams:
+            h = hash(gram) & _MASK64
+            slot, value = h & (NUM_PERM - 1), h >> _BIN_BITS
+            if value < bins[slot]:
+                bins[slot] = value
+        if _MASK64 in bins:
+            filled = [i for i, v in enumerate(bins) if v != _MASK64]
+            for i in range(NUM_PERM):
+                if bins[i] == _MASK64:
+                    nearest = next((j for j in filled if j > i), filled[0])
+                    distance = (nearest - i) % NUM_PERM
+                    bins[i] = (bins[nearest] + distance * 0x9E3779B97F4A7C15) & _MASK64
+        return array("Q", bins)
+
+    @staticmethod
+    def _band_keys(signature: array) -> list[int]:
+        return [
+            hash((band, *signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]))
+            for band in range(BANDS)
+        ]
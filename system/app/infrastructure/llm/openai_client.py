@@ -7,6 +7,9 @@ from system.app.domain.entities.classification import (
 
 
 class DummyLLMClient:
+    def __init__(self, lazy_drafts: bool = False):
+        self._lazy_drafts = lazy_drafts
+
     async def classify_email(self, email: Email) -> ClassificationResult:
         body_lower = email.body.lower()
 
@@ -23,18 +26,19 @@ class DummyLLMClient:
         else:
             category = EmailCategory.INCONCLUSIVO
 
-        draft = f"""Olá,
+        return ClassificationResult(
+            category=category,
+            confidence=0.7,
+            draft_reply="" if self._lazy_drafts else await self.generate_draft(email, category),
+            requires_human_review=True,
+        )
+
+    async def generate_draft(self, email: Email, category: EmailCategory) -> str:
+        return f"""Olá,
 
 Obrigado pelo contato. Sua mensagem foi classificada como: {category.value}.
 Nossa equipe irá analisar e responder em breve.
 
 Atenciosamente,
 Equipe de Suporte
-"""
-
-        return ClassificationResult(
-            category=category,
-            confidence=0.7,
-            draft_reply=draft,
-            requires_human_review=True,
-        )
\ No newline at end of file
+"""
\ No newline at end of file
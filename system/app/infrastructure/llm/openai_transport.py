@@ -0,0 +1,193 @@
+# system/app/infrastructure/llm/openai_transport.py
+import asyncio
+import email.utils
+import random
+import re
+import time
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from system.app.core.config import settings
+from system.app.infrastructure.llm.rate_limiter import (
+    AdaptiveRateLimiter,
+    RateLimitReservation,
+    estimate_request_tokens,
+)
+
+# openai/httpx são importados só no primeiro uso: sem OPENAI_API_KEY o app
+# sobe com o DummyLLMClient e não paga esse custo no cold start.
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Formato usado pela OpenAI nos headers x-ratelimit-reset-*: "1s", "6m0s", "20ms".
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+_client: "AsyncOpenAI | None" = None
+
+
+def build_async_openai_client(base_url: str | None = None) -> "AsyncOpenAI":
+    """
+    Cria o AsyncOpenAI com um pool httpx próprio e ajustável.
+
+    As retentativas do SDK ficam desligadas: quem controla backoff é
+    `create_chat_completion`, que entende os headers de rate limit.
+    """
+    import httpx
+    from openai import AsyncOpenAI
+
+    timeout = httpx.Timeout(
+        settings.OPENAI_TIMEOUT_SECONDS,
+        connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS,
+    )
+    http_client = httpx.AsyncClient(
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=settings.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        base_url=base_url or settings.OPENAI_BASE_URL,
+        timeout=timeout,
+        max_retries=0,
+        http_client=http_client,
+    )
+
+
+def get_async_openai_client() -> "AsyncOpenAI":
+    """Cliente compartilhado pelo processo, criado no primeiro uso."""
+    global _client
+    if _client is None:
+        _client = build_async_openai_client()
+    return _client
+
+
+def parse_duration(value: str) -> float | None:
+    """Converte "6m0s"/"20ms"/"1.5" em segundos."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def retry_delay_from_headers(headers: Mapping[str, str]) -> float | None:
+    """
+    Extrai quanto esperar antes de tentar de novo, na ordem de precedência:
+    retry-after-ms, retry-after (segundos ou data HTTP) e x-ratelimit-reset-*.
+    """
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        seconds = parse_duration(retry_after)
+        if seconds is not None:
+            return seconds
+        parsed_date = email.utils.parsedate_to_datetime(retry_after)
+        if parsed_date is not None:
+            return max(parsed_date.timestamp() - time.time(), 0.0)
+
+    resets = [
+        parse_duration(headers[name])
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+        if headers.get(name)
+    ]
+    resets = [r for r in resets if r is not None]
+    if resets:
+        return max(resets)
+
+    return None
+
+
+def backoff_delay(attempt: int, headers: Mapping[str, str] | None = None) -> float:
+    """Backoff exponencial com full jitter, respeitando headers do provedor."""
+    cap = settings.OPENAI_RETRY_MAX_DELAY_SECONDS
+    hinted = retry_delay_from_headers(headers) if headers else None
+    if hinted is not None:
+        # Pequeno jitter evita que todas as tentativas acordem juntas.
+        return min(hinted, cap) + random.uniform(0, settings.OPENAI_RETRY_BASE_DELAY_SECONDS)
+    return random.uniform(0, min(cap, settings.OPENAI_RETRY_BASE_DELAY_SECONDS * 2**attempt))
+
+
+def _is_retryable(exc: Exception) -> bool:
+    from openai import APIConnectionError, APIStatusError
+
+    if isinstance(exc, APIStatusError):
+        return exc.status_code in _RETRYABLE_STATUS
+    # APITimeoutError é subclasse de APIConnectionError.
+    return isinstance(exc, APIConnectionError)
+
+
+def _release_reservation(reservation: RateLimitReservation, exc: Exception) -> None:
+    """Devolve a cota que uma tentativa com erro não chegou a consumir."""
+    from openai import APIConnectionError, APIStatusError, APITimeoutError
+
+    if isinstance(exc, APIStatusError):
+        # Recusada pelo servidor: conta como requisição, mas não gasta tokens.
+        reservation.settle(0)
+    elif isinstance(exc, APIConnectionError) and not isinstance(exc, APITimeoutError):
+        # Não houve conexão: nada chegou ao provedor.
+        reservation.refund()
+    # Timeout e outros erros: pode ter sido processada; vale a estimativa.
+
+
+async def create_chat_completion(
+    client: "AsyncOpenAI | None" = None,
+    rate_limiter: AdaptiveRateLimiter | None = None,
+    **kwargs: Any,
+):
+    """
+    `chat.completions.create` com retentativas em 429/5xx/timeout.
+
+    Com `rate_limiter`, cada tentativa espera cota antes de sair e os
+    headers x-ratelimit-* da resposta realimentam os buckets.
+    """
+    client = client or get_async_openai_client()
+    attempt = 0
+    while True:
+        reservation = None
+        if rate_limiter is not None:
+            reservation = await rate_limiter.acquire(
+                estimate_request_tokens(
+                    kwargs.get("messages", []),
+                    kwargs.get("max_tokens"),
+                    settings.LLM_RATE_LIMIT_DEFAULT_COMPLETION_TOKENS,
+                )
+            )
+        try:
+            if rate_limiter is None:
+                return await client.chat.completions.create(**kwargs)
+            raw = await client.chat.completions.with_raw_response.create(**kwargs)
+            rate_limiter.update_from_headers(raw.headers)
+            completion = raw.parse()
+            usage = getattr(completion, "usage", None)
+            # Streams não trazem usage aqui: fica valendo a estimativa.
+            reservation.settle(usage.total_tokens if usage is not None else None)
+            return completion
+        except Exception as exc:
+            if reservation is not None:
+                _release_reservation(reservation, exc)
+            response = getattr(exc, "response", None)
+            headers = response.headers if response is not None else None
+            if rate_limiter is not None and headers is not None:
+                rate_limiter.update_from_headers(headers)
+                if getattr(exc, "status_code", None) == 429:
+                    rate_limiter.pause(retry_delay_from_headers(headers) or 1.0)
+            if attempt >= settings.OPENAI_MAX_RETRIES or not _is_retryable(exc):
+                raise
+            await asyncio.sleep(backoff_delay(attempt, headers))
+            attempt += 1
@@ -0,0 +1,259 @@
+# system/app/infrastructure/llm/preprocessing.py
+"""
+Limpeza do corpo do e-mail antes da classificação: histórico citado,
+assinaturas, avisos legais e HTML costumam ser a maior parte dos tokens
+do prompt. Só o texto enviado ao modelo muda; o `Email` original (e o que
+vai para `EmailModel.body`) fica intacto.
+
+Cada etapa é uma função `str -> str`; `EmailPreprocessor` aplica a
+sequência configurada e corta o resultado no orçamento de tokens.
+"""
+import asyncio
+import html
+import math
+import re
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass, replace
+
+from system.app.core.metrics import PREPROCESS_TOKENS_SAVED
+from system.app.domain.entities.classification import (
+    ClassificationResult,
+    EmailCategory,
+)
+from system.app.domain.entities.email_entity import Email
+from system.app.infrastructure.llm.streaming import (
+    ClassificationDelta,
+    stream_classification,
+)
+
+TextStep = Callable[[str], str]
+
+TRUNCATION_MARKER = " [...]"
+
+_HTML_HINT = re.compile(r"<\s*/?\s*[a-zA-Z!][^>]*>")
+_HTML_DROP = re.compile(
+    r"<(script|style|head)\b[^>]*>.*?</\1\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+_HTML_BREAK = re.compile(
+    r"<\s*(br|/p|/div|/li|/tr|/h[1-6]|p|div|li|tr|h[1-6])\b[^>]*>",
+    re.IGNORECASE,
+)
+_HTML_TAG = re.compile(r"<[^>]+>")
+
+# Cabeçalhos que abrem o histórico citado (clientes em português e inglês).
+_QUOTE_HEADER = re.compile(
+    r"^\s*("
+    r"em .{0,200}escreveu:?"
+    r"|on .{0,200}wrote:?"
+    r"|-{2,}\s*(mensagem original|original message|mensagem encaminhada"
+    r"|forwarded message)\s*-{2,}"
+    r"|_{5,}"
+    r")\s*$",
+    re.IGNORECASE,
+)
+# Bloco "De:/Enviado:/Para:" do Outlook: "De:" seguido de outro cabeçalho.
+_OUTLOOK_FROM = re.compile(r"^\s*(de|from)\s*:", re.IGNORECASE)
+_OUTLOOK_NEXT = re.compile(
+    r"^\s*(enviad[oa] em|enviado|sent|data|date|para|to|assunto|subject)\s*:",
+    re.IGNORECASE,
+)
+
+_SIGNATURE_DELIMITER = re.compile(r"^--\s*$")
+_SIGN_OFF = re.compile(
+    r"^\s*(atenciosamente|att\.?|atte\.?|abra[cç]os?|obrigad[oa],?|grat[oa],?"
+    r"|cordialmente|sauda[cç][oõ]es|regards|best regards|thanks,?)[\s,.!]*$",
+    re.IGNORECASE,
+)
+_MOBILE_FOOTER = re.compile(
+    r"^\s*(enviado d[eo] meu|sent from my|obter o outlook para)\b",
+    re.IGNORECASE,
+)
+_DISCLAIMER = re.compile(
+    r"^\s*(aviso legal|esta mensagem (e seus anexos )?(é|pode conter|contém)"
+    r"|este e-?mail (e seus anexos )?(é|pode conter|contém)"
+    r"|confidentiality notice|this (e-?mail|message) (and any attachments )?"
+    r"(is|may contain|contains))",
+    re.IGNORECASE,
+)
+# Depois da despedida só pode haver uma assinatura: poucas linhas curtas
+# (nome, cargo, telefone), sem frases.
+_SIGNATURE_MAX_LINES = 6
+_SIGNATURE_LINE_MAX_CHARS = 60
+_SENTENCE_PUNCTUATION = re.compile(r"[.!?](\s|$)")
+
+_TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+
+
+def _piece_tokens(piece: str) -> int:
+    # Pontuação conta um token; palavras, ~1 token a cada 4 caracteres.
+    return math.ceil(len(piece) / 4) if piece[0].isalnum() or piece[0] == "_" else 1
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimativa local de tokens, sem carregar o tokenizer da OpenAI. Serve
+    para o orçamento e para a métrica; não precisa ser exata.
+    """
+    return sum(_piece_tokens(piece) for piece in _TOKEN_PIECE.findall(text))
+
+
+def strip_html(text: str) -> str:
+    if not _HTML_HINT.search(text):
+        return text
+    text = _HTML_DROP.sub("", text)
+    text = _HTML_BREAK.sub("\n", text)
+    text = _HTML_TAG.sub("", text)
+    return html.unescape(text)
+
+
+def strip_quoted_history(text: str) -> str:
+    lines = text.splitlines()
+    kept: list[str] = []
+    for index, line in enumerate(lines):
+        if _QUOTE_HEADER.match(line):
+            break
+        if _OUTLOOK_FROM.match(line) and any(
+            _OUTLOOK_NEXT.match(following) for following in lines[index + 1 : index + 4]
+        ):
+            break
+        if line.lstrip().startswith(">"):
+            continue
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def _looks_like_signature(lines: Sequence[str]) -> bool:
+    filled = [line.strip() for line in lines if line.strip()]
+    return len(filled) <= _SIGNATURE_MAX_LINES and all(
+        len(line) <= _SIGNATURE_LINE_MAX_CHARS and not _SENTENCE_PUNCTUATION.search(line)
+        for line in filled
+    )
+
+
+def strip_signature(text: str) -> str:
+    lines = text.splitlines()
+    filled = [index for index, line in enumerate(lines) if line.strip()]
+    if not filled:
+        return text
+    # A primeira linha com conteúdo nunca é cortada ("Obrigado, mas...").
+    first = filled[0]
+
+    cut = len(lines)
+    for index in range(first + 1, len(lines)):
+        line = lines[index]
+        if (
+            _SIGNATURE_DELIMITER.match(line)
+            or _MOBILE_FOOTER.match(line)
+            or _DISCLAIMER.match(line)
+        ):
+            cut = index
+            break
+
+    # Despedida: de baixo para cima, só a última do texto, e só se o que
+    # vem depois dela tem cara de assinatura. Ela fica no texto.
+    for index in range(cut - 1, first, -1):
+        if _SIGN_OFF.match(lines[index]):
+            if _looks_like_signature(lines[index + 1 : cut]):
+                kept = "\n".join(lines[: index + 1])
+                # Assinatura maior que a mensagem: melhor não arriscar.
+                if estimate_tokens(kept) * 2 >= estimate_tokens("\n".join(lines[:cut])):
+                    cut = index + 1
+            break
+    return "\n".join(lines[:cut])
+
+
+def normalize_whitespace(text: str) -> str:
+    lines = [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in text.splitlines()]
+    text = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Corta o texto no último pedaço que cabe em `max_tokens`."""
+    used = 0
+    for match in _TOKEN_PIECE.finditer(text):
+        used += _piece_tokens(match.group())
+        if used > max_tokens:
+            return text[: match.start()].rstrip() + TRUNCATION_MARKER
+    return text
+
+
+DEFAULT_STEPS: tuple[TextStep, ...] = (
+    strip_html,
+    strip_quoted_history,
+    strip_signature,
+    normalize_whitespace,
+)
+
+
+@dataclass
+class PreprocessedText:
+    text: str
+    original_tokens: int
+    tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+
+class EmailPreprocessor:
+    def __init__(self, steps: Sequence[TextStep] = DEFAULT_STEPS, max_tokens: int = 1500):
+        self._steps = tuple(steps)
+        self._max_tokens = max_tokens
+
+    def process(self, text: str) -> PreprocessedText:
+        cleaned = text
+        for step in self._steps:
+            cleaned = step(cleaned)
+        if not cleaned.strip():
+            # Tudo parecia citação/assinatura: melhor mandar o texto bruto
+            # (normalizado) do que um prompt vazio.
+            cleaned = normalize_whitespace(text)
+        cleaned = truncate_to_tokens(cleaned, self._max_tokens)
+        return PreprocessedText(
+            text=cleaned,
+            original_tokens=estimate_tokens(text),
+            tokens=estimate_tokens(cleaned),
+        )
+
+
+class PreprocessingLLMClient:
+    """
+    Decorator para qualquer cliente com `classify_email`: entrega ao
+    cliente interno uma cópia do e-mail com o corpo já limpo.
+    """
+
+    def __init__(self, inner, preprocessor: EmailPreprocessor):
+        self._inner = inner
+        self._preprocessor = preprocessor
+
+    def _prepare(self, email: Email) -> Email:
+        processed = self._preprocessor.process(email.body)
+        PREPROCESS_TOKENS_SAVED.observe(processed.tokens_saved)
+        return replace(email, body=processed.text)
+
+    async def classify_email(self, email: Email) -> ClassificationResult:
+        return await self._inner.classify_email(self._prepare(email))
+
+    async def generate_draft(self, email: Email, category: EmailCategory) -> str:
+        return await self._inner.generate_draft(self._prepare(email), category)
+
+    async def stream_classify_email(
+        self, email: Email
+    ) -> AsyncIterator[ClassificationDelta]:
+        async for delta in stream_classification(self._inner, self._prepare(email)):
+            yield delta
+
+    async def classify_many(
+        self, emails: list[Email]
+    ) -> list[ClassificationResult | Exception]:
+        prepared = [self._prepare(e) for e in emails]
+        inner_many = getattr(self._inner, "classify_many", None)
+        if inner_many is not None:
+            return await inner_many(prepared)
+        return await asyncio.gather(
+            *(self._inner.classify_email(e) for e in prepared),
+            return_exceptions=True,
+        )
@@ -0,0 +1,241 @@
+# system/app/infrastructure/llm/rate_limiter.py
+"""
+Agendador de chamadas à LLM do lado do cliente.
+
+Dois token buckets (requisições e tokens por minuto) começam com os limites
+configurados e se ajustam pelos headers `x-ratelimit-*` de cada resposta.
+Quem não cabe no bucket espera numa fila de prioridade: chamadas
+interativas (/emails/classify) passam na frente de lotes e backfill.
+A espera é limitada; estourado o prazo, a chamada falha com
+`LLMQueueTimeoutError` em vez de acumular na fila.
+
+A prioridade vem de uma contextvar (`llm_priority`), para não precisar
+atravessar todas as camadas de clientes.
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+
+from system.app.core.metrics import (
+    LLM_QUEUE_DEPTH,
+    LLM_QUEUE_TIMEOUTS,
+    LLM_QUEUE_WAIT,
+)
+from system.app.infrastructure.llm.preprocessing import estimate_tokens
+
+
+class LLMPriority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+    BACKGROUND = 2
+
+
+_current_priority: contextvars.ContextVar[LLMPriority] = contextvars.ContextVar(
+    "llm_priority", default=LLMPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority) -> Iterator[None]:
+    """Define a prioridade das chamadas à LLM feitas dentro do bloco."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> LLMPriority:
+    return _current_priority.get()
+
+
+class LLMQueueTimeoutError(Exception):
+    """A chamada esperou mais que o permitido por cota na fila."""
+
+    def __init__(self, priority: LLMPriority, waited: float):
+        self.priority = priority
+        self.waited = waited
+        super().__init__(
+            f"Cota da LLM esgotada: chamada {priority.name.lower()} esperou {waited:.1f}s"
+        )
+
+
+def estimate_request_tokens(
+    messages: list[dict],
+    max_tokens: int | None,
+    default_completion: int,
+) -> int:
+    """Custo estimado antes do envio: prompt + teto (ou média) da resposta."""
+    prompt = sum(estimate_tokens(m.get("content") or "") + 4 for m in messages)
+    return prompt + (max_tokens if max_tokens is not None else default_completion)
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.level = per_minute
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / 60.0
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def time_until(self, amount: float) -> float:
+        # Pedidos maiores que a capacidade esperam o bucket encher.
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate) if self.rate > 0 else float("inf")
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    cost: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+@dataclass
+class RateLimitReservation:
+    limiter: "AdaptiveRateLimiter"
+    estimated_tokens: int
+
+    def settle(self, actual_tokens: int | None) -> None:
+        """Acerta o bucket de tokens com o consumo real (usage.total_tokens)."""
+        if actual_tokens is not None:
+            self.limiter._adjust_tokens(self.estimated_tokens - actual_tokens)
+
+    def refund(self) -> None:
+        """Devolve a requisição e os tokens de uma chamada que não saiu."""
+        self.limiter._refund(self.estimated_tokens)
+
+
+class AdaptiveRateLimiter:
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_wait: Mapping[LLMPriority, float],
+    ):
+        self._requests = _TokenBucket(requests_per_minute)
+        self._tokens = _TokenBucket(tokens_per_minute)
+        self._max_wait = dict(max_wait)
+        self._heap: list[_Waiter] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    async def acquire(
+        self, cost: int, priority: LLMPriority | None = None
+    ) -> RateLimitReservation:
+        priority = current_priority() if priority is None else priority
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(priority, next(self._seq), cost, loop.create_future())
+        heapq.heappush(self._heap, waiter)
+        LLM_QUEUE_DEPTH.labels(priority=priority.name.lower()).inc()
+        start = time.monotonic()
+        try:
+            self._dispatch()
+            if not waiter.future.done():
+                await asyncio.wait_for(
+                    asyncio.shield(waiter.future), self._max_wait.get(priority)
+                )
+        except asyncio.TimeoutError:
+            waited = time.monotonic() - start
+            if not waiter.future.done():
+                waiter.cancelled = True
+                self._dispatch()
+                LLM_QUEUE_TIMEOUTS.labels(priority=priority.name.lower()).inc()
+                raise LLMQueueTimeoutError(priority, waited) from None
+        except asyncio.CancelledError:
+            if not waiter.future.done():
+                waiter.cancelled = True
+                self._dispatch()
+            else:
+                # A vaga já tinha sido concedida: devolve ao bucket.
+                self._refund(cost)
+            raise
+        finally:
+            LLM_QUEUE_DEPTH.labels(priority=priority.name.lower()).dec()
+        LLM_QUEUE_WAIT.labels(priority=priority.name.lower()).observe(time.monotonic() - start)
+        return RateLimitReservation(self, cost)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Ajusta capacidade e saldo pelos headers x-ratelimit-* da resposta."""
+        now = time.monotonic()
+        for bucket, kind in ((self._requests, "requests"), (self._tokens, "tokens")):
+            bucket.refill(now)
+            limit = _as_float(headers.get(f"x-ratelimit-limit-{kind}"))
+            if limit:
+                bucket.capacity = limit
+            remaining = _as_float(headers.get(f"x-ratelimit-remaining-{kind}"))
+            if remaining is not None:
+                # O provedor vê o consumo de todas as réplicas: vale o menor.
+                bucket.level = min(bucket.level, remaining, bucket.capacity)
+        self._dispatch()
+
+    def pause(self, seconds: float) -> None:
+        """Depois de um 429: ninguém sai da fila até o provedor liberar."""
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        self._requests.level = min(self._requests.level, 0.0)
+        self._dispatch()
+
+    def _adjust_tokens(self, delta: float) -> None:
+        self._tokens.refill(time.monotonic())
+        self._tokens.level = min(self._tokens.capacity, self._tokens.level + delta)
+        self._dispatch()
+
+    def _refund(self, cost: int) -> None:
+        self._requests.level = min(self._requests.capacity, self._requests.level + 1)
+        self._adjust_tokens(cost)
+
+    def _dispatch(self) -> None:
+        """Libera os primeiros da fila enquanto houver saldo nos dois buckets."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+
+        while self._heap:
+            head = self._heap[0]
+            if head.cancelled or head.future.done():
+                heapq.heappop(self._heap)
+                continue
+            # Prioridade estrita: o primeiro da fila bloqueia os demais,
+            # senão pedidos pequenos matariam os grandes de fome.
+            wait = max(
+                self._paused_until - now,
+                self._requests.time_until(1),
+                self._tokens.time_until(head.cost),
+            )
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._heap)
+            self._requests.level -= 1
+            self._tokens.level -= head.cost
+            head.future.set_result(None)
+
+
+def _as_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
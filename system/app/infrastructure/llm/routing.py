@@ -0,0 +1,377 @@
+# system/app/infrastructure/llm/routing.py
+"""
+Roteamento entre modelos/endpoints para controlar a latência de cauda.
+
+- Rotas: lista ordenada (LLM_ROUTES); a primeira disponível atende.
+- Hedge: se a chamada passa do percentil LLM_HEDGE_PERCENTILE da latência
+  recente da rota, uma segunda cópia sai na mesma rota e vale a que
+  terminar primeiro.
+- Circuit breaker: com taxa de erro alta na janela recente, a rota fica
+  aberta por LLM_BREAKER_COOLDOWN_SECONDS e o tráfego vai para a próxima.
+  Sem nenhuma rota disponível, o `DummyLLMClient` responde como último
+  recurso (com confiança zero: vai para revisão e não entra no cache).
+"""
+import asyncio
+import bisect
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from typing import TypeVar
+
+from system.app.core.metrics import (
+    LLM_BREAKER_OPEN,
+    LLM_HEDGES,
+    LLM_ROUTE_FAILOVERS,
+    LLM_ROUTE_LATENCY,
+)
+from system.app.domain.entities.classification import (
+    ClassificationResult,
+    EmailCategory,
+)
+from system.app.domain.entities.email_entity import Email
+from system.app.infrastructure.llm.rate_limiter import LLMQueueTimeoutError
+from system.app.infrastructure.llm.streaming import (
+    ClassificationDelta,
+    delta_from_result,
+    stream_classification,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RouteSpec:
+    model: str
+    base_url: str | None = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}@{self.base_url}" if self.base_url else self.model
+
+
+def parse_llm_routes(value: str, default_model: str) -> list[RouteSpec]:
+    """
+    "gpt-4o-mini, gpt-4.1-nano@https://outro-endpoint/v1" -> rotas em ordem.
+    Vazio equivale a uma rota só, com OPENAI_MODEL.
+    """
+    routes = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        model, _, base_url = entry.partition("@")
+        routes.append(RouteSpec(model=model.strip(), base_url=base_url.strip() or None))
+    return routes or [RouteSpec(model=default_model)]
+
+
+class LatencyTracker:
+    """Janela das últimas latências de sucesso, ordenada para percentis."""
+
+    def __init__(self, window: int = 200):
+        self._recent: deque[float] = deque()
+        self._sorted: list[float] = []
+        self._window = window
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def observe(self, seconds: float) -> None:
+        if len(self._recent) >= self._window:
+            oldest = self._recent.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+        self._recent.append(seconds)
+        bisect.insort(self._sorted, seconds)
+
+    def percentile(self, p: float) -> float | None:
+        if not self._sorted:
+            return None
+        index = min(len(self._sorted) - 1, int(len(self._sorted) * p / 100))
+        return self._sorted[index]
+
+
+class CircuitBreaker:
+    """
+    Fechado -> aberto quando a taxa de erro da janela passa de `error_rate`
+    (com ao menos `min_calls`). Depois de `cooldown`, deixa passar uma
+    chamada de teste: sucesso fecha, falha reabre. Um teste que termina sem
+    resultado (cancelado, fila local cheia) devolve a vaga com `release`.
+    """
+
+    def __init__(self, window: int, min_calls: int, error_rate: float, cooldown: float):
+        self._outcomes: deque[bool] = deque(maxlen=window)
+        self._min_calls = min_calls
+        self._error_rate = error_rate
+        self._cooldown = cooldown
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self._probing or time.monotonic() - self._opened_at < self._cooldown:
+            return False
+        self._probing = True
+        return True
+
+    def release(self) -> None:
+        """Libera a vaga de teste sem mudar o estado do circuito."""
+        self._probing = False
+
+    def record(self, success: bool) -> None:
+        if self._opened_at is not None:
+            if self._probing:
+                self._probing = False
+                if success:
+                    self._opened_at = None
+                    self._outcomes.clear()
+                else:
+                    self._opened_at = time.monotonic()
+            return
+        self._outcomes.append(success)
+        failures = self._outcomes.count(False)
+        if (
+            len(self._outcomes) >= self._min_calls
+            and failures / len(self._outcomes) >= self._error_rate
+        ):
+            self._opened_at = time.monotonic()
+
+
+@dataclass
+class LLMRoute:
+    name: str
+    client: object
+    breaker: CircuitBreaker
+    latency: LatencyTracker = field(default_factory=LatencyTracker)
+
+
+class RoutedLLMClient:
+    def __init__(
+        self,
+        routes: list[LLMRoute],
+        last_resort=None,
+        hedge_percentile: float | None = 95.0,
+        hedge_min_samples: int = 20,
+        hedge_min_delay: float = 0.2,
+    ):
+        if not routes:
+            raise ValueError("RoutedLLMClient precisa de ao menos uma rota")
+        self._routes = routes
+        self._last_resort = last_resort
+        self._hedge_percentile = hedge_percentile
+        self._hedge_min_samples = hedge_min_samples
+        self._hedge_min_delay = hedge_min_delay
+
+    async def classify_email(self, email: Email) -> ClassificationResult:
+        return await self._call(
+            lambda client: client.classify_email(email),
+            lambda client: client.classify_email(email),
+            fallback_result=True,
+        )
+
+    async def generate_draft(self, email: Email, category: EmailCategory) -> str:
+        return await self._call(
+            lambda client: client.generate_draft(email, category),
+            lambda client: client.generate_draft(email, category),
+        )
+
+    async def classify_many(
+        self, emails: list[Email]
+    ) -> list[ClassificationResult | Exception]:
+        # Lotes não têm hedge (dobraria o custo do pacote inteiro), só failover.
+        async def _many(client):
+            many = getattr(client, "classify_many", None)
+            if many is not None:
+                results = await many(emails)
+            else:
+                results = await asyncio.gather(
+                    *(client.classify_email(e) for e in emails), return_exceptions=True
+                )
+            # Pacote inteiro perdido conta como falha da rota; erros
+            # isolados seguem por item para quem chamou.
+            if results and all(isinstance(r, Exception) for r in results):
+                raise results[0]
+            return results
+
+        async def _last_resort(client):
+            return [
+                self._degraded(r) if isinstance(r, ClassificationResult) else r
+                for r in await _many(client)
+            ]
+
+        return await self._call(_many, _last_resort, hedge=False)
+
+    async def stream_classify_email(
+        self, email: Email
+    ) -> AsyncIterator[ClassificationDelta]:
+        # Failover só até o primeiro pedaço: depois disso o cliente já viu
+        # parte da resposta. Sem hedge.
+        last_exc: Exception | None = None
+        queue_timeout: LLMQueueTimeoutError | None = None
+        self._publish_breaker_state()
+        for route in self._routes:
+            # Circuito aberto que deixa passar: esta chamada é o teste.
+            probe = route.breaker.is_open
+            if not route.breaker.allow():
+                continue
+            started = False
+            start = time.perf_counter()
+            try:
+                async for delta in stream_classification(route.client, email):
+                    started = True
+                    if delta.result is not None and route is not self._routes[0]:
+                        delta.result = self._from_fallback(delta.result)
+                    yield delta
+            except LLMQueueTimeoutError as exc:
+                if started:
+                    raise
+                queue_timeout = exc
+                continue
+            except Exception as exc:
+                route.breaker.record(False)
+                if started:
+                    raise
+                LLM_ROUTE_FAILOVERS.labels(route=route.name).inc()
+                last_exc = exc
+                continue
+            finally:
+                if probe:
+                    route.breaker.release()
+            self._record_success(route, time.perf_counter() - start)
+            return
+
+        if queue_timeout is not None:
+            raise queue_timeout
+        if self._last_resort is None:
+            raise last_exc or RuntimeError("Nenhuma rota de LLM disponível")
+        logger.warning("Todas as rotas de LLM falharam; usando o cliente de último recurso")
+        result = await self._last_resort.classify_email(email)
+        yield delta_from_result(self._degraded(result))
+
+    def _publish_breaker_state(self) -> None:
+        for route in self._routes:
+            LLM_BREAKER_OPEN.labels(route=route.name).set(1 if route.breaker.is_open else 0)
+
+    def _hedge_delay(self, route: LLMRoute) -> float | None:
+        if self._hedge_percentile is None or len(route.latency) < self._hedge_min_samples:
+            return None
+        return max(self._hedge_min_delay, route.latency.percentile(self._hedge_percentile))
+
+    def _record_success(self, route: LLMRoute, seconds: float) -> None:
+        route.breaker.record(True)
+        route.latency.observe(seconds)
+        LLM_ROUTE_LATENCY.labels(route=route.name).observe(seconds)
+
+    async def _attempt(self, route: LLMRoute, invoke: Callable[[object], Awaitable[T]]) -> T:
+        start = time.perf_counter()
+        try:
+            result = await invoke(route.client)
+        except LLMQueueTimeoutError:
+            # Fila local cheia não é falha do endpoint: não conta no breaker.
+            raise
+        except Exception:
+            route.breaker.record(False)
+            raise
+        self._record_success(route, time.perf_counter() - start)
+        return result
+
+    async def _call(
+        self,
+        invoke: Callable[[object], Awaitable[T]],
+        last_resort: Callable[[object], Awaitable[T]],
+        hedge: bool = True,
+        fallback_result: bool = False,
+    ) -> T:
+        self._publish_breaker_state()
+        last_exc: Exception | None = None
+        queue_timeout: LLMQueueTimeoutError | None = None
+        for route in self._routes:
+            # `allow` só na hora de usar a rota: num circuito aberto ele
+            # reserva a vaga de teste, que precisa de um resultado.
+            probe = route.breaker.is_open
+            if not route.breaker.allow():
+                continue
+            try:
+                result = await self._hedged(route, invoke, hedge)
+                return result if route is self._routes[0] else self._from_fallback(result)
+            except asyncio.CancelledError:
+                raise
+            except LLMQueueTimeoutError as exc:
+                # Cota local esgotada: outra rota (outra cota) ainda serve.
+                queue_timeout = exc
+                logger.info("Rota de LLM %s sem cota: %s", route.name, exc)
+            except Exception as exc:
+                last_exc = exc
+                LLM_ROUTE_FAILOVERS.labels(route=route.name).inc()
+                logger.warning("Rota de LLM %s falhou: %s", route.name, exc)
+            finally:
+                # Sucesso/falha já fecharam ou reabriram o circuito; sem
+                # resultado (cancelada, fila local cheia), a vaga volta.
+                if probe:
+                    route.breaker.release()
+
+        # Sem cota não é pane: quem chamou devolve 503/Retry-After ou
+        # reagenda, em vez de gravar um resultado degradado do último recurso.
+        if queue_timeout is not None:
+            raise queue_timeout
+        if self._last_resort is None:
+            raise last_exc or RuntimeError("Nenhuma rota de LLM disponível")
+        logger.warning("Todas as rotas de LLM falharam; usando o cliente de último recurso")
+        result = await last_resort(self._last_resort)
+        return self._degraded(result) if fallback_result else result
+
+    async def _hedged(
+        self,
+        route: LLMRoute,
+        invoke: Callable[[object], Awaitable[T]],
+        hedge: bool,
+    ) -> T:
+        delay = self._hedge_delay(route) if hedge else None
+        primary = asyncio.create_task(self._attempt(route, invoke))
+        if delay is None:
+            return await primary
+
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                LLM_HEDGES.labels(route=route.name, outcome="fired").inc()
+                tasks.add(asyncio.create_task(self._attempt(route, invoke)))
+            last_exc: BaseException | None = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            LLM_HEDGES.labels(route=route.name, outcome="won").inc()
+                        return task.result()
+                    last_exc = task.exception()
+            raise last_exc
+        finally:
+            # A cópia perdedora é cancelada: não segura conexão nem cota.
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _degraded(result: ClassificationResult) -> ClassificationResult:
+        # Confiança zero: força revisão humana e o cache não guarda.
+        return replace(
+            result, confidence=0.0, requires_human_review=True, from_fallback=True
+        )
+
+    @classmethod
+    def _from_fallback(cls, result):
+        # Resposta de outro modelo que não o primário: o cache, com chave
+        # do primário, não deve guardá-la.
+        if isinstance(result, ClassificationResult):
+            return replace(result, from_fallback=True)
+        if isinstance(result, list):
+            return [cls._from_fallback(r) for r in result]
+        return result
@@ -0,0 +1,162 @@
+# system/app/infrastructure/llm/streaming.py
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Optional
+
+from system.app.domain.entities.email_entity import Email
+from system.app.domain.entities.classification import (
+    ClassificationResult,
+    EmailCategory,
+)
+
+_CLASSIFICATION_FIELD = re.compile(r'"classification"\s*:\s*"([A-Z_]+)"')
+# O número só é aceito depois do separador seguinte, senão "0.9" poderia
+# chegar como "0." num pedaço e "9" no próximo.
+_CONFIDENCE_FIELD = re.compile(r'"confidence"\s*:\s*(-?\d+(?:\.\d+)?)\s*[,}\n]')
+_DRAFT_FIELD = re.compile(r'"draft_reply"\s*:\s*"')
+
+_SIMPLE_ESCAPES = {
+    '"': '"', "\\": "\\", "/": "/",
+    "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t",
+}
+
+
+@dataclass
+class ClassificationDelta:
+    """
+    Pedaço de uma classificação em streaming. O último evento de um stream
+    sempre traz `result` com a classificação completa.
+    """
+
+    category: Optional[EmailCategory] = None
+    confidence: Optional[float] = None
+    draft_delta: str = ""
+    result: Optional[ClassificationResult] = None
+
+
+class ClassificationStreamParser:
+    """
+    Lê o JSON da classificação enquanto ele chega em pedaços e extrai
+    categoria/confiança assim que aparecem e o `draft_reply` já decodificado.
+    O JSON completo continua sendo interpretado no fim por quem chamou.
+    """
+
+    def __init__(self) -> None:
+        self.buffer = ""
+        self._category: Optional[EmailCategory] = None
+        self._confidence: Optional[float] = None
+        self._header_sent = False
+        self._draft_pos: Optional[int] = None
+        self._draft_done = False
+
+    def feed(self, text: str) -> list[ClassificationDelta]:
+        self.buffer += text
+        events: list[ClassificationDelta] = []
+
+        if self._category is None:
+            match = _CLASSIFICATION_FIELD.search(self.buffer)
+            if match:
+                try:
+                    self._category = EmailCategory(match.group(1))
+                except ValueError:
+                    self._category = EmailCategory.INCONCLUSIVO
+        if self._confidence is None:
+            match = _CONFIDENCE_FIELD.search(self.buffer)
+            if match:
+                self._confidence = float(match.group(1))
+
+        if self._draft_pos is None:
+            match = _DRAFT_FIELD.search(self.buffer)
+            if match:
+                self._draft_pos = match.end()
+
+        # Categoria e confiança saem juntas; se o rascunho começar antes da
+        # confiança, a categoria vai sozinha para não segurar o texto.
+        if (
+            not self._header_sent
+            and self._category is not None
+            and (self._confidence is not None or self._draft_pos is not None)
+        ):
+            self._header_sent = True
+            events.append(
+                ClassificationDelta(category=self._category, confidence=self._confidence)
+            )
+
+        if self._draft_pos is not None and not self._draft_done:
+            delta = self._decode_draft()
+            if delta:
+                events.append(ClassificationDelta(draft_delta=delta))
+
+        return events
+
+    def _decode_draft(self) -> str:
+        """Decodifica a string JSON do rascunho até onde ela já chegou."""
+        out: list[str] = []
+        pos = self._draft_pos
+        buffer = self.buffer
+        while pos < len(buffer):
+            char = buffer[pos]
+            if char == '"':
+                self._draft_done = True
+                pos += 1
+                break
+            if char != "\\":
+                out.append(char)
+                pos += 1
+                continue
+            # Escape incompleto no fim do pedaço: espera o próximo.
+            if pos + 1 >= len(buffer):
+                break
+            code = buffer[pos + 1]
+            if code == "u":
+                hex_digits = buffer[pos + 2 : pos + 6]
+                if len(hex_digits) < 4:
+                    break
+                try:
+                    codepoint = int(hex_digits, 16)
+                except ValueError:
+                    codepoint = None
+                if codepoint is not None and 0xD800 <= codepoint < 0xDC00:
+                    # Par substituto (emoji etc.): precisa das duas metades.
+                    low = buffer[pos + 6 : pos + 12]
+                    if len(low) < 6:
+                        break
+                    if low.startswith("\\u"):
+                        try:
+                            low_point = int(low[2:], 16)
+                        except ValueError:
+                            low_point = 0
+                        if 0xDC00 <= low_point < 0xE000:
+                            codepoint = 0x10000 + ((codepoint - 0xD800) << 10) + (low_point - 0xDC00)
+                            pos += 6
+                if codepoint is not None and not 0xD800 <= codepoint < 0xE000:
+                    out.append(chr(codepoint))
+                pos += 6
+            else:
+                out.append(_SIMPLE_ESCAPES.get(code, code))
+                pos += 2
+        self._draft_pos = pos
+        return "".join(out)
+
+
+def delta_from_result(result: ClassificationResult) -> ClassificationDelta:
+    return ClassificationDelta(
+        category=result.category,
+        confidence=result.confidence,
+        draft_delta=result.draft_reply,
+        result=result,
+    )
+
+
+async def stream_classification(client, email: Email) -> AsyncIterator[ClassificationDelta]:
+    """
+    Usa `stream_classify_email` quando o cliente oferece; senão classifica de
+    uma vez e entrega o resultado como um único evento.
+    """
+    stream = getattr(client, "stream_classify_email", None)
+    if stream is not None:
+        async for delta in stream(email):
+            yield delta
+        return
+    yield delta_from_result(await client.classify_email(email))
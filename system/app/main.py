@@ -1,11 +1,34 @@
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from system.app.core.config import settings
+from system.app.core.metrics import HTTP_REQUEST_LATENCY
+from system.app.core.container import AppContainer
+from system.app.infrastructure.db.session import AsyncSessionLocal, engine
+from system.app.infrastructure.llm.rate_limiter import LLMQueueTimeoutError
 from .api.v1.routers.health_router import router as health_router
 from .api.v1.routers.email_router import router as email_router
+from .api.v1.routers.metrics_router import router as metrics_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    container = AppContainer.build(settings, engine, AsyncSessionLocal)
+    app.state.container = container
+    if settings.WARMUP_ON_STARTUP:
+        await container.warmup()
+    await container.start()
+    try:
+        yield
+    finally:
+        await container.aclose()
 
-app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION)
+
+app = FastAPI(title=settings.APP_NAME, version=settings.APP_VERSION, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,7 +36,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+
+@app.exception_handler(LLMQueueTimeoutError)
+async def llm_queue_timeout_handler(request: Request, exc: LLMQueueTimeoutError):
+    # Cota da LLM esgotada: o cliente deve tentar de novo mais tarde.
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "5"},
+    )
+
+
+@app.middleware("http")
+async def record_request_timing(request: Request, call_next):
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        # Usa o template da rota ("/emails/{email_id}") para não explodir a
+        # cardinalidade com ids; rotas inexistentes caem em "unmatched".
+        route = request.scope.get("route")
+        HTTP_REQUEST_LATENCY.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status_code),
+        ).observe(time.perf_counter() - start)
+
+
 app.include_router(health_router)
-app.include_router(email_router)
\ No newline at end of file
+app.include_router(email_router)
+app.include_router(metrics_router)
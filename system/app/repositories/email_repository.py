@@ -1,23 +1,237 @@
-from typing import Protocol, Optional, List
+import base64
+import binascii
+import re
+from dataclasses import dataclass, field
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Generic, Protocol, Optional, List, TypeVar
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    column,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    tuple_,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from system.app.domain.entities.email_entity import Email
+from system.app.core.metrics import time_stage
+from system.app.domain.entities.email_entity import (
+    Email,
+    EmailSearchHit,
+    EmailStatus,
+    EmailSummary,
+)
 from system.app.domain.entities.classification import EmailCategory
 from system.app.infrastructure.db.models.email_model import EmailModel
 
 
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 50
+
+# Marcadores de destaque nos trechos da busca textual.
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_STOP = "</mark>"
+
+_SEARCH_TOKEN = re.compile(r"\w+")
+_EMAILS_FTS = table("emails_fts", column("rowid"))
+_TS_CONFIG = literal_column("'portuguese'::regconfig")
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+class EmailNotFoundError(LookupError):
+    pass
+
+
+class EmailVersionConflictError(Exception):
+    def __init__(self, email_id: int, current_version: int):
+        super().__init__(
+            f"Email id={email_id} foi alterado por outra pessoa (versão atual {current_version})"
+        )
+        self.email_id = email_id
+        self.current_version = current_version
+
+
+class ReviewClaimError(Exception):
+    """O e-mail não está reservado para este revisor."""
+
+
+# Ordem da fila de revisão: reclamações e garantia primeiro.
+REVIEW_CATEGORY_PRIORITY = {
+    EmailCategory.FEEDBACK_NEGATIVO: 0,
+    EmailCategory.GARANTIA: 1,
+    EmailCategory.ARREPENDIMENTO_REEMBOLSO: 2,
+    EmailCategory.INCONCLUSIVO: 3,
+    EmailCategory.DUVIDAS_GERAIS: 4,
+    EmailCategory.FEEDBACK_POSITIVO: 5,
+}
+
+
+# Campos que a revisão pode alterar via `update_fields`/`update_many`.
+EDITABLE_FIELDS = frozenset(
+    {"category", "confidence", "draft_reply", "requires_human_review"}
+)
+
+
+@dataclass
+class EmailListFilters:
+    category: Optional[EmailCategory] = None
+    requires_human_review: Optional[bool] = None
+    from_email: Optional[str] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    status: Optional[EmailStatus] = None
+    # True: só os que passaram por revisão humana (reviewed_by preenchido).
+    reviewed: Optional[bool] = None
+
+
+@dataclass
+class EmailChanges:
+    """Ids inseridos e alterados por um commit do repositório."""
+
+    created: List[int] = field(default_factory=list)
+    updated: List[int] = field(default_factory=list)
+
+
+class EmailChangePublisher(Protocol):
+    """
+    Avisado a cada commit que altera e-mails (feed ao vivo). `before_commit`
+    roda dentro da transação (NOTIFY do Postgres); `after_commit`, depois
+    que as linhas já estão visíveis para outras sessões.
+    """
+
+    async def before_commit(self, session: AsyncSession, changes: EmailChanges) -> None: ...
+    def after_commit(self, changes: EmailChanges) -> None: ...
+
+
+@dataclass
+class EmailPage(Generic[T]):
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(created_at: datetime, email_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{email_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, email_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(email_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+
+
+def encode_search_cursor(rank: float, email_id: int) -> str:
+    raw = f"{rank!r}|{email_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, email_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return float(rank), int(email_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursorError("Cursor inválido") from exc
+
+
 class EmailRepository(Protocol):
-    def save(self, email: Email) -> Email: ...
-    def get(self, email_id: int) -> Optional[Email]: ...
-    def list(self) -> List[Email]: ...
+    async def save(self, email: Email) -> Email: ...
+    async def save_many(self, emails: List[Email]) -> List[Email]: ...
+    async def get(self, email_id: int) -> Optional[Email]: ...
+    async def get_many(self, email_ids: List[int]) -> List[Email]: ...
+    async def list(
+        self,
+        filters: Optional[EmailListFilters] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> EmailPage[Email]: ...
+    async def list_summaries(
+        self,
+        filters: Optional[EmailListFilters] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> EmailPage[EmailSummary]: ...
+    def stream(
+        self,
+        filters: Optional[EmailListFilters] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Email]: ...
+    async def claim_next_job(self, lease_seconds: int) -> Optional[Email]: ...
+    async def fail_job(
+        self, email_id: int, error: str, retry_at: Optional[datetime]
+    ) -> Optional[Email]: ...
+    async def update_fields(
+        self,
+        email_id: int,
+        changes: dict,
+        expected_version: Optional[int] = None,
+    ) -> Email: ...
+    async def update_many(self, email_ids: List[int], changes: dict) -> List[int]: ...
+    async def save_draft(self, email_id: int, draft_reply: str) -> Optional[Email]: ...
+    async def scan(
+        self,
+        after_id: int,
+        limit: int,
+        filters: Optional[EmailListFilters] = None,
+        exclude_reviewed: bool = False,
+    ) -> List[Email]: ...
+    async def count(
+        self,
+        filters: Optional[EmailListFilters] = None,
+        exclude_reviewed: bool = False,
+        after_id: int = 0,
+    ) -> int: ...
+    async def update_classifications(self, emails: List[Email]) -> int: ...
+    async def upsert_many(self, emails: List[Email]) -> List[Email]: ...
+    async def claim_reviews(
+        self, reviewer: str, limit: int, lease_seconds: int
+    ) -> List[Email]: ...
+    async def release_review(self, email_id: int, reviewer: str) -> Email: ...
+    async def complete_review(
+        self, email_id: int, reviewer: str, changes: dict
+    ) -> Email: ...
+    async def search(
+        self,
+        query: str,
+        filters: Optional[EmailListFilters] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> EmailPage[EmailSearchHit]: ...
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # O SQLite devolve DateTime(timezone=True) sem tzinfo; o valor gravado já é UTC.
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
 
 
 class SqlAlchemyEmailRepository:
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: AsyncSession,
+        changes: Optional[EmailChangePublisher] = None,
+    ):
         self._session = session
+        self._changes = changes
 
-    def save(self, email: Email) -> Email:
+    async def save(self, email: Email) -> Email:
         if email.id is None:
             model = EmailModel(
                 from_email=email.from_email,
@@ -27,13 +241,19 @@ class SqlAlchemyEmailRepository:
                 confidence=email.confidence,
                 draft_reply=email.draft_reply,
                 requires_human_review=email.requires_human_review,
+                status=email.status.value,
+                last_error=email.last_error,
+                callback_url=email.callback_url,
+                matched_email_id=email.matched_email_id,
+                external_id=email.external_id,
             )
             self._session.add(model)
-            self._session.commit()
-            self._session.refresh(model)
+            await self._session.flush()
+            await self._commit(created=[model.id])
+            await self._session.refresh(model)
             email.id = model.id
         else:
-            model = self._session.get(EmailModel, email.id)
+            model = await self._session.get(EmailModel, email.id)
             if not model:
                 raise ValueError(f"Email id={email.id} não encontrado")
 
@@ -41,26 +261,746 @@ class SqlAlchemyEmailRepository:
             model.confidence = email.confidence
             model.draft_reply = email.draft_reply
             model.requires_human_review = email.requires_human_review
+            model.status = email.status.value
+            model.last_error = email.last_error
+            model.matched_email_id = email.matched_email_id
+            if email.status != EmailStatus.PROCESSING:
+                model.locked_at = None
+            model.version = model.version + 1
 
-            self._session.commit()
-            self._session.refresh(model)
+            await self._commit(updated=[email.id])
+            await self._session.refresh(model)
 
+        # Valores gerados pelo banco (server_default/onupdate) voltam para a entidade.
+        email.created_at = model.created_at
+        email.updated_at = model.updated_at
+        email.version = model.version
         return email
 
-    def get(self, email_id: int) -> Optional[Email]:
-        model = self._session.get(EmailModel, email_id)
+    async def save_many(self, emails: List[Email]) -> List[Email]:
+        """
+        Insere vários e-mails novos num único INSERT ... RETURNING e um único
+        commit, preenchendo id e timestamps em cada entidade.
+        """
+        if not emails:
+            return emails
+
+        stmt = insert(EmailModel).returning(
+            EmailModel.id,
+            EmailModel.created_at,
+            EmailModel.updated_at,
+            sort_by_parameter_order=True,
+        )
+        result = await self._session.execute(
+            stmt,
+            [
+                {
+                    "from_email": email.from_email,
+                    "subject": email.subject,
+                    "body": email.body,
+                    "category": email.category.value,
+                    "confidence": email.confidence,
+                    "draft_reply": email.draft_reply,
+                    "requires_human_review": email.requires_human_review,
+                    "status": email.status.value,
+                    "last_error": email.last_error,
+                    "callback_url": email.callback_url,
+                    "matched_email_id": email.matched_email_id,
+                    "external_id": email.external_id,
+                }
+                for email in emails
+            ],
+        )
+        rows = result.all()
+        await self._commit(created=[row.id for row in rows])
+
+        for email, row in zip(emails, rows):
+            email.id = row.id
+            email.created_at = row.created_at
+            email.updated_at = row.updated_at
+
+        return emails
+
+    async def upsert_many(self, emails: List[Email]) -> List[Email]:
+        """
+        Insere ou atualiza por `external_id` num único INSERT ... ON CONFLICT
+        ... RETURNING: reimportar o mesmo arquivo não duplica e-mails. Linhas
+        já revisadas por humano não são sobrescritas e ficam fora do retorno.
+        """
+        if not emails:
+            return []
+        # Dentro do mesmo statement, o Postgres não aceita duas linhas com a
+        # mesma chave de conflito: vale a última.
+        by_external_id = {email.external_id: email for email in emails}
+        if None in by_external_id:
+            raise ValueError("upsert_many exige external_id em todos os e-mails")
+
+        dialect = self._session.bind.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            raise NotImplementedError(f"Upsert não suportado em {dialect}")
+
+        stmt = dialect_insert(EmailModel)
+        updated = (
+            "from_email",
+            "subject",
+            "body",
+            "category",
+            "confidence",
+            "draft_reply",
+            "requires_human_review",
+            "status",
+            "last_error",
+            "matched_email_id",
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[EmailModel.external_id],
+            set_={
+                **{name: stmt.excluded[name] for name in updated},
+                "version": EmailModel.version + 1,
+                "updated_at": func.now(),
+            },
+            where=EmailModel.reviewed_by.is_(None),
+        ).returning(
+            EmailModel.id,
+            EmailModel.external_id,
+            EmailModel.created_at,
+            EmailModel.updated_at,
+            EmailModel.version,
+        )
+        rows = (
+            await self._session.execute(
+                stmt,
+                [
+                    {
+                        "from_email": email.from_email,
+                        "subject": email.subject,
+                        "body": email.body,
+                        "category": email.category.value,
+                        "confidence": email.confidence,
+                        "draft_reply": email.draft_reply,
+                        "requires_human_review": email.requires_human_review,
+                        "status": email.status.value,
+                        "last_error": email.last_error,
+                        "matched_email_id": email.matched_email_id,
+                        "external_id": email.external_id,
+                    }
+                    for email in by_external_id.values()
+                ],
+            )
+        ).all()
+        # Versão 1: a linha acabou de ser inserida.
+        await self._commit(
+            created=[row.id for row in rows if row.version == 1],
+            updated=[row.id for row in rows if row.version != 1],
+        )
+
+        saved = []
+        for row in rows:
+            email = by_external_id[row.external_id]
+            email.id = row.id
+            email.created_at = row.created_at
+            email.updated_at = row.updated_at
+            email.version = row.version
+            saved.append(email)
+        return saved
+
+    async def scan(
+        self,
+        after_id: int,
+        limit: int,
+        filters: Optional[EmailListFilters] = None,
+        exclude_reviewed: bool = False,
+    ) -> List[Email]:
+        """
+        Próximos `limit` e-mails com id > `after_id`, em ordem de id: o id do
+        último serve de checkpoint para retomar uma varredura interrompida.
+        """
+        stmt = self._backfill_filters(select(EmailModel), filters, exclude_reviewed)
+        stmt = stmt.where(EmailModel.id > after_id).order_by(EmailModel.id).limit(limit)
+        models = (await self._session.execute(stmt)).scalars().all()
+        return [self._to_entity(m) for m in models]
+
+    async def count(
+        self,
+        filters: Optional[EmailListFilters] = None,
+        exclude_reviewed: bool = False,
+        after_id: int = 0,
+    ) -> int:
+        stmt = self._backfill_filters(
+            select(func.count()).select_from(EmailModel), filters, exclude_reviewed
+        )
+        return await self._session.scalar(stmt.where(EmailModel.id > after_id))
+
+    async def update_classifications(self, emails: List[Email]) -> int:
+        """
+        Grava a reclassificação de vários e-mails num executemany. Cada linha
+        só é alterada se a versão ainda for a lida e ninguém a tiver
+        reservado para revisão; retorna quantas foram atualizadas.
+        """
+        if not emails:
+            return 0
+        stmt = (
+            update(EmailModel.__table__)
+            .where(
+                EmailModel.id == bindparam("b_id"),
+                EmailModel.version == bindparam("b_version"),
+                EmailModel.review_claimed_by.is_(None),
+            )
+            .values(
+                category=bindparam("b_category"),
+                confidence=bindparam("b_confidence"),
+                draft_reply=bindparam("b_draft_reply"),
+                requires_human_review=bindparam("b_requires_human_review"),
+                matched_email_id=bindparam("b_matched_email_id"),
+                version=EmailModel.version + 1,
+                updated_at=func.now(),
+            )
+        )
+        result = await self._session.execute(
+            stmt,
+            [
+                {
+                    "b_id": email.id,
+                    "b_version": email.version,
+                    "b_category": email.category.value,
+                    "b_confidence": email.confidence,
+                    "b_draft_reply": email.draft_reply,
+                    "b_requires_human_review": email.requires_human_review,
+                    "b_matched_email_id": email.matched_email_id,
+                }
+                for email in emails
+            ],
+        )
+        # Sem RETURNING no executemany: avisa todos; quem lê vê o estado atual.
+        await self._commit(updated=[email.id for email in emails])
+        return max(result.rowcount, 0)
+
+    async def _commit(
+        self, created: Sequence[int] = (), updated: Sequence[int] = ()
+    ) -> None:
+        changes = None
+        if self._changes is not None and (created or updated):
+            changes = EmailChanges(list(created), list(updated))
+        with time_stage("db_commit"):
+            if changes is not None:
+                await self._changes.before_commit(self._session, changes)
+            await self._session.commit()
+        if changes is not None:
+            self._changes.after_commit(changes)
+
+    async def get(self, email_id: int) -> Optional[Email]:
+        model = await self._session.get(EmailModel, email_id)
         if not model:
             return None
         return self._to_entity(model)
 
-    def list(self) -> list[Email]:
-        models = (
-            self._session.query(EmailModel)
-            .order_by(EmailModel.created_at.desc())
-            .all()
+    async def get_many(self, email_ids: List[int]) -> List[Email]:
+        """E-mails existentes entre `email_ids`, em ordem de id."""
+        if not email_ids:
+            return []
+        stmt = (
+            select(EmailModel)
+            .where(EmailModel.id.in_(email_ids))
+            .order_by(EmailModel.id)
+            .execution_options(populate_existing=True)
         )
+        models = (await self._session.execute(stmt)).scalars().all()
         return [self._to_entity(m) for m in models]
 
+    async def list(
+        self,
+        filters: Optional[EmailListFilters] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> EmailPage[Email]:
+        stmt = self._page_query(select(EmailModel), filters, limit, cursor)
+        result = await self._session.execute(stmt)
+        return self._to_page(list(result.scalars()), limit, self._to_entity)
+
+    async def list_summaries(
+        self,
+        filters: Optional[EmailListFilters] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> EmailPage[EmailSummary]:
+        """Mesma paginação de `list`, mas sem carregar body/draft_reply."""
+        stmt = self._page_query(
+            select(*self._summary_columns()), filters, limit, cursor
+        )
+        result = await self._session.execute(stmt)
+        return self._to_page(list(result), limit, self._to_summary)
+
+    async def stream(
+        self,
+        filters: Optional[EmailListFilters] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Email]:
+        """
+        Percorre todos os e-mails filtrados com cursor do lado do servidor,
+        mantendo no máximo `batch_size` linhas em memória.
+        """
+        stmt = (
+            self._apply_filters(select(EmailModel), filters)
+            .order_by(EmailModel.created_at.desc(), EmailModel.id.desc())
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self._session.stream_scalars(stmt)
+        async for model in result:
+            yield self._to_entity(model)
+            # Solta a instância do identity map para a memória ficar estável.
+            self._session.expunge(model)
+
+    async def claim_next_job(self, lease_seconds: int) -> Optional[Email]:
+        """
+        Reserva o próximo e-mail PENDING (ou PROCESSING com lease vencido)
+        num único UPDATE ... RETURNING. No Postgres a subconsulta usa
+        FOR UPDATE SKIP LOCKED; no SQLite a escrita já é serializada e o
+        WHERE repetido no UPDATE garante que só um worker vence.
+        """
+        now = datetime.now(timezone.utc)
+        claimable = or_(
+            and_(
+                EmailModel.status == EmailStatus.PENDING.value,
+                or_(
+                    EmailModel.next_attempt_at.is_(None),
+                    EmailModel.next_attempt_at <= now,
+                ),
+            ),
+            and_(
+                EmailModel.status == EmailStatus.PROCESSING.value,
+                EmailModel.locked_at < now - timedelta(seconds=lease_seconds),
+            ),
+        )
+        next_id = (
+            select(EmailModel.id)
+            .where(claimable)
+            .order_by(EmailModel.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(EmailModel)
+            .where(EmailModel.id == next_id, claimable)
+            .values(
+                status=EmailStatus.PROCESSING.value,
+                locked_at=now,
+                attempts=EmailModel.attempts + 1,
+            )
+            .returning(EmailModel)
+            .execution_options(synchronize_session=False)
+        )
+        model = (await self._session.execute(stmt)).scalar_one_or_none()
+        await self._commit(updated=[model.id] if model is not None else [])
+        if model is None:
+            return None
+        return self._to_entity(model)
+
+    async def fail_job(
+        self, email_id: int, error: str, retry_at: Optional[datetime]
+    ) -> Optional[Email]:
+        """
+        Registra a falha de um job reservado: volta para PENDING só a partir
+        de `retry_at`, ou FAILED se `retry_at` for None. Não faz nada (None)
+        se o job já não está PROCESSING, ex.: lease vencido e reservado de novo.
+        """
+        status = EmailStatus.PENDING if retry_at is not None else EmailStatus.FAILED
+        stmt = (
+            update(EmailModel)
+            .where(
+                EmailModel.id == email_id,
+                EmailModel.status == EmailStatus.PROCESSING.value,
+            )
+            .values(
+                status=status.value,
+                last_error=error,
+                locked_at=None,
+                next_attempt_at=retry_at,
+                version=EmailModel.version + 1,
+            )
+            .returning(EmailModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        model = (await self._session.execute(stmt)).scalar_one_or_none()
+        await self._commit(updated=[model.id] if model is not None else [])
+        return self._to_entity(model) if model is not None else None
+
+    async def search(
+        self,
+        query: str,
+        filters: Optional[EmailListFilters] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> EmailPage[EmailSearchHit]:
+        """
+        Busca textual em assunto, corpo e rascunho, do mais relevante para o
+        menos relevante, com paginação keyset em (rank, id).
+        """
+        after = decode_search_cursor(cursor) if cursor else None
+        dialect = self._session.bind.dialect.name
+        if dialect == "postgresql":
+            stmt = self._search_postgres(query, filters, limit, after)
+        elif dialect == "sqlite":
+            stmt = self._search_sqlite(query, filters, limit, after)
+            if stmt is None:
+                return EmailPage()
+        else:
+            raise NotImplementedError(f"Busca textual não suportada em {dialect}")
+
+        rows = list(await self._session.execute(stmt))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_search_cursor(rows[-1].rank, rows[-1].id)
+        return EmailPage(
+            items=[
+                EmailSearchHit(
+                    email=self._to_summary(row),
+                    rank=row.rank,
+                    highlight=row.highlight or "",
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor,
+        )
+
+    def _search_postgres(self, query, filters, limit, after):
+        search_vector = literal_column("emails.search_vector")
+        ts_query = func.websearch_to_tsquery(_TS_CONFIG, query)
+        rank = func.ts_rank_cd(search_vector, ts_query)
+
+        # Ranqueia e pagina só com id+rank; o ts_headline (caro) roda depois,
+        # apenas nas linhas da página.
+        page = self._apply_filters(
+            select(EmailModel.id, rank.label("rank")).where(search_vector.op("@@")(ts_query)),
+            filters,
+        )
+        if after is not None:
+            page = page.where(tuple_(rank, EmailModel.id) < tuple_(*after))
+        page = (
+            page.order_by(rank.desc(), EmailModel.id.desc()).limit(limit + 1).subquery()
+        )
+
+        highlight = func.ts_headline(
+            _TS_CONFIG,
+            func.concat_ws(" — ", EmailModel.subject, EmailModel.body),
+            ts_query,
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, MaxFragments=2",
+        )
+        return (
+            select(*self._summary_columns(), page.c.rank, highlight.label("highlight"))
+            .join(page, page.c.id == EmailModel.id)
+            .order_by(page.c.rank.desc(), EmailModel.id.desc())
+        )
+
+    def _search_sqlite(self, query, filters, limit, after):
+        # A sintaxe do MATCH do FTS5 quebra com aspas, hífens etc.: cada
+        # termo vira um prefixo entre aspas e todos precisam aparecer.
+        tokens = _SEARCH_TOKEN.findall(query)
+        if not tokens:
+            return None
+        match_query = " ".join(f'"{token}"*' for token in tokens)
+
+        fts = literal_column("emails_fts")
+        # bm25 é "menor = melhor"; o sinal invertido mantém rank decrescente.
+        rank = -func.bm25(fts, 10.0, 5.0, 1.0)
+        highlight = func.snippet(fts, -1, HIGHLIGHT_START, HIGHLIGHT_STOP, "…", 16)
+        stmt = self._apply_filters(
+            select(*self._summary_columns(), rank.label("rank"), highlight.label("highlight"))
+            .join(_EMAILS_FTS, _EMAILS_FTS.c.rowid == EmailModel.id)
+            .where(fts.op("MATCH")(match_query)),
+            filters,
+        )
+        if after is not None:
+            stmt = stmt.where(tuple_(rank, EmailModel.id) < tuple_(*after))
+        return stmt.order_by(rank.desc(), EmailModel.id.desc()).limit(limit + 1)
+
+    async def update_fields(
+        self,
+        email_id: int,
+        changes: dict,
+        expected_version: Optional[int] = None,
+    ) -> Email:
+        """
+        Atualização parcial num único UPDATE ... RETURNING. Com
+        `expected_version`, só aplica se ninguém alterou o e-mail antes;
+        senão levanta EmailVersionConflictError.
+        """
+        stmt = (
+            update(EmailModel)
+            .where(EmailModel.id == email_id)
+            .values(**self._column_values(changes), version=EmailModel.version + 1)
+            .returning(EmailModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        if expected_version is not None:
+            stmt = stmt.where(EmailModel.version == expected_version)
+
+        model = (await self._session.execute(stmt)).scalar_one_or_none()
+        await self._commit(updated=[model.id] if model is not None else [])
+        if model is not None:
+            return self._to_entity(model)
+
+        # Só no caminho de erro: distingue "não existe" de "versão antiga".
+        current = await self._session.scalar(
+            select(EmailModel.version).where(EmailModel.id == email_id)
+        )
+        if current is None:
+            raise EmailNotFoundError(f"Email id={email_id} não encontrado")
+        raise EmailVersionConflictError(email_id, current)
+
+    async def update_many(self, email_ids: List[int], changes: dict) -> List[int]:
+        """Aplica as mesmas alterações a vários e-mails num só statement."""
+        if not email_ids:
+            return []
+        stmt = (
+            update(EmailModel)
+            .where(EmailModel.id.in_(email_ids))
+            .values(**self._column_values(changes), version=EmailModel.version + 1)
+            .returning(EmailModel.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated = list((await self._session.execute(stmt)).scalars())
+        await self._commit(updated=updated)
+        return updated
+
+    async def save_draft(self, email_id: int, draft_reply: str) -> Optional[Email]:
+        """
+        Grava o rascunho gerado sob demanda, só se o e-mail ainda estiver sem
+        rascunho: não sobrescreve o que um revisor (ou outra geração
+        simultânea) já gravou. Não altera a versão, pois é só o preenchimento
+        de um valor derivado. Devolve o e-mail como ficou no banco.
+        """
+        stmt = (
+            update(EmailModel)
+            .where(EmailModel.id == email_id, EmailModel.draft_reply == "")
+            .values(draft_reply=draft_reply)
+            .returning(EmailModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        model = (await self._session.execute(stmt)).scalar_one_or_none()
+        await self._commit(updated=[model.id] if model is not None else [])
+        if model is not None:
+            return self._to_entity(model)
+        model = await self._session.get(EmailModel, email_id, populate_existing=True)
+        return self._to_entity(model) if model else None
+
+    async def claim_reviews(
+        self, reviewer: str, limit: int, lease_seconds: int
+    ) -> List[Email]:
+        """
+        Reserva os próximos `limit` e-mails pendentes de revisão humana, por
+        prioridade (categoria, menor confiança, mais antigo). Mesmo esquema
+        de `claim_next_job`: FOR UPDATE SKIP LOCKED no Postgres e o WHERE
+        repetido no UPDATE como garantia no SQLite.
+        """
+        now = datetime.now(timezone.utc)
+        claimable = and_(
+            EmailModel.requires_human_review.is_(True),
+            EmailModel.status == EmailStatus.CLASSIFIED.value,
+            or_(
+                EmailModel.review_lease_expires_at.is_(None),
+                EmailModel.review_lease_expires_at < now,
+            ),
+        )
+        priority = case(
+            {c.value: p for c, p in REVIEW_CATEGORY_PRIORITY.items()},
+            value=EmailModel.category,
+            else_=len(REVIEW_CATEGORY_PRIORITY),
+        )
+        next_ids = (
+            select(EmailModel.id)
+            .where(claimable)
+            .order_by(priority, EmailModel.confidence, EmailModel.created_at, EmailModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(EmailModel)
+            .where(EmailModel.id.in_(next_ids.scalar_subquery()), claimable)
+            .values(
+                review_claimed_by=reviewer,
+                review_lease_expires_at=now + timedelta(seconds=lease_seconds),
+            )
+            .returning(EmailModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        models = list((await self._session.execute(stmt)).scalars())
+        await self._commit(updated=[m.id for m in models])
+        # RETURNING não garante ordem: reaplica a prioridade.
+        emails = [self._to_entity(m) for m in models]
+        emails.sort(
+            key=lambda e: (
+                REVIEW_CATEGORY_PRIORITY.get(e.category, len(REVIEW_CATEGORY_PRIORITY)),
+                e.confidence,
+                str(e.created_at),
+                e.id,
+            )
+        )
+        return emails
+
+    async def release_review(self, email_id: int, reviewer: str) -> Email:
+        """Devolve o e-mail à fila antes do fim do lease."""
+        return await self._update_claimed(
+            email_id,
+            reviewer,
+            {"review_claimed_by": None, "review_lease_expires_at": None},
+        )
+
+    async def complete_review(
+        self, email_id: int, reviewer: str, changes: dict
+    ) -> Email:
+        """
+        Conclui a revisão: aplica as alterações do revisor, tira o e-mail da
+        fila e incrementa a versão, tudo num único UPDATE.
+        """
+        values = self._column_values(changes)
+        values.update(
+            requires_human_review=False,
+            review_claimed_by=None,
+            review_lease_expires_at=None,
+            reviewed_by=reviewer,
+            version=EmailModel.version + 1,
+        )
+        return await self._update_claimed(email_id, reviewer, values)
+
+    async def _update_claimed(self, email_id: int, reviewer: str, values: dict) -> Email:
+        # Lease vencido ainda vale enquanto ninguém reservou o e-mail de novo.
+        stmt = (
+            update(EmailModel)
+            .where(
+                EmailModel.id == email_id,
+                EmailModel.review_claimed_by == reviewer,
+                EmailModel.requires_human_review.is_(True),
+            )
+            .values(**values)
+            .returning(EmailModel)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        model = (await self._session.execute(stmt)).scalar_one_or_none()
+        await self._commit(updated=[model.id] if model is not None else [])
+        if model is not None:
+            return self._to_entity(model)
+
+        exists = await self._session.scalar(
+            select(EmailModel.id).where(EmailModel.id == email_id)
+        )
+        if exists is None:
+            raise EmailNotFoundError(f"Email id={email_id} não encontrado")
+        raise ReviewClaimError(f"Email id={email_id} não está reservado para {reviewer}")
+
+    @staticmethod
+    def _column_values(changes: dict) -> dict:
+        unknown = changes.keys() - EDITABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Campos não editáveis: {', '.join(sorted(unknown))}")
+        values = dict(changes)
+        if isinstance(values.get("category"), EmailCategory):
+            values["category"] = values["category"].value
+        return values
+
+    def _page_query(self, stmt, filters, limit, cursor):
+        stmt = self._apply_filters(stmt, filters)
+        if cursor:
+            created_at, email_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(EmailModel.created_at, EmailModel.id)
+                < tuple_(self._created_at_param(created_at), email_id)
+            )
+        # Busca um item a mais só para saber se existe próxima página.
+        return stmt.order_by(
+            EmailModel.created_at.desc(), EmailModel.id.desc()
+        ).limit(limit + 1)
+
+    def _apply_filters(self, stmt, filters: Optional[EmailListFilters]):
+        if filters is None:
+            return stmt
+        if filters.category is not None:
+            stmt = stmt.where(EmailModel.category == filters.category.value)
+        if filters.requires_human_review is not None:
+            stmt = stmt.where(
+                EmailModel.requires_human_review == filters.requires_human_review
+            )
+        if filters.from_email is not None:
+            stmt = stmt.where(EmailModel.from_email == filters.from_email)
+        if filters.status is not None:
+            stmt = stmt.where(EmailModel.status == filters.status.value)
+        if filters.reviewed is not None:
+            stmt = stmt.where(
+                EmailModel.reviewed_by.is_not(None)
+                if filters.reviewed
+                else EmailModel.reviewed_by.is_(None)
+            )
+        if filters.created_from is not None:
+            stmt = stmt.where(
+                EmailModel.created_at >= self._created_at_param(filters.created_from)
+            )
+        if filters.created_to is not None:
+            stmt = stmt.where(
+                EmailModel.created_at < self._created_at_param(filters.created_to)
+            )
+        return stmt
+
+    def _backfill_filters(self, stmt, filters, exclude_reviewed: bool):
+        stmt = self._apply_filters(stmt, filters)
+        if exclude_reviewed:
+            # A decisão do revisor vale mais que uma nova rodada da LLM.
+            stmt = stmt.where(
+                EmailModel.reviewed_by.is_(None),
+                EmailModel.review_claimed_by.is_(None),
+            )
+        return stmt
+
+    def _created_at_param(self, value: datetime):
+        # No SQLite o timestamp é texto gerado por CURRENT_TIMESTAMP
+        # ("YYYY-MM-DD HH:MM:SS"); o parâmetro precisa do mesmo formato para
+        # a comparação lexicográfica bater com a ordenação.
+        if self._session.bind.dialect.name == "sqlite":
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            fmt = "%Y-%m-%d %H:%M:%S" if not value.microsecond else "%Y-%m-%d %H:%M:%S.%f"
+            return literal(value.strftime(fmt))
+        return value
+
+    def _to_page(self, rows, limit, convert) -> EmailPage:
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return EmailPage(items=[convert(r) for r in rows], next_cursor=next_cursor)
+
+    @staticmethod
+    def _summary_columns():
+        return (
+            EmailModel.id,
+            EmailModel.from_email,
+            EmailModel.subject,
+            EmailModel.category,
+            EmailModel.confidence,
+            EmailModel.requires_human_review,
+            EmailModel.created_at,
+            EmailModel.updated_at,
+            EmailModel.status,
+        )
+
+    def _to_summary(self, row) -> EmailSummary:
+        return EmailSummary(
+            id=row.id,
+            from_email=row.from_email,
+            subject=row.subject,
+            category=EmailCategory(row.category),
+            confidence=row.confidence,
+            requires_human_review=row.requires_human_review,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            status=EmailStatus(row.status),
+        )
+
     def _to_entity(self, model: EmailModel) -> Email:
         return Email(
             id=model.id,
@@ -73,4 +1013,14 @@ class SqlAlchemyEmailRepository:
             requires_human_review=model.requires_human_review,
             created_at=model.created_at,
             updated_at=model.updated_at,
-        )
\ No newline at end of file
+            status=EmailStatus(model.status),
+            attempts=model.attempts,
+            last_error=model.last_error,
+            callback_url=model.callback_url,
+            version=model.version,
+            review_claimed_by=model.review_claimed_by,
+            review_lease_expires_at=_as_utc(model.review_lease_expires_at),
+            reviewed_by=model.reviewed_by,
+            matched_email_id=model.matched_email_id,
+            external_id=model.external_id,
+        )
@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Protocol
+
+from sqlalchemy import DateTime, func, literal, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from system.app.domain.entities.classification import EmailCategory
+from system.app.domain.entities.email_stats import EmailStatsBucket, StatsGranularity
+from system.app.infrastructure.db.models.email_stats_model import EmailStatsHourlyModel
+
+
+@dataclass
+class EmailStatsFilters:
+    category: Optional[EmailCategory] = None
+    requires_human_review: Optional[bool] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+
+class EmailStatsRepository(Protocol):
+    async def aggregate(
+        self,
+        granularity: StatsGranularity = StatsGranularity.DAY,
+        filters: Optional[EmailStatsFilters] = None,
+    ) -> List[EmailStatsBucket]: ...
+
+
+class SqlAlchemyEmailStatsRepository:
+    """
+    Lê os agregados de `email_stats_hourly`, mantida por triggers: o custo
+    depende do intervalo pedido, não do número de e-mails.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def aggregate(
+        self,
+        granularity: StatsGranularity = StatsGranularity.DAY,
+        filters: Optional[EmailStatsFilters] = None,
+    ) -> List[EmailStatsBucket]:
+        table = EmailStatsHourlyModel
+        bucket = self._bucket_expression(granularity).label("bucket")
+        email_count = func.sum(table.email_count)
+        stmt = (
+            select(
+                bucket,
+                table.category,
+                table.requires_human_review,
+                email_count.label("email_count"),
+                func.sum(table.confidence_sum).label("confidence_sum"),
+            )
+            .group_by(bucket, table.category, table.requires_human_review)
+            .having(email_count > 0)
+            .order_by(bucket, table.category, table.requires_human_review)
+        )
+
+        filters = filters or EmailStatsFilters()
+        if filters.category is not None:
+            stmt = stmt.where(table.category == filters.category.value)
+        if filters.requires_human_review is not None:
+            stmt = stmt.where(table.requires_human_review == filters.requires_human_review)
+        # Precisão de hora: o bucket que contém `created_from` entra inteiro.
+        if filters.created_from is not None:
+            created_from = self._to_utc(filters.created_from).replace(
+                minute=0, second=0, microsecond=0
+            )
+            stmt = stmt.where(table.bucket >= self._bucket_param(created_from))
+        if filters.created_to is not None:
+            created_to = self._to_utc(filters.created_to)
+            stmt = stmt.where(table.bucket < self._bucket_param(created_to))
+
+        result = await self._session.execute(stmt)
+        return [
+            EmailStatsBucket(
+                bucket=row.bucket,
+                category=EmailCategory(row.category),
+                requires_human_review=row.requires_human_review,
+                count=row.email_count,
+                confidence_sum=row.confidence_sum or 0.0,
+            )
+            for row in result
+        ]
+
+    def _bucket_expression(self, granularity: StatsGranularity):
+        column = EmailStatsHourlyModel.bucket
+        if granularity == StatsGranularity.HOUR:
+            return column
+        if self._session.bind.dialect.name == "sqlite":
+            # No SQLite o bucket é texto; o type_coerce devolve datetime.
+            return type_coerce(func.strftime("%Y-%m-%d 00:00:00", column), DateTime())
+        return func.date_trunc("day", column)
+
+    def _bucket_param(self, value: datetime):
+        # No SQLite o bucket é texto "YYYY-MM-DD HH:00:00" gerado pelo
+        # trigger; o parâmetro precisa do mesmo formato para comparar.
+        if self._session.bind.dialect.name == "sqlite":
+            return literal(value.strftime("%Y-%m-%d %H:%M:%S"))
+        return value
+
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        # Buckets são horas UTC sem fuso.
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
@@ -1,9 +1,11 @@
-from typing import Optional
+from typing import List, Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field, HttpUrl
 from datetime import datetime
 
 from system.app.domain.entities.classification import EmailCategory
+from system.app.domain.entities.email_entity import EmailStatus
+from system.app.domain.entities.email_stats import StatsGranularity
 
 
 class EmailCreateRequest(BaseModel):
@@ -12,11 +14,36 @@ class EmailCreateRequest(BaseModel):
     body: str
 
 
+class EmailAsyncClassifyRequest(EmailCreateRequest):
+    callback_url: Optional[HttpUrl] = None
+
+
+class EmailJobAcceptedResponse(BaseModel):
+    id: int
+    status: EmailStatus
+
+
 class EmailUpdateRequest(BaseModel):
     draft_reply: Optional[str] = None
     category: Optional[EmailCategory] = None
     requires_human_review: Optional[bool] = None
     confidence: Optional[float] = None
+    version: Optional[int] = Field(
+        None,
+        description="Versão lida pelo cliente; se outra pessoa alterou o e-mail depois, responde 409",
+    )
+
+
+class EmailBulkUpdateRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1)
+    category: Optional[EmailCategory] = None
+    requires_human_review: Optional[bool] = None
+
+
+class EmailBulkUpdateResponse(BaseModel):
+    updated: int
+    ids: List[int]
+    not_found: List[int]
 
 
 class EmailResponse(BaseModel):
@@ -29,4 +56,84 @@ class EmailResponse(BaseModel):
     draft_reply: str
     requires_human_review: bool
     created_at: Optional[datetime]
-    updated_at: Optional[datetime]
\ No newline at end of file
+    updated_at: Optional[datetime]
+    status: EmailStatus = EmailStatus.CLASSIFIED
+    last_error: Optional[str] = None
+    version: int = 1
+    review_claimed_by: Optional[str] = None
+    review_lease_expires_at: Optional[datetime] = None
+    reviewed_by: Optional[str] = None
+    matched_email_id: Optional[int] = None
+
+
+class EmailDraftResponse(BaseModel):
+    id: int
+    category: EmailCategory
+    draft_reply: str
+    version: int
+
+
+class EmailReviewClaimResponse(BaseModel):
+    reviewer: str
+    lease_expires_at: datetime
+    emails: List[EmailResponse]
+
+
+class EmailReviewCompleteRequest(BaseModel):
+    category: Optional[EmailCategory] = None
+    draft_reply: Optional[str] = None
+
+
+class EmailSummaryResponse(BaseModel):
+    id: int
+    from_email: EmailStr
+    subject: str
+    category: EmailCategory
+    confidence: float
+    requires_human_review: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    status: EmailStatus = EmailStatus.CLASSIFIED
+
+
+class EmailSearchHitResponse(EmailSummaryResponse):
+    rank: float
+    highlight: str
+
+
+class EmailBatchItemResult(BaseModel):
+    index: int
+    email: Optional[EmailResponse] = None
+    error: Optional[str] = None
+
+
+class EmailBatchClassifyResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+    results: List[EmailBatchItemResult]
+
+
+class EmailStatsBucketResponse(BaseModel):
+    bucket: datetime
+    category: EmailCategory
+    requires_human_review: bool
+    count: int
+    avg_confidence: float
+
+
+class EmailCategoryStatsResponse(BaseModel):
+    category: EmailCategory
+    count: int
+    review_count: int
+    review_rate: float
+    avg_confidence: float
+
+
+class EmailStatsResponse(BaseModel):
+    granularity: StatsGranularity
+    total: int
+    review_rate: float
+    avg_confidence: float
+    by_category: List[EmailCategoryStatsResponse]
+    buckets: List[EmailStatsBucketResponse]
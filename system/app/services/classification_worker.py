@@ -0,0 +1,158 @@
+# system/app/services/classification_worker.py
+import asyncio
+import logging
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from system.app.domain.entities.email_entity import Email, EmailStatus
+from system.app.infrastructure.llm.near_duplicate import NearDuplicateIndex
+from system.app.infrastructure.llm.rate_limiter import LLMPriority, llm_priority
+from system.app.repositories.email_repository import EmailRepository
+from system.app.services.draft_generator import DraftGenerator
+from system.app.services.email_service import EmailClassificationService
+
+logger = logging.getLogger(__name__)
+
+
+class ClassificationWorkerPool:
+    """
+    Drena a fila de e-mails PENDING da própria tabela `emails`.
+
+    Cada worker reserva um e-mail por vez (`claim_next_job`), roda a
+    classificação e, se houver `callback_url`, avisa o cliente via webhook.
+    Jobs que falham voltam para PENDING até `max_attempts`, depois FAILED;
+    cada retentativa espera `retry_backoff` segundos, dobrando a cada falha.
+    """
+
+    def __init__(
+        self,
+        repository_scope: Callable[[], AbstractAsyncContextManager[EmailRepository]],
+        llm_client_factory: Callable[[], object],
+        workers: int,
+        poll_interval: float,
+        max_attempts: int,
+        lease_seconds: int,
+        webhook_timeout: float,
+        retry_backoff: float = 30.0,
+        draft_generator: DraftGenerator | None = None,
+        near_duplicates: NearDuplicateIndex | None = None,
+    ):
+        self._repository_scope = repository_scope
+        self._llm_client_factory = llm_client_factory
+        self._workers = workers
+        self._poll_interval = poll_interval
+        self._max_attempts = max_attempts
+        self._lease_seconds = lease_seconds
+        self._webhook_timeout = webhook_timeout
+        self._retry_backoff = retry_backoff
+        self._draft_generator = draft_generator
+        self._near_duplicates = near_duplicates
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks: list[asyncio.Task] = []
+        self._http: httpx.AsyncClient | None = None
+
+    async def start(self) -> None:
+        if self._workers <= 0:
+            return
+        self._http = httpx.AsyncClient(timeout=self._webhook_timeout)
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"classification-worker-{n}")
+            for n in range(self._workers)
+        ]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        self._stopping = True
+        self._wakeup.set()
+        if self._tasks:
+            # Deixa os jobs em andamento terminarem; o que sobrar é cancelado
+            # e volta à fila quando o lease vencer.
+            _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def notify(self) -> None:
+        """Acorda os workers sem esperar o próximo ciclo de polling."""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                processed = await self._process_one()
+            except Exception:
+                logger.exception("Falha ao reservar job de classificação")
+                processed = False
+
+            if not processed:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _process_one(self) -> bool:
+        async with self._repository_scope() as repo:
+            email = await repo.claim_next_job(self._lease_seconds)
+            if email is None:
+                return False
+
+            service = EmailClassificationService(
+                llm_client=self._llm_client_factory(),
+                email_repository=repo,
+                draft_generator=self._draft_generator,
+                near_duplicates=self._near_duplicates,
+            )
+            try:
+                # Jobs assíncronos não têm ninguém esperando na conexão.
+                with llm_priority(LLMPriority.BATCH):
+                    email = await service.classify_pending(email)
+                failure = None
+            except Exception as exc:
+                logger.warning("Classificação do e-mail %s falhou: %s", email.id, exc)
+                failure = exc
+
+        if failure is not None:
+            # Sessão nova: a da classificação pode ter ficado inutilizável
+            # (erro do banco no meio da transação).
+            async with self._repository_scope() as repo:
+                email = await repo.fail_job(
+                    email.id,
+                    str(failure) or failure.__class__.__name__,
+                    self._retry_at(email.attempts),
+                )
+            if email is None:
+                return True
+
+        if email.status != EmailStatus.PENDING and email.callback_url:
+            await self._send_webhook(email)
+        return True
+
+    def _retry_at(self, attempts: int) -> datetime | None:
+        if attempts >= self._max_attempts:
+            return None
+        delay = self._retry_backoff * 2 ** (attempts - 1)
+        return datetime.now(timezone.utc) + timedelta(seconds=delay)
+
+    async def _send_webhook(self, email: Email) -> None:
+        payload = {
+            "id": email.id,
+            "status": email.status.value,
+            "category": email.category.value,
+            "confidence": email.confidence,
+            "draft_reply": email.draft_reply,
+            "requires_human_review": email.requires_human_review,
+            "last_error": email.last_error,
+        }
+        try:
+            response = await self._http.post(email.callback_url, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            logger.warning("Webhook do e-mail %s falhou: %s", email.id, exc)
@@ -0,0 +1,109 @@
+# system/app/services/draft_generator.py
+import asyncio
+import logging
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+
+from system.app.domain.entities.email_entity import Email, EmailStatus
+from system.app.infrastructure.llm.rate_limiter import LLMPriority, llm_priority
+from system.app.repositories.email_repository import EmailRepository
+
+logger = logging.getLogger(__name__)
+
+
+class DraftGenerator:
+    """
+    Fase 2 do modo DRAFT_MODE=lazy: gera o `draft_reply` de e-mails já
+    classificados, sob demanda (GET /emails/{id}/draft) ou em segundo plano
+    para os de confiança alta. O rascunho fica gravado em `emails`, então
+    cada e-mail custa no máximo uma geração.
+    """
+
+    def __init__(
+        self,
+        client,
+        repository_scope: Callable[[], AbstractAsyncContextManager[EmailRepository]],
+        workers: int,
+        background_min_confidence: float,
+        max_queue: int = 1000,
+    ):
+        self._client = client
+        self._repository_scope = repository_scope
+        self._workers = workers
+        self._background_min_confidence = background_min_confidence
+        self._queue: asyncio.Queue[int] = asyncio.Queue(maxsize=max_queue)
+        self._inflight: dict[int, asyncio.Future] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"draft-worker-{n}")
+            for n in range(self._workers)
+        ]
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        # A fila é só memória: o que não foi gerado sai depois, sob demanda.
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def schedule(self, email: Email) -> None:
+        """Enfileira a geração em segundo plano se o e-mail se qualifica."""
+        if (
+            not self._tasks
+            or email.id is None
+            or email.draft_reply
+            or email.status != EmailStatus.CLASSIFIED
+            or email.confidence < self._background_min_confidence
+        ):
+            return
+        try:
+            self._queue.put_nowait(email.id)
+        except asyncio.QueueFull:
+            logger.warning("Fila de rascunhos cheia; e-mail %s fica sob demanda", email.id)
+
+    async def ensure_draft(self, repo: EmailRepository, email: Email) -> Email:
+        """Devolve o e-mail com rascunho, gerando-o se ainda não existir."""
+        if email.draft_reply or email.status != EmailStatus.CLASSIFIED:
+            return email
+
+        # Pedidos simultâneos do mesmo e-mail compartilham uma geração.
+        pending = self._inflight.get(email.id)
+        if pending is not None:
+            draft = await asyncio.shield(pending)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[email.id] = future
+            try:
+                draft = await self._client.generate_draft(email, email.category)
+            except BaseException as exc:
+                if isinstance(exc, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(exc)
+                    future.exception()
+                raise
+            else:
+                future.set_result(draft)
+            finally:
+                self._inflight.pop(email.id, None)
+
+        saved = await repo.save_draft(email.id, draft)
+        return saved or email
+
+    async def _run(self) -> None:
+        while True:
+            email_id = await self._queue.get()
+            try:
+                async with self._repository_scope() as repo:
+                    email = await repo.get(email_id)
+                    if email is not None:
+                        with llm_priority(LLMPriority.BACKGROUND):
+                            await self.ensure_draft(repo, email)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Falha ao gerar rascunho do e-mail %s", email_id)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,194 @@
+# system/app/services/email_feed.py
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import AbstractAsyncContextManager, contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from system.app.core.metrics import EMAIL_FEED_SUBSCRIBERS
+from system.app.domain.entities.email_entity import Email
+from system.app.repositories.email_repository import (
+    EmailChanges,
+    EmailListFilters,
+    EmailRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+# Ids por SELECT na releitura (limite de parâmetros do SQLite).
+_READ_CHUNK = 500
+
+
+class EmailFeedEventKind(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    # Alterado e fora do filtro do cliente: só o id, para ele tirar da tela.
+    REMOVED = "removed"
+    # Eventos perdidos (cliente lento, reconexão ao banco, shutdown): o
+    # cliente deve recarregar a lista e reconectar.
+    RESET = "reset"
+
+
+@dataclass
+class EmailFeedEvent:
+    kind: EmailFeedEventKind
+    email: Optional[Email] = None
+
+
+class EmailFeedSubscription:
+    """Fila de eventos de um cliente conectado, com filtro próprio."""
+
+    def __init__(self, filters: EmailListFilters, max_pending: int):
+        self.filters = filters
+        self.closed = False
+        self._max_pending = max_pending
+        self._events: deque[EmailFeedEvent] = deque()
+        self._wakeup = asyncio.Event()
+
+    def offer(self, kind: EmailFeedEventKind, email: Email) -> None:
+        if self._matches(email):
+            self._push(EmailFeedEvent(kind, email))
+        elif kind == EmailFeedEventKind.UPDATED:
+            # Pode ter saído do filtro (ex.: revisado numa tela "só revisão").
+            self._push(EmailFeedEvent(EmailFeedEventKind.REMOVED, email))
+
+    def close(self) -> None:
+        """Descarta o que não foi entregue e termina com um reset."""
+        if self.closed:
+            return
+        self.closed = True
+        self._events.clear()
+        self._events.append(EmailFeedEvent(EmailFeedEventKind.RESET))
+        self._wakeup.set()
+
+    async def next(self, timeout: float) -> Optional[EmailFeedEvent]:
+        """Próximo evento, ou None se nada chegar em `timeout` segundos."""
+        if not self._events:
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        return self._events.popleft()
+
+    def _push(self, event: EmailFeedEvent) -> None:
+        if self.closed:
+            return
+        if len(self._events) >= self._max_pending:
+            # Cliente não acompanha: em vez de crescer sem limite, ele
+            # recarrega a lista e retoma do último id.
+            self.close()
+            return
+        self._events.append(event)
+        self._wakeup.set()
+
+    def _matches(self, email: Email) -> bool:
+        f = self.filters
+        return (
+            (f.category is None or email.category == f.category)
+            and (
+                f.requires_human_review is None
+                or email.requires_human_review == f.requires_human_review
+            )
+            and (f.status is None or email.status == f.status)
+        )
+
+
+class EmailFeedHub:
+    """
+    Difusão local das mudanças em `emails` para os clientes do feed ao vivo.
+
+    Recebe só ids (do commit do repositório no mesmo processo, ou do
+    LISTEN do Postgres), relê os e-mails uma vez por lote e entrega a
+    cada assinante que o filtro aceitar. O custo de leitura é por mudança,
+    não por aba aberta; sem assinantes, nada é lido.
+    """
+
+    def __init__(
+        self,
+        repository_scope: Callable[[], AbstractAsyncContextManager[EmailRepository]],
+        max_pending: int = 1000,
+    ):
+        self._repository_scope = repository_scope
+        self._max_pending = max_pending
+        self._subscribers: set[EmailFeedSubscription] = set()
+        self._created: set[int] = set()
+        self._updated: set[int] = set()
+        self._flush_task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        self.reset()
+
+    @contextmanager
+    def subscribe(self, filters: EmailListFilters) -> Iterator[EmailFeedSubscription]:
+        subscription = EmailFeedSubscription(filters, self._max_pending)
+        self._subscribers.add(subscription)
+        EMAIL_FEED_SUBSCRIBERS.set(len(self._subscribers))
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+            EMAIL_FEED_SUBSCRIBERS.set(len(self._subscribers))
+
+    def publish(self, changes: EmailChanges) -> None:
+        if not self._subscribers:
+            return
+        self._created.update(changes.created)
+        self._updated.update(changes.updated)
+        # Uma leitura por vez: o que chegar enquanto ela roda vai no próximo lote.
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush(), name="email-feed-flush")
+
+    def reset(self) -> None:
+        """Avisa todos os assinantes de que eventos foram perdidos."""
+        for subscription in list(self._subscribers):
+            subscription.close()
+
+    # EmailChangePublisher: no modo memory o próprio hub é avisado pelo
+    # repositório depois do commit.
+    async def before_commit(self, session: AsyncSession, changes: EmailChanges) -> None:
+        pass
+
+    def after_commit(self, changes: EmailChanges) -> None:
+        self.publish(changes)
+
+    async def _flush(self) -> None:
+        while self._created or self._updated:
+            created, self._created = self._created, set()
+            updated, self._updated = self._updated - created, set()
+            ids = sorted(created | updated)
+            try:
+                emails: list[Email] = []
+                async with self._repository_scope() as repo:
+                    for start in range(0, len(ids), _READ_CHUNK):
+                        emails.extend(await repo.get_many(ids[start : start + _READ_CHUNK]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Falha ao reler e-mails para o feed ao vivo")
+                self.reset()
+                continue
+
+            for email in emails:
+                kind = (
+                    EmailFeedEventKind.CREATED
+                    if email.id in created
+                    else EmailFeedEventKind.UPDATED
+                )
+                for subscription in list(self._subscribers):
+                    subscription.offer(kind, email)
@@ -1,9 +1,30 @@
-from system.app.domain.entities.email_entity import Email
-from system.app.domain.entities.classification import EmailCategory
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+
+from system.app.core.config import settings
+from system.app.core.metrics import CLASSIFICATIONS, time_stage
+from system.app.domain.entities.email_entity import Email, EmailStatus
+from system.app.domain.entities.classification import (
+    ClassificationResult,
+    EmailCategory,
+)
 from system.app.infrastructure.llm.llm_client import LLMClient
+from system.app.infrastructure.llm.near_duplicate import NearDuplicateIndex
 from system.app.infrastructure.llm.openai_client import DummyLLMClient
+from system.app.infrastructure.llm.rate_limiter import (
+    LLMPriority,
+    LLMQueueTimeoutError,
+    llm_priority,
+)
+from system.app.infrastructure.llm.streaming import (
+    ClassificationDelta,
+    delta_from_result,
+    stream_classification,
+)
 from system.app.schemas.email_schemas import EmailCreateRequest
 from system.app.repositories.email_repository import EmailRepository
+from system.app.services.draft_generator import DraftGenerator
+from system.app.services.write_behind import WriteBehindEmailWriter
 
 
 class EmailClassificationService:
@@ -11,13 +32,208 @@ class EmailClassificationService:
         self,
         llm_client: LLMClient | None = None,
         email_repository: EmailRepository | None = None,
+        draft_generator: DraftGenerator | None = None,
+        email_writer: WriteBehindEmailWriter | None = None,
+        near_duplicates: NearDuplicateIndex | None = None,
     ):
         # Fallback para o cliente dummy quando não foi injetado.
         self._llm_client = llm_client or DummyLLMClient()
         self._email_repository = email_repository
+        # Só existe com DRAFT_MODE=lazy: agenda os rascunhos pendentes.
+        self._draft_generator = draft_generator
+        # Com WRITE_BEHIND_ENABLED, e-mails novos são gravados em lote.
+        self._email_writer = email_writer
+        # Com NEAR_DUPLICATE_ENABLED, quase duplicatas confiáveis pulam a LLM.
+        self._near_duplicates = near_duplicates
 
     async def classify_from_request(self, payload: EmailCreateRequest) -> Email:
-        email = Email(
+        email = self._new_email(payload)
+
+        # reaproveita um vizinho quase idêntico ou chama a LLM
+        result = await self._reuse_near_duplicate(email)
+        if result is None:
+            result = await self._llm_client.classify_email(email)
+
+        # preenche com resultado
+        self._apply_result(email, result)
+
+        # salva no banco
+        if self._email_repository is not None:
+            email = await self._insert(email)
+            self._after_save(email)
+
+        return email
+
+    async def stream_from_request(
+        self, payload: EmailCreateRequest
+    ) -> AsyncIterator[ClassificationDelta | Email]:
+        """
+        Versão em streaming de `classify_from_request`: repassa os pedaços da
+        classificação e, quando o stream termina, salva e entrega o `Email`.
+        """
+        email = self._new_email(payload)
+        result = await self._reuse_near_duplicate(email)
+        if result is not None:
+            yield delta_from_result(result)
+        else:
+            async for delta in stream_classification(self._llm_client, email):
+                if delta.result is not None:
+                    result = delta.result
+                if delta.category is not None or delta.draft_delta:
+                    yield delta
+
+        if result is None:
+            raise RuntimeError("Stream da LLM terminou sem resultado final")
+        self._apply_result(email, result)
+        if self._email_repository is not None:
+            email = await self._insert(email)
+            self._after_save(email)
+        yield email
+
+    async def enqueue_from_request(
+        self,
+        payload: EmailCreateRequest,
+        callback_url: str | None = None,
+    ) -> Email:
+        """Persiste o e-mail como PENDING para a fila de classificação."""
+        email = self._new_email(payload)
+        email.status = EmailStatus.PENDING
+        email.callback_url = callback_url
+        return await self._insert(email)
+
+    async def classify_pending(self, email: Email) -> Email:
+        """Classifica um e-mail já reservado da fila e grava o resultado."""
+        result = await self._reuse_near_duplicate(email)
+        if result is None:
+            result = await self._llm_client.classify_email(email)
+        self._apply_result(email, result)
+        email.status = EmailStatus.CLASSIFIED
+        email.last_error = None
+        with time_stage("repository_save"):
+            email = await self._email_repository.save(email)
+        self._after_save(email)
+        return email
+
+    async def classify_batch(
+        self,
+        payloads: Sequence[EmailCreateRequest],
+        concurrency: int | None = None,
+    ) -> list[Email | Exception]:
+        """
+        Classifica vários e-mails (ver `classify_emails`) e persiste todos os
+        sucessos num único insert em lote.
+
+        Retorna uma lista alinhada com `payloads`: cada posição contém o
+        `Email` salvo ou a exceção que impediu aquele item.
+        """
+        emails = [self._new_email(p) for p in payloads]
+        # Lotes cedem a vez às classificações interativas no rate limiter.
+        with llm_priority(LLMPriority.BATCH):
+            results = await self.classify_emails(emails, concurrency)
+
+        classified = [r for r in results if isinstance(r, Email)]
+        if classified and self._email_repository is not None:
+            try:
+                with time_stage("repository_save_many"):
+                    await self._email_repository.save_many(classified)
+                for email in classified:
+                    self._after_save(email)
+            except Exception as exc:
+                # Falha no insert em lote invalida todos os itens classificados.
+                results = [exc if isinstance(r, Email) else r for r in results]
+
+        return results
+
+    async def classify_emails(
+        self,
+        emails: Sequence[Email],
+        concurrency: int | None = None,
+    ) -> list[Email | Exception]:
+        """
+        Classifica entidades já montadas, sem persistir, com no máximo
+        `concurrency` chamadas à LLM em paralelo. Se o cliente de LLM expõe
+        `classify_many`, os e-mails vão em pacotes de `LLM_PACK_SIZE` por
+        chamada; se o pacote inteiro falha, cada e-mail dele é tentado
+        sozinho. A prioridade no rate limiter é a do contexto de quem chama.
+
+        Retorna uma lista alinhada com `emails`: o próprio `Email`, já com o
+        resultado aplicado, ou a exceção daquele item.
+        """
+        semaphore = asyncio.Semaphore(
+            concurrency or settings.CLASSIFY_BATCH_CONCURRENCY
+        )
+        # Quase duplicatas saem do lote antes da LLM (consultas sequenciais:
+        # a sessão do repositório não aceita uso concorrente).
+        reused_flags: list[bool] = []
+        pending: list[Email] = []
+        for email in emails:
+            reused = await self._reuse_near_duplicate(email)
+            reused_flags.append(reused is not None)
+            if reused is None:
+                pending.append(email)
+            else:
+                self._apply_result(email, reused)
+
+        async def _classify(email: Email) -> Email:
+            async with semaphore:
+                result = await self._llm_client.classify_email(email)
+            self._apply_result(email, result)
+            return email
+
+        async def _classify_packed(chunk: list[Email]) -> list[Email | Exception]:
+            try:
+                async with semaphore:
+                    outcomes = await classify_many(chunk)
+            except LLMQueueTimeoutError:
+                # Sem cota, item a item só multiplicaria a espera.
+                raise
+            except Exception:
+                # Um item problemático (ou resposta malformada) não derruba
+                # os outros do pacote.
+                return list(
+                    await asyncio.gather(
+                        *(_classify(e) for e in chunk), return_exceptions=True
+                    )
+                )
+            packed: list[Email | Exception] = []
+            for email, outcome in zip(chunk, outcomes):
+                if isinstance(outcome, Exception):
+                    packed.append(outcome)
+                else:
+                    self._apply_result(email, outcome)
+                    packed.append(email)
+            return packed
+
+        # Clientes que suportam empacotamento recebem N e-mails por chamada.
+        classify_many = getattr(self._llm_client, "classify_many", None)
+        pack_size = settings.LLM_PACK_SIZE
+        if classify_many is not None and pack_size > 1:
+            chunks = [pending[i : i + pack_size] for i in range(0, len(pending), pack_size)]
+            chunk_results = await asyncio.gather(
+                *(_classify_packed(chunk) for chunk in chunks),
+                return_exceptions=True,
+            )
+            results: list[Email | Exception] = []
+            for chunk, outcome in zip(chunks, chunk_results):
+                if isinstance(outcome, Exception):
+                    results.extend([outcome] * len(chunk))
+                else:
+                    results.extend(outcome)
+        else:
+            results = await asyncio.gather(
+                *(_classify(e) for e in pending),
+                return_exceptions=True,
+            )
+
+        # Realinha com `emails`: reaproveitados entram na ordem original.
+        outcomes = iter(results)
+        return [
+            email if reused else next(outcomes)
+            for email, reused in zip(emails, reused_flags)
+        ]
+
+    def _new_email(self, payload: EmailCreateRequest) -> Email:
+        return Email(
             id=None,
             from_email=payload.from_email,
             subject=payload.subject,
@@ -30,17 +246,46 @@ class EmailClassificationService:
             updated_at=None,
         )
 
-        # chama a LLM
-        result = await self._llm_client.classify_email(email)
+    async def _insert(self, email: Email) -> Email:
+        with time_stage("repository_save"):
+            if self._email_writer is not None:
+                return await self._email_writer.insert(email)
+            return await self._email_repository.save(email)
 
-        # preenche com resultado
+    async def _reuse_near_duplicate(self, email: Email) -> ClassificationResult | None:
+        """
+        Resultado de um e-mail quase idêntico já confiável, se houver. O
+        vizinho é relido do banco: categoria e rascunho vêm do estado atual
+        (ex.: corrigido na revisão), não do momento em que foi indexado.
+        """
+        if self._near_duplicates is None or self._email_repository is None:
+            return None
+        match = self._near_duplicates.lookup(email)
+        if match is None:
+            return None
+        neighbor = await self._email_repository.get(match.email_id)
+        if neighbor is None or not self._near_duplicates.is_reusable(neighbor):
+            self._near_duplicates.discard(match.email_id)
+            return None
+
+        email.matched_email_id = neighbor.id
+        trust = 1.0 if neighbor.reviewed_by is not None else neighbor.confidence
+        return ClassificationResult(
+            category=neighbor.category,
+            confidence=round(min(trust, match.similarity), 4),
+            draft_reply=neighbor.draft_reply,
+            requires_human_review=False,
+        )
+
+    def _after_save(self, email: Email) -> None:
+        if self._near_duplicates is not None:
+            self._near_duplicates.observe(email)
+        if self._draft_generator is not None:
+            self._draft_generator.schedule(email)
+
+    def _apply_result(self, email: Email, result: ClassificationResult) -> None:
+        CLASSIFICATIONS.labels(category=result.category.value).inc()
         email.category = result.category
         email.confidence = result.confidence
         email.draft_reply = result.draft_reply
         email.requires_human_review = result.requires_human_review
-
-        # salva no banco
-        if self._email_repository is not None:
-            email = self._email_repository.save(email)
-
-        return email
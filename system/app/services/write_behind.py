@@ -0,0 +1,131 @@
+# system/app/services/write_behind.py
+import asyncio
+import logging
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+
+from system.app.core.metrics import WRITE_BEHIND_BATCH_SIZE
+from system.app.domain.entities.email_entity import Email
+from system.app.repositories.email_repository import EmailRepository
+
+logger = logging.getLogger(__name__)
+
+_Pending = tuple[Email, asyncio.Future]
+
+
+class WriteBehindEmailWriter:
+    """
+    Agrupa os inserts de e-mails novos feitos por requisições simultâneas.
+
+    Cada chamador entrega o e-mail e espera a própria future; uma única
+    tarefa junta o que chegar em até `max_delay_ms` (ou `max_batch` e-mails)
+    e grava tudo com `save_many`: um INSERT ... RETURNING e um commit por
+    lote, em vez de um por e-mail. Se o lote falhar, os e-mails são
+    regravados um a um para que só o culpado receba o erro.
+    """
+
+    def __init__(
+        self,
+        repository_scope: Callable[[], AbstractAsyncContextManager[EmailRepository]],
+        max_batch: int,
+        max_delay_ms: float,
+        max_queue: int = 10_000,
+    ):
+        self._repository_scope = repository_scope
+        self._max_batch = max(1, max_batch)
+        self._max_delay = max(0.0, max_delay_ms) / 1000
+        self._queue: asyncio.Queue[_Pending | None] = asyncio.Queue(maxsize=max_queue)
+        self._batch_full = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+    async def start(self) -> None:
+        self._closing = False
+        self._task = asyncio.create_task(self._run(), name="email-write-behind")
+
+    async def stop(self) -> None:
+        """Grava tudo o que já foi entregue e encerra a tarefa."""
+        if self._task is None:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        self._batch_full.set()
+        await self._task
+        self._task = None
+
+    async def insert(self, email: Email) -> Email:
+        """Grava um e-mail novo; retorna quando o lote dele foi commitado."""
+        if self._task is None or self._closing:
+            # Fora do ciclo de vida (startup/shutdown): grava direto.
+            async with self._repository_scope() as repo:
+                return await repo.save(email)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((email, future))
+        if self._queue.qsize() >= self._max_batch - 1:
+            self._batch_full.set()
+        return await future
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            if self._max_delay and self._queue.qsize() < self._max_batch - 1:
+                # Espera o lote encher ou o prazo vencer. Espera num Event,
+                # não em queue.get(), para não perder itens no timeout.
+                self._batch_full.clear()
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self._max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            while len(batch) < self._max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_Pending]) -> None:
+        WRITE_BEHIND_BATCH_SIZE.observe(len(batch))
+        try:
+            async with self._repository_scope() as repo:
+                await repo.save_many([email for email, _ in batch])
+        except Exception as exc:
+            if len(batch) == 1:
+                _resolve(batch[0][1], exc)
+                return
+            logger.warning(
+                "INSERT em lote de %d e-mails falhou (%s); gravando um a um",
+                len(batch),
+                exc,
+            )
+            for email, future in batch:
+                try:
+                    async with self._repository_scope() as repo:
+                        await repo.save_many([email])
+                except Exception as item_exc:
+                    _resolve(future, item_exc)
+                else:
+                    _resolve(future, email)
+            return
+
+        for email, future in batch:
+            _resolve(future, email)
+
+
+def _resolve(future: asyncio.Future, outcome: Email | Exception) -> None:
+    # O chamador pode ter desistido (ex.: cliente desconectou); o e-mail
+    # foi gravado mesmo assim.
+    if future.done():
+        return
+    if isinstance(outcome, Exception):
+        future.set_exception(outcome)
+    else:
+        future.set_result(outcome)
@@ -0,0 +1,145 @@
+# system/benchmarks/load.py
+"""
+Gerador de carga contra uma API em execução.
+
+Uso (API apontando para o mock da OpenAI e para SQLite ou Postgres):
+    python -m system.benchmarks.load --base-url http://127.0.0.1:8000 \\
+        --concurrency 1,8,32 --requests 500 --output load.json
+
+Cenários: `classify` (POST /emails/classify), `list` (GET /emails/) e
+`get` (GET /emails/{id}). Cada nível de concorrência roda `--requests`
+requisições por cenário, depois de `--warmup` requisições descartadas.
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import time
+
+import httpx
+
+from system.benchmarks.report import BenchResult, print_results, write_report
+
+SCENARIOS = ("classify", "list", "get")
+
+_BODIES = (
+    "Comprei um fone e ele parou de funcionar em uma semana, quero a garantia.",
+    "Adorei o atendimento, parabéns pela agilidade na entrega!",
+    "Me arrependi da compra e gostaria do reembolso, como faço a devolução?",
+    "Qual é o prazo de entrega para o CEP 01310-100?",
+    "Estou muito insatisfeito, o pedido chegou com problema e ninguém responde.",
+)
+
+
+def _classify_payload(counter: int) -> dict:
+    # Corpo único por requisição para não medir só acertos de cache.
+    return {
+        "from_email": f"cliente{counter % 500}@example.com",
+        "subject": f"Pedido #{counter}",
+        "body": f"{random.choice(_BODIES)} (ref {counter})",
+    }
+
+
+async def _seed_ids(client: httpx.AsyncClient, count: int) -> list[int]:
+    response = await client.get("/emails/", params={"limit": count, "view": "summary"})
+    response.raise_for_status()
+    ids = [item["id"] for item in response.json()]
+    while len(ids) < count:
+        created = await client.post("/emails/classify", json=_classify_payload(len(ids)))
+        created.raise_for_status()
+        ids.append(created.json()["id"])
+    return ids
+
+
+async def _run_scenario(
+    client: httpx.AsyncClient,
+    scenario: str,
+    concurrency: int,
+    requests: int,
+    warmup: int,
+    ids: list[int],
+) -> BenchResult:
+    result = BenchResult(name=scenario, concurrency=concurrency)
+    counter = itertools.count()
+
+    async def _request(n: int) -> httpx.Response:
+        if scenario == "classify":
+            return await client.post("/emails/classify", json=_classify_payload(n))
+        if scenario == "list":
+            return await client.get("/emails/", params={"limit": 50})
+        return await client.get(f"/emails/{random.choice(ids)}")
+
+    async def _worker(total: int, record: bool) -> None:
+        while (n := next(counter)) < total:
+            start = time.perf_counter()
+            try:
+                response = await _request(n)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            if not record:
+                continue
+            if failed:
+                result.errors += 1
+            else:
+                result.latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(_worker(warmup, False) for _ in range(concurrency)))
+    counter = itertools.count()
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker(requests, True) for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def run(args: argparse.Namespace) -> list[BenchResult]:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    scenarios = args.scenarios.split(",")
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    results: list[BenchResult] = []
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=args.timeout, limits=limits
+    ) as client:
+        ids = await _seed_ids(client, 100) if "get" in scenarios else []
+        for scenario in scenarios:
+            for level in levels:
+                results.append(
+                    await _run_scenario(client, scenario, level, args.requests, args.warmup, ids)
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Teste de carga da API de e-mails")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", default="1,8,32", help="Níveis separados por vírgula")
+    parser.add_argument("--requests", type=int, default=200, help="Requisições por cenário/nível")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--label", default=None, help="Ex.: sqlite, postgres")
+    parser.add_argument("--output", default="load.json")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios.split(",")) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"cenários desconhecidos: {', '.join(sorted(unknown))}")
+
+    random.seed(args.seed)
+    results = asyncio.run(run(args))
+    print_results(results)
+    write_report(
+        args.output,
+        "load",
+        results,
+        base_url=args.base_url,
+        label=args.label,
+        requests=args.requests,
+        warmup=args.warmup,
+    )
+    print(f"Relatório salvo em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
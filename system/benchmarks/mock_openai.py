@@ -0,0 +1,257 @@
+# system/benchmarks/mock_openai.py
+"""
+Servidor local compatível com a API de chat completions da OpenAI, para
+testes de carga sem custo nem variação de rede.
+
+Uso:
+    python -m system.benchmarks.mock_openai --port 9100 --latency-ms 400 \\
+        --jitter-ms 100 --error-rate 0.02 --malformed-rate 0.01 \\
+        --ms-per-output-token 15
+
+`--rpm` impõe uma cota de requisições por minuto: acima dela o mock
+responde 429 e todas as respostas trazem os headers x-ratelimit-*.
+
+`--ms-per-output-token` soma latência proporcional ao tamanho da resposta,
+como na API real (útil para comparar DRAFT_MODE=inline e lazy).
+
+E na API:
+    OPENAI_API_KEY=bench OPENAI_BASE_URL=http://127.0.0.1:9100/v1
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from system.app.domain.entities.classification import EmailCategory
+
+_PACKED_MARKER = re.compile(r"\[EMAIL (\d+)\]")
+_CATEGORIES = [c for c in EmailCategory if c != EmailCategory.INCONCLUSIVO]
+_DRAFT = (
+    "Olá,\n\nObrigado pelo seu contato. Recebemos sua mensagem e nossa equipe "
+    "vai retornar em breve com os próximos passos.\n\nAtenciosamente,\n"
+    "Equipe de Suporte"
+)
+
+
+def _fake_result(text: str, with_draft: bool = True) -> dict:
+    # Determinístico por conteúdo: o mesmo e-mail sempre recebe a mesma categoria.
+    digest = hashlib.sha256(text.encode()).digest()
+    result = {
+        "classification": _CATEGORIES[digest[0] % len(_CATEGORIES)].value,
+        "confidence": round(0.6 + (digest[1] / 255) * 0.39, 2),
+        "requires_human_review": digest[2] % 5 == 0,
+    }
+    if with_draft:
+        result["draft_reply"] = _DRAFT
+    return result
+
+
+def _completion_content(system_prompt: str, user_content: str) -> str:
+    # O prompt de sistema diz o que o cliente espera: só o rascunho (texto),
+    # só a classificação ou os dois.
+    if "classification" not in system_prompt:
+        return _DRAFT
+    with_draft = "draft_reply" in system_prompt
+    indexes = _PACKED_MARKER.findall(user_content)
+    if not indexes:
+        return json.dumps(_fake_result(user_content, with_draft), ensure_ascii=False)
+    parts = _PACKED_MARKER.split(user_content)
+    # split devolve [prefixo, idx0, texto0, idx1, texto1, ...]
+    results = [
+        {"index": int(index), **_fake_result(text, with_draft)}
+        for index, text in zip(parts[1::2], parts[2::2])
+    ]
+    return json.dumps({"results": results}, ensure_ascii=False)
+
+
+def _usage(prompt: str, completion: str) -> dict:
+    # Aproximação grosseira de ~4 caracteres por token.
+    prompt_tokens, completion_tokens = len(prompt) // 4, len(completion) // 4
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+class _RequestQuota:
+    """Token bucket de requisições por minuto, como o da OpenAI."""
+
+    def __init__(self, rpm: float):
+        self.rpm = rpm
+        self.level = rpm
+        self.updated = time.monotonic()
+
+    def take(self) -> tuple[bool, dict[str, str]]:
+        now = time.monotonic()
+        self.level = min(self.rpm, self.level + (now - self.updated) * self.rpm / 60)
+        self.updated = now
+        allowed = self.level >= 1
+        if allowed:
+            self.level -= 1
+        reset = (self.rpm - self.level) * 60 / self.rpm
+        headers = {
+            "x-ratelimit-limit-requests": str(int(self.rpm)),
+            "x-ratelimit-remaining-requests": str(int(self.level)),
+            "x-ratelimit-reset-requests": f"{reset:.3f}s",
+        }
+        return allowed, headers
+
+
+def create_app(
+    latency_ms: float = 300.0,
+    jitter_ms: float = 50.0,
+    error_rate: float = 0.0,
+    malformed_rate: float = 0.0,
+    stream_chunk_chars: int = 12,
+    ms_per_output_token: float = 0.0,
+    rpm: float | None = None,
+    seed: int | None = None,
+) -> FastAPI:
+    app = FastAPI(title="mock-openai")
+    rng = random.Random(seed)
+    quota = _RequestQuota(rpm) if rpm else None
+    app.state.rate_limited = 0
+
+    async def _simulate_latency(fraction: float = 1.0) -> None:
+        delay = max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+        await asyncio.sleep(delay * fraction)
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": "mock", "object": "model", "owned_by": "bench"}]}
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        model = body.get("model", "mock")
+        prompt = "".join(m.get("content") or "" for m in body.get("messages", []))
+        user_content = body["messages"][-1]["content"]
+        system_prompt = body["messages"][0]["content"] if len(body["messages"]) > 1 else ""
+
+        quota_headers: dict[str, str] = {}
+        if quota is not None:
+            allowed, quota_headers = quota.take()
+            if not allowed:
+                app.state.rate_limited += 1
+                return JSONResponse(
+                    {"error": {"message": "Rate limit reached for requests", "type": "requests"}},
+                    status_code=429,
+                    headers={**quota_headers, "retry-after-ms": str(int(60_000 / quota.rpm))},
+                )
+
+        if rng.random() < error_rate:
+            await _simulate_latency(0.1)
+            # Metade como rate limit (com dica de espera), metade como 5xx.
+            if rng.random() < 0.5:
+                return JSONResponse(
+                    {"error": {"message": "Rate limit", "type": "rate_limit_exceeded"}},
+                    status_code=429,
+                    headers={"retry-after-ms": "50"},
+                )
+            return JSONResponse(
+                {"error": {"message": "Upstream failure", "type": "server_error"}},
+                status_code=503,
+            )
+
+        if rng.random() < malformed_rate:
+            content = "Desculpe, não consegui classificar este e-mail."
+        else:
+            content = _completion_content(system_prompt, user_content)
+        completion_tokens = _usage(prompt, content)["completion_tokens"]
+        generation_delay = completion_tokens * ms_per_output_token / 1000
+
+        completion_id = f"chatcmpl-{int(time.time() * 1000)}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            async def _chunks():
+                # A latência se divide entre o primeiro byte e o restante.
+                await _simulate_latency(0.3)
+                pieces = [
+                    content[i : i + stream_chunk_chars]
+                    for i in range(0, len(content), stream_chunk_chars)
+                ]
+                for piece in pieces:
+                    chunk = {
+                        "id": completion_id,
+                        "object": "chat.completion.chunk",
+                        "created": created,
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                    }
+                    yield f"data: {json.dumps(chunk)}\n\n"
+                    await asyncio.sleep(
+                        (latency_ms * 0.7 / 1000 + generation_delay) / max(len(pieces), 1)
+                    )
+                final = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": _usage(prompt, content),
+                }
+                yield f"data: {json.dumps(final)}\n\n"
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(
+                _chunks(), media_type="text/event-stream", headers=quota_headers
+            )
+
+        await _simulate_latency()
+        await asyncio.sleep(generation_delay)
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": _usage(prompt, content),
+        }
+        return JSONResponse(payload, headers=quota_headers)
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock local da API da OpenAI")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--ms-per-output-token", type=float, default=0.0)
+    parser.add_argument("--rpm", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_app(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        ms_per_output_token=args.ms_per_output_token,
+        rpm=args.rpm,
+        seed=args.seed,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
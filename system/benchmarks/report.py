@@ -0,0 +1,132 @@
+# system/benchmarks/report.py
+"""
+Estatísticas e relatórios JSON comuns aos benchmarks.
+
+Comparar dois relatórios (ex.: antes/depois de um commit):
+    python -m system.benchmarks.report baseline.json candidate.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Percentil com interpolação linear; `sorted_values` já ordenado."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+
+@dataclass
+class BenchResult:
+    """Latências (em segundos) de um cenário num nível de concorrência."""
+
+    name: str
+    concurrency: int = 1
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict:
+        values = sorted(self.latencies)
+        count = len(values)
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "count": count,
+            "errors": self.errors,
+            "mean_ms": round(sum(values) / count * 1000, 3) if count else 0.0,
+            "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+            "throughput_rps": round(count / self.elapsed, 2) if self.elapsed else 0.0,
+        }
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_report(
+    path: str | Path,
+    kind: str,
+    results: list[BenchResult],
+    **context,
+) -> dict:
+    report = {
+        "kind": kind,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_revision": _git_revision(),
+        "python": platform.python_version(),
+        "context": context,
+        "results": [r.summary() for r in results],
+    }
+    Path(path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
+
+
+def print_results(results: list[BenchResult]) -> None:
+    header = f"{'cenário':<28}{'conc':>6}{'n':>8}{'err':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'rps':>10}"
+    print(header)
+    for result in results:
+        s = result.summary()
+        print(
+            f"{s['name']:<28}{s['concurrency']:>6}{s['count']:>8}{s['errors']:>6}"
+            f"{s['p50_ms']:>10.2f}{s['p95_ms']:>10.2f}{s['p99_ms']:>10.2f}"
+            f"{s['throughput_rps']:>10.1f}"
+        )
+
+
+def compare(baseline: dict, candidate: dict) -> list[dict]:
+    """Variação percentual de p50/p95/p99/throughput por cenário."""
+    previous = {(r["name"], r["concurrency"]): r for r in baseline["results"]}
+    rows = []
+    for current in candidate["results"]:
+        before = previous.get((current["name"], current["concurrency"]))
+        if before is None:
+            continue
+        row = {"name": current["name"], "concurrency": current["concurrency"]}
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps"):
+            old, new = before[metric], current[metric]
+            row[metric] = round((new - old) / old * 100, 1) if old else None
+        rows.append(row)
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara dois relatórios de benchmark")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    candidate = json.loads(Path(args.candidate).read_text(encoding="utf-8"))
+    print(f"{baseline.get('git_revision')} -> {candidate.get('git_revision')} (variação %)")
+    print(f"{'cenário':<28}{'conc':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>9}")
+    for row in compare(baseline, candidate):
+        cells = "".join(
+            f"{'-' if row[m] is None else format(row[m], '+.1f'):>9}"
+            for m in ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+        )
+        print(f"{row['name']:<28}{row['concurrency']:>6}{cells}")
+
+
+if __name__ == "__main__":
+    main()
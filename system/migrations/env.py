@@ -17,8 +17,12 @@ sys.path.append(str(PROJECT_ROOT))
 from system.app.core.config import settings
 from system.app.infrastructure.db.base import Base
 from system.app.infrastructure.db.models import email_model
+from system.app.infrastructure.db.models import classification_cache_model
+from system.app.infrastructure.db.models import email_stats_model
+from system.app.infrastructure.db.session import to_sync_url
 
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+# A aplicação usa drivers assíncronos; o Alembic roda com o driver síncrono.
+config.set_main_option("sqlalchemy.url", to_sync_url(settings.DATABASE_URL))
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,157 @@
+"""create email_stats_hourly rollup
+
+Revision ID: 4cfd2ef89de6
+Revises: d223d5f44539
+Create Date: 2026-10-18 13:41:19.550183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4cfd2ef89de6'
+down_revision: Union[str, None] = 'd223d5f44539'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _pg_function(name: str, deltas: str) -> str:
+    return f"""
+    CREATE OR REPLACE FUNCTION {name}() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        INSERT INTO email_stats_hourly
+            (bucket, category, requires_human_review, email_count, confidence_sum)
+        SELECT bucket, category, requires_human_review, sum(n), sum(c)
+        FROM ({deltas}) AS delta
+        GROUP BY bucket, category, requires_human_review
+        HAVING sum(n) <> 0 OR sum(c) <> 0
+        ORDER BY bucket, category, requires_human_review
+        ON CONFLICT (bucket, category, requires_human_review) DO UPDATE SET
+            email_count = email_stats_hourly.email_count + EXCLUDED.email_count,
+            confidence_sum = email_stats_hourly.confidence_sum + EXCLUDED.confidence_sum;
+        RETURN NULL;
+    END
+    $$
+    """
+
+
+_PG_NEW_ROWS = """
+    SELECT date_trunc('hour', created_at AT TIME ZONE 'UTC') AS bucket,
+           category, requires_human_review, 1 AS n, confidence AS c
+    FROM new_rows WHERE status = 'CLASSIFIED'
+"""
+_PG_OLD_ROWS = """
+    SELECT date_trunc('hour', created_at AT TIME ZONE 'UTC') AS bucket,
+           category, requires_human_review, -1 AS n, -confidence AS c
+    FROM old_rows WHERE status = 'CLASSIFIED'
+"""
+
+
+def _sqlite_upsert(row: str, sign: str) -> str:
+    return f"""
+        INSERT INTO email_stats_hourly
+            (bucket, category, requires_human_review, email_count, confidence_sum)
+        SELECT strftime('%Y-%m-%d %H:00:00', {row}.created_at), {row}.category,
+               {row}.requires_human_review, {sign}1, {sign}{row}.confidence
+        WHERE {row}.status = 'CLASSIFIED'
+        ON CONFLICT (bucket, category, requires_human_review) DO UPDATE SET
+            email_count = email_count + excluded.email_count,
+            confidence_sum = confidence_sum + excluded.confidence_sum;"""
+
+
+def upgrade() -> None:
+    op.create_table('email_stats_hourly',
+    sa.Column('bucket', sa.DateTime(timezone=False), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('requires_human_review', sa.Boolean(), nullable=False),
+    sa.Column('email_count', sa.Integer(), nullable=False),
+    sa.Column('confidence_sum', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('bucket', 'category', 'requires_human_review')
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(_pg_function('emails_stats_on_insert', _PG_NEW_ROWS))
+        op.execute(_pg_function('emails_stats_on_update', _PG_NEW_ROWS + ' UNION ALL ' + _PG_OLD_ROWS))
+        op.execute(_pg_function('emails_stats_on_delete', _PG_OLD_ROWS))
+        op.execute(
+            """
+            CREATE TRIGGER emails_stats_insert AFTER INSERT ON emails
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION emails_stats_on_insert()
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER emails_stats_update AFTER UPDATE ON emails
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION emails_stats_on_update()
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER emails_stats_delete AFTER DELETE ON emails
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION emails_stats_on_delete()
+            """
+        )
+        bucket = "date_trunc('hour', created_at AT TIME ZONE 'UTC')"
+    elif dialect == 'sqlite':
+        op.execute(
+            f"""
+            CREATE TRIGGER emails_stats_ai AFTER INSERT ON emails BEGIN
+                {_sqlite_upsert('new', '')}
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER emails_stats_au
+            AFTER UPDATE OF category, confidence, requires_human_review, status ON emails BEGIN
+                {_sqlite_upsert('old', '-')}
+                {_sqlite_upsert('new', '')}
+            END
+            """
+        )
+        op.execute(
+            f"""
+            CREATE TRIGGER emails_stats_ad AFTER DELETE ON emails BEGIN
+                {_sqlite_upsert('old', '-')}
+            END
+            """
+        )
+        bucket = "strftime('%Y-%m-%d %H:00:00', created_at)"
+    else:
+        return
+
+    # Carga inicial com os e-mails que já existem.
+    op.execute(
+        f"""
+        INSERT INTO email_stats_hourly
+            (bucket, category, requires_human_review, email_count, confidence_sum)
+        SELECT {bucket}, category, requires_human_review, count(*), sum(confidence)
+        FROM emails
+        WHERE status = 'CLASSIFIED'
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS emails_stats_delete ON emails')
+        op.execute('DROP TRIGGER IF EXISTS emails_stats_update ON emails')
+        op.execute('DROP TRIGGER IF EXISTS emails_stats_insert ON emails')
+        op.execute('DROP FUNCTION IF EXISTS emails_stats_on_delete()')
+        op.execute('DROP FUNCTION IF EXISTS emails_stats_on_update()')
+        op.execute('DROP FUNCTION IF EXISTS emails_stats_on_insert()')
+    elif dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS emails_stats_ad')
+        op.execute('DROP TRIGGER IF EXISTS emails_stats_au')
+        op.execute('DROP TRIGGER IF EXISTS emails_stats_ai')
+    op.drop_table('email_stats_hourly')
@@ -0,0 +1,29 @@
+"""add emails version column
+
+Revision ID: 5366701a4c98
+Revises: 4cfd2ef89de6
+Create Date: 2026-10-18 14:20:05.318442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5366701a4c98'
+down_revision: Union[str, None] = '4cfd2ef89de6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ADD COLUMN simples (sem batch): no SQLite o modo batch recria a
+    # tabela e apagaria os triggers de busca e de estatísticas.
+    op.add_column('emails', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    # DROP COLUMN nativo (SQLite >= 3.35) também preserva os triggers.
+    op.drop_column('emails', 'version')
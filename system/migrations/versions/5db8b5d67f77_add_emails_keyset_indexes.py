@@ -0,0 +1,32 @@
+"""add emails keyset pagination indexes
+
+Revision ID: 5db8b5d67f77
+Revises: 795f17f97350
+Create Date: 2026-10-18 11:04:57.631840
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5db8b5d67f77'
+down_revision: Union[str, None] = '795f17f97350'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_emails_created_at_id', 'emails', ['created_at', 'id'], unique=False)
+    op.create_index('ix_emails_category_created_at_id', 'emails', ['category', 'created_at', 'id'], unique=False)
+    op.create_index('ix_emails_review_created_at_id', 'emails', ['requires_human_review', 'created_at', 'id'], unique=False)
+    op.create_index('ix_emails_from_email_created_at_id', 'emails', ['from_email', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_emails_from_email_created_at_id', table_name='emails')
+    op.drop_index('ix_emails_review_created_at_id', table_name='emails')
+    op.drop_index('ix_emails_category_created_at_id', table_name='emails')
+    op.drop_index('ix_emails_created_at_id', table_name='emails')
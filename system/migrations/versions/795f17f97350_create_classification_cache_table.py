@@ -0,0 +1,39 @@
+"""create classification cache table
+
+Revision ID: 795f17f97350
+Revises: 7bdd3461db7a
+Create Date: 2026-10-18 10:12:41.202913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '795f17f97350'
+down_revision: Union[str, None] = '7bdd3461db7a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('classification_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=100), nullable=False),
+    sa.Column('prompt_version', sa.String(length=50), nullable=False),
+    sa.Column('category', sa.String(length=50), nullable=False),
+    sa.Column('confidence', sa.Float(), nullable=False),
+    sa.Column('draft_reply', sa.Text(), nullable=False),
+    sa.Column('requires_human_review', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index(op.f('ix_classification_cache_expires_at'), 'classification_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_classification_cache_expires_at'), table_name='classification_cache')
+    op.drop_table('classification_cache')
@@ -0,0 +1,40 @@
+"""add emails review queue
+
+Revision ID: a91c3e07f2d4
+Revises: 5366701a4c98
+Create Date: 2026-10-18 14:52:37.104218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a91c3e07f2d4'
+down_revision: Union[str, None] = '5366701a4c98'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_PENDING_REVIEW = sa.text("requires_human_review AND status = 'CLASSIFIED'")
+
+
+def upgrade() -> None:
+    # ADD COLUMN simples (sem batch) para preservar os triggers no SQLite.
+    op.add_column('emails', sa.Column('review_claimed_by', sa.String(length=255), nullable=True))
+    op.add_column('emails', sa.Column('review_lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        'ix_emails_review_queue',
+        'emails',
+        ['category', 'confidence', 'created_at', 'id'],
+        unique=False,
+        postgresql_where=_PENDING_REVIEW,
+        sqlite_where=_PENDING_REVIEW,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_emails_review_queue', table_name='emails')
+    op.drop_column('emails', 'review_lease_expires_at')
+    op.drop_column('emails', 'review_claimed_by')
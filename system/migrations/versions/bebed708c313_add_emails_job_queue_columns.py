@@ -0,0 +1,38 @@
+"""add emails job queue columns
+
+Revision ID: bebed708c313
+Revises: 5db8b5d67f77
+Create Date: 2026-10-18 11:48:09.114672
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bebed708c313'
+down_revision: Union[str, None] = '5db8b5d67f77'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('emails') as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=20), server_default='CLASSIFIED', nullable=False))
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('last_error', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('callback_url', sa.String(length=2048), nullable=True))
+        batch_op.add_column(sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_emails_status_id', 'emails', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_emails_status_id', table_name='emails')
+    with op.batch_alter_table('emails') as batch_op:
+        batch_op.drop_column('locked_at')
+        batch_op.drop_column('callback_url')
+        batch_op.drop_column('last_error')
+        batch_op.drop_column('attempts')
+        batch_op.drop_column('status')
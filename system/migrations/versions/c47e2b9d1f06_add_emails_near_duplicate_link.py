@@ -0,0 +1,43 @@
+"""add emails near duplicate link
+
+Revision ID: c47e2b9d1f06
+Revises: a91c3e07f2d4
+Create Date: 2026-10-18 18:06:12.481377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e2b9d1f06'
+down_revision: Union[str, None] = 'a91c3e07f2d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ADD COLUMN simples (sem batch) para preservar os triggers no SQLite;
+    # lá a chave estrangeira fica só no modelo (SQLite não faz ADD CONSTRAINT).
+    op.add_column('emails', sa.Column('reviewed_by', sa.String(length=255), nullable=True))
+    op.add_column('emails', sa.Column('matched_email_id', sa.Integer(), nullable=True))
+    if op.get_bind().dialect.name != 'sqlite':
+        op.create_foreign_key(
+            'fk_emails_matched_email_id',
+            'emails',
+            'emails',
+            ['matched_email_id'],
+            ['id'],
+            ondelete='SET NULL',
+        )
+    op.create_index('ix_emails_matched_email_id', 'emails', ['matched_email_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_emails_matched_email_id', table_name='emails')
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_constraint('fk_emails_matched_email_id', 'emails', type_='foreignkey')
+    op.drop_column('emails', 'matched_email_id')
+    op.drop_column('emails', 'reviewed_by')
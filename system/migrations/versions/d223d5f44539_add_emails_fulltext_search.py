@@ -0,0 +1,85 @@
+"""add emails fulltext search
+
+Revision ID: d223d5f44539
+Revises: bebed708c313
+Create Date: 2026-10-18 13:02:41.207315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd223d5f44539'
+down_revision: Union[str, None] = 'bebed708c313'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # Coluna gerada: o Postgres recalcula em todo INSERT/UPDATE.
+        op.execute(
+            """
+            ALTER TABLE emails ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('portuguese', coalesce(subject, '')), 'A')
+                || setweight(to_tsvector('portuguese', coalesce(body, '')), 'B')
+                || setweight(to_tsvector('portuguese', coalesce(draft_reply, '')), 'C')
+            ) STORED
+            """
+        )
+        op.execute('CREATE INDEX ix_emails_search_vector ON emails USING GIN (search_vector)')
+    elif dialect == 'sqlite':
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE emails_fts USING fts5(
+                subject, body, draft_reply,
+                content='emails', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER emails_fts_ai AFTER INSERT ON emails BEGIN
+                INSERT INTO emails_fts(rowid, subject, body, draft_reply)
+                VALUES (new.id, new.subject, new.body, new.draft_reply);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER emails_fts_ad AFTER DELETE ON emails BEGIN
+                INSERT INTO emails_fts(emails_fts, rowid, subject, body, draft_reply)
+                VALUES ('delete', old.id, old.subject, old.body, old.draft_reply);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER emails_fts_au AFTER UPDATE OF subject, body, draft_reply ON emails BEGIN
+                INSERT INTO emails_fts(emails_fts, rowid, subject, body, draft_reply)
+                VALUES ('delete', old.id, old.subject, old.body, old.draft_reply);
+                INSERT INTO emails_fts(rowid, subject, body, draft_reply)
+                VALUES (new.id, new.subject, new.body, new.draft_reply);
+            END
+            """
+        )
+        # Indexa as linhas que já existiam.
+        op.execute("INSERT INTO emails_fts(emails_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_emails_search_vector', table_name='emails')
+        op.drop_column('emails', 'search_vector')
+    elif dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS emails_fts_au')
+        op.execute('DROP TRIGGER IF EXISTS emails_fts_ad')
+        op.execute('DROP TRIGGER IF EXISTS emails_fts_ai')
+        op.execute('DROP TABLE IF EXISTS emails_fts')
@@ -0,0 +1,30 @@
+"""add emails external id
+
+Revision ID: e81f4a6c2d93
+Revises: c47e2b9d1f06
+Create Date: 2026-10-18 19:41:05.227914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81f4a6c2d93'
+down_revision: Union[str, None] = 'c47e2b9d1f06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ADD COLUMN simples (sem batch) para preservar os triggers no SQLite;
+    # a unicidade vem de um índice único, que o SQLite cria sem recriar a tabela.
+    op.add_column('emails', sa.Column('external_id', sa.String(length=255), nullable=True))
+    op.create_index('uq_emails_external_id', 'emails', ['external_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_emails_external_id', table_name='emails')
+    op.drop_column('emails', 'external_id')
@@ -0,0 +1,27 @@
+"""add emails next attempt at
+
+Revision ID: f3b8d51a7c20
+Revises: e81f4a6c2d93
+Create Date: 2026-10-18 21:12:40.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d51a7c20'
+down_revision: Union[str, None] = 'e81f4a6c2d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ADD COLUMN simples (sem batch) para preservar os triggers no SQLite.
+    op.add_column('emails', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('emails', 'next_attempt_at')
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Os módulos são importados como `system.app...` (raiz do repositório no path),
+# igual ao uvicorn e aos CLIs.
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
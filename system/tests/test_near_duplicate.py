@@ -0,0 +1,108 @@
+from system.app.domain.entities.classification import EmailCategory
+from system.app.domain.entities.email_entity import Email
+from system.app.infrastructure.llm.near_duplicate import (
+    _MASK64,
+    NUM_PERM,
+    NearDuplicateIndex,
+    shingles,
+)
+
+_BODY = (
+    "Comprei um fone de ouvido no dia 10 e ele parou de funcionar depois de "
+    "uma semana de uso, gostaria de acionar a garantia e saber como enviar o produto."
+)
+
+
+def _email(body=_BODY, subject="Garantia do fone", id=1, **kwargs) -> Email:
+    fields = dict(
+        category=EmailCategory.GARANTIA,
+        confidence=0.95,
+        draft_reply="Olá",
+        requires_human_review=False,
+    )
+    fields.update(kwargs)
+    return Email(id=id, from_email="a@b.com", subject=subject, body=body, **fields)
+
+
+def _index(threshold=0.8, max_entries=100) -> NearDuplicateIndex:
+    return NearDuplicateIndex(None, threshold=threshold, min_confidence=0.9, max_entries=max_entries)
+
+
+def _similarity(a, b) -> float:
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def test_short_body_has_no_shingles():
+    assert shingles(_email(body="quero cancelar o pedido")) == set()
+
+
+def test_greeting_numbers_and_reply_prefix_do_not_change_shingles():
+    base = shingles(_email())
+    variant = shingles(
+        _email(
+            subject="RE: Fwd: Garantia do fone",
+            body="Bom dia, Olá João!\n" + _BODY.replace("dia 10", "dia 27"),
+        )
+    )
+    assert base == variant
+    assert any(g.startswith("s:") for g in base)
+
+
+def test_signature_is_densified_even_with_few_shingles():
+    body = "um dois tres quatro cinco seis sete oito"  # 6 3-gramas, 64 compartimentos
+    signature = _index()._signature(_email(body=body, subject=""))
+    assert len(signature) == NUM_PERM
+    assert _MASK64 not in signature
+    # Sem densificação os compartimentos vazios seriam todos iguais entre si.
+    assert len(set(signature)) > 6
+
+
+def test_similarity_tracks_jaccard():
+    index = _index()
+    base = index._signature(_email())
+    same = index._signature(_email(id=2))
+    close = index._signature(_email(body=_BODY + " Obrigado pela atenção."))
+    other = index._signature(
+        _email(
+            subject="Reembolso",
+            body="Quero devolver a cadeira que chegou ontem porque não coube na "
+            "sala e preciso do dinheiro de volta o quanto antes possível.",
+        )
+    )
+    assert _similarity(base, same) == 1.0
+    assert _similarity(base, close) >= 0.7
+    assert _similarity(base, other) < 0.2
+
+
+def test_lookup_finds_near_duplicate_and_ignores_different_email():
+    index = _index()
+    index.observe(_email(id=1))
+    match = index.lookup(_email(id=None, body="Olá, " + _BODY))
+    assert match is not None and match.email_id == 1
+    assert index.lookup(_email(id=None, body="texto totalmente diferente " * 5)) is None
+
+
+def test_only_reusable_emails_enter_the_index():
+    index = _index()
+    index.observe(_email(id=1, confidence=0.5))
+    index.observe(_email(id=2, requires_human_review=True))
+    index.observe(_email(id=3, matched_email_id=9))
+    assert len(index) == 0
+    index.observe(_email(id=4, confidence=0.5, reviewed_by="ana"))
+    assert len(index) == 1
+
+
+def test_update_that_becomes_unreusable_is_discarded():
+    index = _index()
+    index.observe(_email(id=1))
+    index.observe(_email(id=1, requires_human_review=True))
+    assert len(index) == 0
+    assert not index._buckets
+
+
+def test_oldest_entry_is_evicted():
+    index = _index(max_entries=2)
+    for i, word in enumerate(("fone", "mouse", "teclado"), start=1):
+        index.observe(_email(id=i, body=_BODY.replace("fone de ouvido", word)))
+    assert list(index._signatures) == [2, 3]
+    assert all(1 not in bucket for bucket in index._buckets.values())
@@ -0,0 +1,75 @@
+from system.app.infrastructure.llm.preprocessing import (
+    TRUNCATION_MARKER,
+    EmailPreprocessor,
+    strip_html,
+    strip_quoted_history,
+    strip_signature,
+    truncate_to_tokens,
+)
+
+
+def test_sign_off_on_first_line_is_content():
+    text = "Obrigado,\nmas o produto veio quebrado e quero acionar a garantia.\nPedido 123"
+    assert strip_signature(text) == text
+
+
+def test_sign_off_followed_by_sentences_is_kept():
+    text = "Olá\nAbraços\nO produto chegou com defeito e quero trocar."
+    assert strip_signature(text) == text
+
+
+def test_signature_after_sign_off_is_removed():
+    text = (
+        "Olá,\nO produto chegou quebrado, quero a garantia do pedido 123.\n\n"
+        "Atenciosamente,\nJoão Silva\nGerente de Compras\n(11) 99999-0000"
+    )
+    assert strip_signature(text) == (
+        "Olá,\nO produto chegou quebrado, quero a garantia do pedido 123.\n\n"
+        "Atenciosamente,"
+    )
+
+
+def test_only_last_sign_off_counts():
+    text = (
+        "Bom dia\nObrigado pelo retorno,\n"
+        "mas a troca ainda não foi feita e o prazo já venceu faz uma semana.\n"
+        "Abraços\nMaria"
+    )
+    assert strip_signature(text) == text.rsplit("\n", 1)[0]
+
+
+def test_signature_bigger_than_message_is_kept():
+    text = (
+        "Bom dia\nquero cancelar\nAbraços\nJoão Silva\nDiretor Comercial\n"
+        "Empresa XPTO Ltda\n+55 11 4000-0000\njoao@xpto.com.br"
+    )
+    assert strip_signature(text) == text
+
+
+def test_delimiter_and_mobile_footer():
+    assert strip_signature("Oi, segue o pedido.\n--\nJoão\nTel 123") == "Oi, segue o pedido."
+    assert strip_signature("Oi\nEnviado do meu iPhone") == "Oi"
+    assert strip_signature("--\nsó isso") == "--\nsó isso"
+
+
+def test_quoted_history():
+    text = "Ainda não chegou.\n\nEm seg, 1 de jan, Loja escreveu:\n> Seu pedido foi enviado"
+    assert strip_quoted_history(text).strip() == "Ainda não chegou."
+    outlook = "Cadê?\nDe: Loja\nEnviado: ontem\nPara: mim\nAssunto: pedido"
+    assert strip_quoted_history(outlook) == "Cadê?"
+
+
+def test_html():
+    assert strip_html("<p>Olá &amp; tchau</p><script>x()</script>").strip() == "Olá & tchau"
+    assert strip_html("a < b") == "a < b"
+
+
+def test_truncate_to_tokens():
+    assert truncate_to_tokens("curto", 10) == "curto"
+    assert truncate_to_tokens("um dois tres quatro cinco", 2).endswith(TRUNCATION_MARKER)
+
+
+def test_preprocessor_never_returns_empty_prompt():
+    processed = EmailPreprocessor().process("> só citação")
+    assert processed.text == "> só citação"
+    assert processed.tokens_saved == 0
@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from system.app.infrastructure.llm.rate_limiter import (
+    AdaptiveRateLimiter,
+    LLMPriority,
+    LLMQueueTimeoutError,
+    _TokenBucket,
+    llm_priority,
+)
+
+_NO_LIMIT = {p: None for p in LLMPriority}
+
+
+def _limiter(rpm=600, tpm=60_000, max_wait=_NO_LIMIT) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(rpm, tpm, max_wait)
+
+
+def test_bucket_time_until():
+    bucket = _TokenBucket(60)  # 1 por segundo
+    bucket.level = 0
+    assert bucket.time_until(5) == pytest.approx(5)
+    # Pedido maior que a capacidade espera o bucket encher, não para sempre.
+    assert bucket.time_until(600) == pytest.approx(60)
+    bucket.level = 10
+    assert bucket.time_until(5) == 0
+
+
+def test_bucket_refill_is_capped():
+    bucket = _TokenBucket(60)
+    bucket.level = 0
+    bucket.refill(bucket._updated + 3)
+    assert bucket.level == pytest.approx(3)
+    bucket.refill(bucket._updated + 1000)
+    assert bucket.level == 60
+
+
+def test_settle_returns_overestimate_and_refund_returns_everything():
+    async def run():
+        limiter = _limiter()
+        reservation = await limiter.acquire(1000)
+        assert limiter._tokens.level == pytest.approx(59_000, abs=5)
+        reservation.settle(400)
+        assert limiter._tokens.level == pytest.approx(59_600, abs=5)
+        requests_before = limiter._requests.level
+        reservation = await limiter.acquire(2000)
+        reservation.refund()
+        assert limiter._tokens.level == pytest.approx(59_600, abs=5)
+        assert limiter._requests.level == pytest.approx(requests_before, abs=0.1)
+        # Sem usage (None) o bucket fica com a estimativa.
+        reservation = await limiter.acquire(100)
+        reservation.settle(None)
+        assert limiter._tokens.level == pytest.approx(59_500, abs=5)
+
+    asyncio.run(run())
+
+
+def test_interactive_goes_first():
+    async def run():
+        limiter = _limiter()
+        limiter.pause(0.05)
+        order = []
+
+        async def call(name, priority):
+            await limiter.acquire(10, priority)
+            order.append(name)
+
+        tasks = [asyncio.create_task(call("background", LLMPriority.BACKGROUND))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("batch", LLMPriority.BATCH)))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("interactive", LLMPriority.INTERACTIVE)))
+        await asyncio.gather(*tasks)
+        return order
+
+    assert asyncio.run(run()) == ["interactive", "batch", "background"]
+
+
+def test_priority_comes_from_context():
+    async def run():
+        limiter = _limiter(max_wait={LLMPriority.BACKGROUND: 0.01})
+        limiter.pause(10)
+        with llm_priority(LLMPriority.BACKGROUND):
+            with pytest.raises(LLMQueueTimeoutError) as exc:
+                await limiter.acquire(10)
+        return exc.value
+
+    error = asyncio.run(run())
+    assert error.priority is LLMPriority.BACKGROUND
+    assert error.waited >= 0.01
+
+
+def test_timed_out_waiter_does_not_block_the_queue():
+    async def run():
+        limiter = _limiter(max_wait={LLMPriority.INTERACTIVE: None, LLMPriority.BACKGROUND: 0.01})
+        limiter.pause(0.05)
+        background = asyncio.create_task(limiter.acquire(10, LLMPriority.BACKGROUND))
+        with pytest.raises(LLMQueueTimeoutError):
+            await background
+        await asyncio.wait_for(limiter.acquire(10, LLMPriority.INTERACTIVE), 1)
+        return limiter._heap
+
+    assert asyncio.run(run()) == []
+
+
+def test_large_request_blocks_smaller_ones_behind_it():
+    async def run():
+        limiter = _limiter(tpm=6000)  # 100 tokens/s
+        limiter._tokens.level = 0
+        order = []
+
+        async def call(name, cost):
+            await limiter.acquire(cost, LLMPriority.BATCH)
+            order.append(name)
+
+        big = asyncio.create_task(call("big", 5))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(call("small", 1))
+        await asyncio.gather(big, small)
+        return order
+
+    assert asyncio.run(run()) == ["big", "small"]
+
+
+def test_headers_lower_the_level_and_raise_capacity():
+    async def run():
+        limiter = _limiter(rpm=60, tpm=1000)
+        limiter.update_from_headers(
+            {
+                "x-ratelimit-limit-tokens": "5000",
+                "x-ratelimit-remaining-tokens": "200",
+                "x-ratelimit-remaining-requests": "abc",
+            }
+        )
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter._tokens.capacity == 5000
+    assert limiter._tokens.level == pytest.approx(200, abs=1)
+    assert limiter._requests.capacity == 60
+
+
+def test_cancelled_after_grant_refunds():
+    async def run():
+        limiter = _limiter()
+        limiter.pause(10)
+        task = asyncio.create_task(limiter.acquire(500))
+        await asyncio.sleep(0)
+        before = (limiter._requests.level, limiter._tokens.level)
+        # Concede a vaga e cancela antes de a task retomar.
+        limiter._paused_until = 0
+        limiter._dispatch()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return before, limiter
+
+    (requests, tokens), limiter = asyncio.run(run())
+    assert limiter._requests.level == pytest.approx(requests, abs=0.1)
+    assert limiter._tokens.level == pytest.approx(tokens, abs=5)
+    assert limiter._heap == []
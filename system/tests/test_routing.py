@@ -0,0 +1,216 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from system.app.domain.entities.classification import ClassificationResult, EmailCategory
+from system.app.infrastructure.llm import routing
+from system.app.infrastructure.llm.rate_limiter import LLMPriority, LLMQueueTimeoutError
+from system.app.infrastructure.llm.routing import (
+    CircuitBreaker,
+    LatencyTracker,
+    LLMRoute,
+    RoutedLLMClient,
+    parse_llm_routes,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    # Só o relógio do módulo: o event loop continua com o tempo real.
+    monkeypatch.setattr(
+        routing, "time", SimpleNamespace(monotonic=clock, perf_counter=time.perf_counter)
+    )
+    return clock
+
+
+def _breaker(cooldown=30.0):
+    return CircuitBreaker(window=10, min_calls=4, error_rate=0.5, cooldown=cooldown)
+
+
+def _result(confidence=0.9):
+    return ClassificationResult(
+        category=EmailCategory.GARANTIA,
+        confidence=confidence,
+        draft_reply="ok",
+        requires_human_review=False,
+    )
+
+
+class _Client:
+    def __init__(self, error=None, delay=0.0):
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def classify_email(self, email):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return _result()
+
+
+def _open(breaker):
+    for _ in range(4):
+        breaker.record(False)
+    assert breaker.is_open
+
+
+def test_parse_llm_routes():
+    routes = parse_llm_routes("a, b@http://x/v1 ,", "padrao")
+    assert [r.name for r in routes] == ["a", "b@http://x/v1"]
+    assert parse_llm_routes(" ", "padrao")[0].model == "padrao"
+
+
+def test_latency_tracker_window_and_percentile():
+    tracker = LatencyTracker(window=3)
+    assert tracker.percentile(95) is None
+    for value in (5.0, 1.0, 2.0, 3.0):
+        tracker.observe(value)
+    assert len(tracker) == 3
+    assert tracker.percentile(0) == 1.0
+    assert tracker.percentile(99) == 3.0
+
+
+def test_breaker_opens_on_error_rate(clock):
+    breaker = _breaker()
+    breaker.record(True)
+    breaker.record(False)
+    breaker.record(False)
+    assert not breaker.is_open  # menos que min_calls
+    breaker.record(True)
+    assert breaker.is_open
+    assert not breaker.allow()
+
+
+def test_breaker_single_probe_after_cooldown(clock):
+    breaker = _breaker()
+    _open(breaker)
+    clock.now += 31
+    assert breaker.allow()
+    assert not breaker.allow()  # só um teste por vez
+    breaker.record(True)
+    assert not breaker.is_open
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_for_a_new_cooldown(clock):
+    breaker = _breaker()
+    _open(breaker)
+    clock.now += 31
+    assert breaker.allow()
+    breaker.record(False)
+    assert breaker.is_open
+    assert not breaker.allow()
+    clock.now += 31
+    assert breaker.allow()
+
+
+def test_released_probe_keeps_circuit_open(clock):
+    breaker = _breaker()
+    _open(breaker)
+    clock.now += 31
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.is_open
+    assert breaker.allow()  # a vaga voltou
+
+
+def test_failover_marks_result_as_fallback():
+    primary = LLMRoute("a", _Client(error=RuntimeError("500")), _breaker())
+    secondary = LLMRoute("b", _Client(), _breaker())
+    client = RoutedLLMClient([primary, secondary], hedge_percentile=None)
+    result = asyncio.run(client.classify_email(None))
+    assert result.from_fallback
+    assert result.confidence == 0.9
+
+
+def test_primary_result_is_not_fallback():
+    client = RoutedLLMClient([LLMRoute("a", _Client(), _breaker())], hedge_percentile=None)
+    assert not asyncio.run(client.classify_email(None)).from_fallback
+
+
+def test_last_resort_is_degraded():
+    route = LLMRoute("a", _Client(error=RuntimeError("500")), _breaker())
+    client = RoutedLLMClient([route], last_resort=_Client(), hedge_percentile=None)
+    result = asyncio.run(client.classify_email(None))
+    assert result.confidence == 0.0
+    assert result.requires_human_review
+    assert result.from_fallback
+
+
+def test_queue_timeout_is_raised_instead_of_last_resort():
+    last_resort = _Client()
+    route = LLMRoute(
+        "a", _Client(error=LLMQueueTimeoutError(LLMPriority.BATCH, 1.0)), _breaker()
+    )
+    client = RoutedLLMClient([route], last_resort=last_resort, hedge_percentile=None)
+    with pytest.raises(LLMQueueTimeoutError):
+        asyncio.run(client.classify_email(None))
+    assert last_resort.calls == 0
+    # Fila local cheia não é falha do endpoint.
+    assert list(route.breaker._outcomes) == []
+
+
+def test_probe_without_outcome_is_released(clock):
+    breaker = _breaker()
+    _open(breaker)
+    clock.now += 31
+    route = LLMRoute(
+        "a", _Client(error=LLMQueueTimeoutError(LLMPriority.BATCH, 1.0)), breaker
+    )
+    client = RoutedLLMClient([route], hedge_percentile=None)
+    with pytest.raises(LLMQueueTimeoutError):
+        asyncio.run(client.classify_email(None))
+    assert breaker.is_open
+    assert breaker.allow()
+
+
+def test_open_route_is_skipped_without_spending_its_probe(clock):
+    first = LLMRoute("a", _Client(), _breaker())
+    broken = _breaker()
+    _open(broken)
+    clock.now += 31
+    second = LLMRoute("b", _Client(), broken)
+    client = RoutedLLMClient([first, second], hedge_percentile=None)
+    asyncio.run(client.classify_email(None))
+    # A primeira rota respondeu: a vaga de teste da segunda segue livre.
+    assert broken.allow()
+
+
+def test_hedge_fires_on_slow_call_and_cancels_loser():
+    slow_then_fast = _Client()
+    delays = iter([1.0, 0.0])
+
+    async def classify_email(email):
+        slow_then_fast.calls += 1
+        await asyncio.sleep(next(delays))
+        return _result()
+
+    slow_then_fast.classify_email = classify_email
+    route = LLMRoute("a", slow_then_fast, _breaker())
+    for _ in range(3):
+        route.latency.observe(0.01)
+    client = RoutedLLMClient(
+        [route], hedge_percentile=50, hedge_min_samples=3, hedge_min_delay=0.02
+    )
+
+    async def run():
+        start = asyncio.get_running_loop().time()
+        await client.classify_email(None)
+        return asyncio.get_running_loop().time() - start
+
+    assert asyncio.run(run()) < 0.5
+    assert slow_then_fast.calls == 2
@@ -0,0 +1,97 @@
+import asyncio
+import json
+
+from system.app.domain.entities.classification import ClassificationResult, EmailCategory
+from system.app.infrastructure.llm.streaming import (
+    ClassificationStreamParser,
+    stream_classification,
+)
+
+
+def _feed_all(chunks):
+    parser = ClassificationStreamParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events
+
+
+def _draft(events):
+    return "".join(e.draft_delta for e in events)
+
+
+def test_header_then_draft_in_order():
+    payload = json.dumps(
+        {
+            "classification": "GARANTIA",
+            "confidence": 0.92,
+            "draft_reply": "Olá,\nvamos trocar.",
+            "requires_human_review": False,
+        }
+    )
+    events = _feed_all([payload])
+    assert events[0].category == EmailCategory.GARANTIA
+    assert events[0].confidence == 0.92
+    assert _draft(events) == "Olá,\nvamos trocar."
+
+
+def test_confidence_split_across_chunks_is_not_truncated():
+    events = _feed_all(['{"classification": "GARANTIA", "confidence": 0.', "9", ', "draft_reply": ""}'])
+    assert events[0].confidence == 0.9
+
+
+def test_every_split_point_decodes_the_same_draft():
+    draft = 'Linha 1\nAspas "x" \\ barra, acentuação é ç e emoji 😀 fim'
+    payload = json.dumps(
+        {"classification": "DUVIDAS_GERAIS", "confidence": 0.8, "draft_reply": draft}
+    )
+    for cut in range(1, len(payload)):
+        events = _feed_all([payload[:cut], payload[cut:]])
+        assert _draft(events) == draft, cut
+        headers = [e for e in events if e.category is not None]
+        assert len(headers) == 1
+
+
+def test_byte_by_byte_unicode_escapes():
+    payload = json.dumps(
+        {"classification": "GARANTIA", "confidence": 1, "draft_reply": "ação 😀"},
+        ensure_ascii=True,
+    )
+    assert _draft(_feed_all(list(payload))) == "ação 😀"
+
+
+def test_unknown_category_becomes_inconclusive():
+    events = _feed_all(['{"classification": "OUTRA", "confidence": 0.5,'])
+    assert events[0].category == EmailCategory.INCONCLUSIVO
+
+
+def test_category_goes_alone_when_draft_comes_first():
+    events = _feed_all(['{"classification": "GARANTIA", "draft_reply": "Oi', '", "confidence": 0.7}'])
+    assert events[0].category == EmailCategory.GARANTIA
+    assert events[0].confidence is None
+    assert _draft(events) == "Oi"
+
+
+def test_text_after_draft_is_ignored():
+    events = _feed_all(['{"draft_reply": "a"', ', "classification": "GARANTIA", "x": "b"}'])
+    assert _draft(events) == "a"
+
+
+def test_stream_classification_without_streaming_client():
+    result = ClassificationResult(
+        category=EmailCategory.GARANTIA,
+        confidence=0.9,
+        draft_reply="ok",
+        requires_human_review=False,
+    )
+
+    class Client:
+        async def classify_email(self, email):
+            return result
+
+    async def collect():
+        return [d async for d in stream_classification(Client(), None)]
+
+    (delta,) = asyncio.run(collect())
+    assert delta.result is result
+    assert delta.draft_delta == "ok"